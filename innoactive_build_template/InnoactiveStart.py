@@ -5,6 +5,7 @@ import omni.kit
 import omni.kit.commands
 import json
 import carb
+import carb.settings
 import asyncio
 import innoactive.serverextension
 
@@ -15,6 +16,14 @@ options = parser.parse_args()
 
 async def startup_script():
 
+    startup_mode = carb.settings.get_settings().get_as_string("/innoactive/serverextension/startupMode") or "direct"
+
+    # Open the requested USD file as the first stage. The extension falls back to the empty stage on error.
+    if startup_mode == "direct":
+        carb.log_info(f"[InnoactiveStartup] Opening USD file directly: {options.path}")
+        await innoactive.serverextension.open_usd_direct(options.path)
+        return
+
     emptyStage = "usd/Empty/Stage.usd"
     carb.log_info(f"[InnoactiveStartup] Loading USD file: {emptyStage}")
     omni.usd.get_context().open_stage(emptyStage)
@@ -0,0 +1,127 @@
+import asyncio
+import uuid
+
+import carb
+import carb.events
+import omni.kit.app
+
+from .tracing import get_tracer
+
+try:
+    import omni.kit.livestream.messaging as messaging
+except ImportError:
+    messaging = None
+
+
+REQUEST_EVENT = "commandBatchRequest"
+ACK_EVENT = "commandBatchAck"
+RESULT_EVENT = "commandBatchResult"
+
+
+class CommandChannel:
+    """
+    Message-bus channel that runs batches of remote-control commands.
+
+    A `commandBatchRequest` carries a `correlation_id`, a list of `commands` ({"id", "command", "args"}) and
+    optionally `stop_on_error` (default true). It is acknowledged right away with `commandBatchAck`. The commands
+    run in order, batches one after the other, and `commandBatchResult` reports the result of every command.
+
+    Args:
+        handlers (dict): Command name -> async function taking the command args. It may return a dict that is
+            added to the command result, and raises to report an error.
+    """
+
+    def __init__(self, handlers: dict):
+        self._handlers = handlers
+        self._lock = asyncio.Lock()
+        self._message_bus = omni.kit.app.get_app().get_message_bus_event_stream()
+
+        # Allow the streaming client to receive the acknowledgements too
+        if messaging is not None:
+            for event_type in (ACK_EVENT, RESULT_EVENT):
+                messaging.register_event_type_to_send(event_type)
+
+        self._subscription = self._message_bus.create_subscription_to_pop_by_type(
+            carb.events.type_from_string(REQUEST_EVENT), self._on_request, name=REQUEST_EVENT
+        )
+
+    def _on_request(self, event: carb.events.IEvent):
+        self.submit(event.payload.get_dict())
+
+    def _acknowledge(self, request: dict) -> dict:
+        """Validates a batch and sends its acknowledgement on the message bus."""
+        correlation_id = request.get("correlation_id") or uuid.uuid4().hex
+        commands = request.get("commands")
+
+        error = ""
+        if not isinstance(commands, (list, tuple)) or not commands:
+            error = "Missing \"commands\" list"
+        else:
+            for command in commands:
+                if not isinstance(command, dict) or command.get("command") not in self._handlers:
+                    name = command.get("command") if isinstance(command, dict) else command
+                    error = f"Unknown command: {name}"
+                    break
+
+        if error:
+            ack = {"correlation_id": correlation_id, "result": "error", "error": error}
+        else:
+            ack = {"correlation_id": correlation_id, "result": "accepted", "error": "", "count": len(commands)}
+
+        carb.log_info(f"[innoactive.serverextension] Command batch {correlation_id}: {ack['result']} {ack['error']}")
+        self._dispatch(ACK_EVENT, ack)
+        return ack
+
+    def submit(self, request: dict) -> dict:
+        """Validates and schedules a batch. Returns the acknowledgement, which is also sent on the message bus."""
+        ack = self._acknowledge(request)
+        if ack["result"] == "accepted":
+            get_tracer().ensure_future(
+                self._run(ack["correlation_id"], list(request["commands"]), request.get("stop_on_error", True)),
+                f"command_batch {ack['correlation_id']}",
+            )
+        return ack
+
+    async def run(self, request: dict) -> dict:
+        """
+        Validates and runs a batch, for callers that wait for the outcome like the control server.
+        Returns the `commandBatchResult` payload, or the acknowledgement if the batch is rejected. Both are also
+        sent on the message bus.
+        """
+        ack = self._acknowledge(request)
+        if ack["result"] != "accepted":
+            return ack
+        return await self._run(ack["correlation_id"], list(request["commands"]), request.get("stop_on_error", True))
+
+    async def _run(self, correlation_id: str, commands: list, stop_on_error: bool) -> dict:
+        async with self._lock:
+            results = []
+            failed = False
+            for index, command in enumerate(commands):
+                result = {"id": command.get("id", index), "command": command["command"]}
+                if failed and stop_on_error:
+                    result.update({"result": "skipped", "error": ""})
+                else:
+                    try:
+                        result.update(await self._handlers[command["command"]](command.get("args") or {}) or {})
+                        result.update({"result": "success", "error": ""})
+                    except Exception as e:
+                        carb.log_error(f"[innoactive.serverextension] Command {command['command']} failed: {str(e)}")
+                        result.update({"result": "error", "error": str(e)})
+                        failed = True
+                results.append(result)
+
+            batch_result = {
+                "correlation_id": correlation_id,
+                "result": "error" if failed else "success",
+                "results": results,
+            }
+            self._dispatch(RESULT_EVENT, batch_result)
+            return batch_result
+
+    def _dispatch(self, event_name: str, payload: dict):
+        self._message_bus.dispatch(carb.events.type_from_string(event_name), payload=payload)
+        self._message_bus.pump()
+
+    def on_shutdown(self):
+        self._subscription = None
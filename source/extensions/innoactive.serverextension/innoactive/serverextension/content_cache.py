@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import json
+import os
+import threading
+import time
+import urllib.error
+import urllib.parse
+import urllib.request
+
+import carb
+
+
+USD_EXTENSIONS = (".usd", ".usda", ".usdc")
+
+
+class ContentCache:
+    """
+    Size-bounded local mirror of remotely hosted USD stages.
+
+    Files are stored under `root` with the same directory layout as on the server, so relative asset paths
+    of a cached layer keep resolving to other cached files. URLs with a query, e.g. signed or versioned ones,
+    get a hash of the query in their file name. Entries are revalidated with ETag /
+    Last-Modified on every fetch and the least recently used ones are evicted once `max_bytes` is exceeded.
+    """
+
+    def __init__(self, root: str, max_bytes: int, timeout: float = 30.0):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._timeout = timeout
+        self._index_file = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._index = self._load_index()
+
+    @staticmethod
+    def is_remote(url: str) -> bool:
+        return urllib.parse.urlparse(url).scheme in ("http", "https")
+
+    @property
+    def size(self) -> int:
+        return sum(entry["size"] for entry in self._index.values())
+
+    def local_path(self, url: str) -> str:
+        """Returns where `url` is mirrored on disk."""
+        parsed = urllib.parse.urlparse(url)
+        parts = [part for part in urllib.parse.unquote(parsed.path).split("/") if part not in ("", ".", "..")] or ["index"]
+        if parsed.query:
+            # Next to the file without query, keeping the extension the layer format is picked by
+            name, extension = os.path.splitext(parts[-1])
+            parts[-1] = f"{name}.{hashlib.sha256(parsed.query.encode()).hexdigest()[:16]}{extension}"
+        return os.path.join(self._root, parsed.netloc.replace(":", "_"), *parts)
+
+    def fetch(self, url: str, pinned=None) -> str:
+        """
+        Returns the local path of `url`, downloading it if it is missing or has changed on the server.
+        Args:
+            url (str): HTTP(S) URL to fetch.
+            pinned (set): URLs that must not be evicted by this fetch.
+        """
+        local_path = self.local_path(url)
+        entry = self._index.get(url)
+        if entry and not os.path.exists(local_path):
+            entry = None
+
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+
+        try:
+            with urllib.request.urlopen(urllib.request.Request(url, headers=headers), timeout=self._timeout) as response:
+                os.makedirs(os.path.dirname(local_path), exist_ok=True)
+                tmp_path = f"{local_path}.part"
+                with open(tmp_path, "wb") as f:
+                    while chunk := response.read(1 << 20):
+                        f.write(chunk)
+                os.replace(tmp_path, local_path)
+                entry = {
+                    "etag": response.headers.get("ETag"),
+                    "last_modified": response.headers.get("Last-Modified"),
+                    "size": os.path.getsize(local_path),
+                }
+                carb.log_info(f"[innoactive.serverextension] Content cache downloaded {url}")
+        except urllib.error.HTTPError as e:
+            if e.code != 304 or not entry:
+                raise
+            carb.log_info(f"[innoactive.serverextension] Content cache hit {url}")
+        except urllib.error.URLError as e:
+            # Serve the cached copy when the server can't be reached
+            if not entry:
+                raise
+            carb.log_warn(f"[innoactive.serverextension] Using cached {url}, server not reachable: {e.reason}")
+
+        with self._lock:
+            entry["last_access"] = time.time()
+            self._index[url] = entry
+            self._evict(pinned or {url})
+            self._save_index()
+        return local_path
+
+    def fetch_tree(self, url: str) -> str:
+        """Fetches a USD layer and every layer and asset it references relatively. Returns the local root path."""
+        visited = set()
+        pending = [url]
+        while pending:
+            current = pending.pop()
+            if current in visited:
+                continue
+            visited.add(current)
+
+            try:
+                local_path = self.fetch(current, pinned=visited)
+            except Exception as e:
+                if current == url:
+                    raise
+                carb.log_warn(f"[innoactive.serverextension] Content cache failed to fetch dependency {current}: {e}")
+                continue
+
+            if local_path.lower().endswith(USD_EXTENSIONS):
+                for dependency in self._layer_dependencies(local_path):
+                    if self._is_relative(dependency):
+                        pending.append(urllib.parse.urljoin(current, dependency))
+
+        return self.local_path(url)
+
+    async def fetch_tree_async(self, url: str) -> str:
+        return await asyncio.get_event_loop().run_in_executor(None, self.fetch_tree, url)
+
+    def clear(self):
+        with self._lock:
+            for url in list(self._index):
+                self._remove(url)
+            self._save_index()
+
+    def _is_relative(self, asset_path: str) -> bool:
+        if not asset_path or "<UDIM>" in asset_path or asset_path.startswith("/"):
+            return False
+        return not urllib.parse.urlparse(asset_path).scheme
+
+    def _layer_dependencies(self, local_path: str):
+        from pxr import UsdUtils
+
+        try:
+            sublayers, references, payloads = UsdUtils.ExtractExternalReferences(local_path)
+        except Exception as e:
+            carb.log_warn(f"[innoactive.serverextension] Content cache can't read dependencies of {local_path}: {e}")
+            return []
+        return list(sublayers) + list(references) + list(payloads)
+
+    def _evict(self, pinned):
+        total = self.size
+        for url in sorted(self._index, key=lambda u: self._index[u]["last_access"]):
+            if total <= self._max_bytes:
+                break
+            if url in pinned:
+                continue
+            total -= self._index[url]["size"]
+            self._remove(url)
+            carb.log_info(f"[innoactive.serverextension] Content cache evicted {url}")
+
+    def _remove(self, url):
+        self._index.pop(url, None)
+        try:
+            os.remove(self.local_path(url))
+        except OSError:
+            pass
+
+    def _load_index(self):
+        try:
+            with open(self._index_file, "r", encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _save_index(self):
+        os.makedirs(self._root, exist_ok=True)
+        tmp_path = f"{self._index_file}.part"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f)
+        os.replace(tmp_path, self._index_file)
@@ -0,0 +1,70 @@
+import asyncio
+import hmac
+import inspect
+import json
+
+import carb
+
+# Set by the orchestrator that starts the instance, in the environment rather than on the command line, which
+# other local users can read
+ENV_CONTROL_TOKEN = "INNOACTIVE_CONTROL_TOKEN"
+
+
+class ControlServer:
+    """
+    Local control channel for orchestrators, e.g. the warm standby pool.
+
+    Clients connect to 127.0.0.1:`port` and send one JSON object per line, carrying `token` in its "token"
+    field. The object's "type" selects the handler, whose returned dict is sent back as one JSON line. Handlers
+    may be coroutine functions, the reply is then sent once they finish.
+    """
+
+    def __init__(self, port: int, handlers: dict, token: str):
+        if not token:
+            raise ValueError("The control server needs a token")
+        self._port = port
+        self._handlers = handlers
+        self._token = token
+        self._server = None
+
+    async def start(self):
+        self._server = await asyncio.start_server(self._handle_client, "127.0.0.1", self._port)
+        carb.log_info(f"[innoactive.serverextension] Control server listening on port {self._port}")
+
+    def stop(self):
+        if self._server:
+            self._server.close()
+            self._server = None
+
+    async def _handle_client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                writer.write((json.dumps(await self._handle_message(line)) + "\n").encode("utf-8"))
+                await writer.drain()
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    async def _handle_message(self, line: bytes) -> dict:
+        try:
+            message = json.loads(line)
+        except ValueError as e:
+            return {"result": "error", "error": f"Invalid JSON: {str(e)}"}
+        if not isinstance(message, dict):
+            return {"result": "error", "error": "Messages must be JSON objects"}
+        if not hmac.compare_digest(str(message.get("token", "")), self._token):
+            return {"result": "error", "error": "Invalid token"}
+
+        handler = self._handlers.get(message.get("type"))
+        if handler is None:
+            return {"result": "error", "error": f"Unknown message type: {message.get('type')}"}
+
+        try:
+            reply = handler(message)
+            if inspect.isawaitable(reply):
+                reply = await reply
+            return reply or {"result": "success"}
+        except Exception as e:
+            carb.log_error(f"[innoactive.serverextension] Control message {message.get('type')} failed: {str(e)}")
+            return {"result": "error", "error": str(e)}
@@ -3,14 +3,36 @@ import omni.ext
 import omni.ui as ui
 import omni.usd
 import omni.kit
+import omni.kit.app
 import omni.kit.commands
-import json
 import carb
 import carb.tokens
 import carb.settings
-import asyncio  # Import asyncio for the delay
-from pxr import Usd, UsdGeom, Gf
+import asyncio
 from omni.kit.viewport.utility import get_active_viewport
+from .content_cache import ContentCache
+from .control_server import ENV_CONTROL_TOKEN, ControlServer
+from .command_channel import CommandChannel
+from .ingest.convert import lookup_converted
+from .ingest.flatten_cache import FlattenCache
+from .frame_governor import FrameTimeGovernor, GovernorConfig
+from .layout_cache import LayoutCache
+from .load_timing import LoadTimingRecorder
+from .payload_streaming import PayloadStreamer
+from .preflight import Preflight
+from .profiles import INTERFACE_MODES, apply_profile, load_profile
+from .progressive_loading import ProgressiveLoader
+from .stage_cache import StageLRUCache, estimate_stage_bytes
+from .session_edits import SessionEditQueue, define_camera
+from .stage_handoff import StageHandoff
+from .tracing import get_tracer, write_trace
+
+
+PERSISTENT_TTFF = "/persistent/innoactive/serverextension/metrics/timeToFirstFrameMs"
+
+tracer = get_tracer()
+
+_extension_instance = None
 
 
 # Functions and vars are available to other extensions as usual in python: `innoactive.serverextension.some_public_function(x)`
@@ -18,6 +40,23 @@ def set_usd(usd):
     print(f"[innoactive.serverextension] set_usd '{usd}'")
     MyExtension.set_usd(MyExtension, usd)
 
+async def open_usd_direct(usd=None) -> bool:
+    """
+    Opens `usd` (or the configured usdPath) as the first stage, skipping the empty-stage bootstrap.
+    Returns False if it fell back to the empty-stage flow.
+    """
+    print(f"[innoactive.serverextension] open_usd_direct '{usd}'")
+    if _extension_instance is None:
+        carb.log_error("[innoactive.serverextension] Extension is not started, cannot open USD file directly")
+        return False
+    return await _extension_instance.open_direct(usd or _extension_instance.usd_to_load)
+
+def _stage_event_name(event_type) -> str:
+    try:
+        return f"stage.{omni.usd.StageEventType(event_type).name}"
+    except (TypeError, ValueError):
+        return f"stage.{event_type}"
+
 # Any class derived from `omni.ext.IExt` in the top level module (defined in `python.modules` of `extension.toml`) will
 # be instantiated when the extension gets enabled, and `on_startup(ext_id)` will be called.
 # Later when the extension gets disabled on_shutdown() is called.
@@ -29,6 +68,9 @@ class MyExtension(omni.ext.IExt):
     default_usd = "usd/JetEngine/jetengine.usd"
     layout_json = "./InnoactiveLayout.json"
     interface_mode = "screen"
+    startup_mode = "direct"  # direct / bootstrap
+    load_mode = "full"  # full / progressive / streaming / proxy / auto
+    standby = False  # parked on the empty stage until a USD file is assigned
     stage = None  # Reference to the USD stage
     settings = carb.settings.get_settings()
     
@@ -38,36 +80,28 @@ class MyExtension(omni.ext.IExt):
 
     def _ensure_camera_temp(self, camera_path="/SessionLayer/XRCam", position=(0, 0, 0)):
         """
-        Ensures a temporary camera with the specified name exists in the stage.
-        If not, it creates one at the given position.
-        Sets the camera as the active camera for the viewport.
+        Queues a temporary camera with the specified name in the session layer.
+        It is created at the given position with the other session-layer edits once the stage is opened,
+        see `_flush_session_edits`.
         """
-        if not self.stage:
-            print("[innoactive.serverextension] Stage is not loaded.")
-            return
-
-        # Check if the camera already exists
-        camera_prim = self.stage.GetPrimAtPath(camera_path)
-        if camera_prim and camera_prim.IsValid():
-            print(f"[innoactive.serverextension] Camera '{camera_path}' already exists.")
-        else:
-            print(f"[innoactive.serverextension] Camera '{camera_path}' not found. Adding it to the stage (temporary).")
-            try:
-                # Add the camera in the session layer
-                with Usd.EditContext(self.stage, self.stage.GetSessionLayer()):
-                    camera_prim = self.stage.DefinePrim(camera_path, "Camera")
-                    camera = UsdGeom.Camera(camera_prim)
-
-                    # Set camera's translation
-                    #camera_prim.GetAttribute("xformOp:translate").Set(Gf.Vec3d(*position))
-
-                print(f"[innoactive.serverextension] Temporary Camera '{camera_path}' added successfully at {position}.")
-            except Exception as e:
-                print(f"[innoactive.serverextension] Failed to add temporary Camera '{camera_path}': {str(e)}")
+        print(f"[innoactive.serverextension] Queueing temporary Camera '{camera_path}' at {position}.")
+        self._session_edits.add(lambda layer: define_camera(layer, camera_path, position))
 
         # Set the camera as active in the viewport
         # self._set_active_camera_in_viewport(camera_path)
 
+    def _flush_session_edits(self, force=False):
+        """
+        Applies the queued session-layer edits and settings in one change block.
+        Unless `force` is set, they wait for the OPENED event if the current stage isn't the one stored on OPENED yet.
+        """
+        stage = self.usd_context.get_stage()
+        if not stage or not self._session_edits:
+            return
+        if not force and self.stage != stage:
+            return
+        self._session_edits.flush(stage)
+
     def _set_active_camera_in_viewport(self, camera_path):
         """
         Sets the specified camera as the active camera in the active viewport.
@@ -82,6 +116,16 @@ class MyExtension(omni.ext.IExt):
             print(f"[innoactive.serverextension] Failed to set active camera in the viewport '{camera_path}': {str(e)}")
 
     def _on_stage_event(self, event):
+        if tracer.enabled:
+            tracer.instant(_stage_event_name(event.type), cat="stage", url=self.usd_context.get_stage_url())
+        self._handoff.on_stage_event(event)
+
+        if event.type == int(omni.usd.StageEventType.ASSETS_LOADED):
+            timing = self._timing.current
+            if timing and "opened" in timing["phases"]:
+                self._timing.mark("assets_loaded")
+                self._assets_loaded.set()
+
         if event.type == int(omni.usd.StageEventType.OPENED):
             print("[innoactive.serverextension] Stage has fully loaded!")
             stage_path = self.usd_context.get_stage_url()
@@ -93,13 +137,24 @@ class MyExtension(omni.ext.IExt):
                 print("[innoactive.serverextension] Unable to retrieve stage.")
                 return
 
+            self._flush_session_edits()
+
             if stage_path.startswith("anon:"):
-                delay = 1
-                print(f"[innoactive.serverextension] empty_stage loaded. Now loading USD file with delay of {delay} seconds")
-                asyncio.ensure_future(self._delayed_load_usd(delay))
+                self._timing.mark("empty_stage_opened")
+                if self.startup_mode == "direct":
+                    print("[innoactive.serverextension] empty_stage loaded in direct startup mode. Waiting for the USD file to be opened directly")
+                    return
+                print("[innoactive.serverextension] empty_stage loaded. Loading USD file once the stage and renderer are ready")
+                self._handoff.start()
             else:
                 print(f"[innoactive.serverextension] USD loaded: {stage_path}")
+                is_target = not stage_path.endswith(self.empty_stage)
+                if is_target:
+                    self._timing.mark("opened")
+                    self._assets_loaded.clear()
                 self.load_layout()
+                if is_target:
+                    self._record_first_frame()
 
 
     def load_usd(self, usd_file: str, log_errors=True):
@@ -114,90 +169,450 @@ class MyExtension(omni.ext.IExt):
                 carb.log_error(f"[innoactive.serverextension] Invalid USD path: {usd_file}. Must be a string.")
             return
 
+        tracer.ensure_future(self.load_usd_async(usd_file, log_errors), "load_usd")
+
+    async def load_usd_async(self, usd_file: str, log_errors=True):
+        """
+        Loads a USD file and returns (result, error) once the stage is opened.
+        Args:
+            usd_file (str): Path to the USD file to load.
+            log_errors (bool): Whether to log errors if loading fails.
+        """
         try:
             carb.log_info(f"[innoactive.serverextension] Loading USD file: {usd_file}")
-            omni.usd.get_context().open_stage(usd_file)
+            if usd_file != self.empty_stage:
+                self._timing.request(usd_file, load_mode=self.load_mode)
+
+            result, error = False, ""
+            cached_stage = self._stage_cache.lookup(usd_file) if self._stage_cache and usd_file != self.empty_stage else None
+            if cached_stage:
+                carb.log_info(f"[innoactive.serverextension] Attaching cached stage: {usd_file}")
+                result, error = await self.usd_context.attach_stage_async(cached_stage)
+                if result and self.load_mode == "streaming":
+                    self._payload_streamer.start(cached_stage, self._payload_camera_path())
+                if not result:
+                    carb.log_warn(f"[innoactive.serverextension] Failed to attach cached stage {usd_file}: {error}. Opening it again")
+
+            if not result:
+                result, error = await self._open_stage_async(usd_file)
+        except Exception as e:
+            result, error = False, str(e)
 
-            # If AR, then ensure the XRCam camera exists
-            if self.interface_mode == "ar":
-                self._ensure_camera_temp("/SessionLayer/XRCam", position=(0, 0, 0))
-                self._apply_ar_settings_after_load()
+        if not result:
+            if log_errors:
+                carb.log_error(f"[innoactive.serverextension] Failed to open USD file {usd_file}: {error}")
+            return False, error
+
+        self._after_load(usd_file)
+        return True, ""
+
+    def _uses_content_cache(self, usd_file: str) -> bool:
+        return self._content_cache is not None and ContentCache.is_remote(usd_file)
 
+    @tracer.traced("resolve_usd_file", cat="load")
+    async def _resolve_usd_file(self, usd_file: str) -> str:
+        """
+        Returns the local copy of a remote USD file from the content cache, the crate layer converted from a
+        text layer by ingest/convert.py, or the file itself.
+        """
+        if usd_file.lower().endswith(".usda"):
+            converted = lookup_converted(usd_file)
+            if converted:
+                carb.log_info(f"[innoactive.serverextension] Opening converted crate layer of {usd_file}: {converted}")
+                return converted
+        if not self._uses_content_cache(usd_file):
+            return usd_file
+        try:
+            return await self._content_cache.fetch_tree_async(usd_file)
         except Exception as e:
-            if log_errors:
-                carb.log_error(f"[innoactive.serverextension] Failed to open USD file {usd_file}: {str(e)}")
+            carb.log_warn(f"[innoactive.serverextension] Content cache failed for {usd_file}: {str(e)}. Opening it remotely")
+            return usd_file
+
+    def _payload_camera_path(self):
+        # Prioritize payloads around the XR camera in AR, the active viewport camera otherwise
+        return "/SessionLayer/XRCam" if self.interface_mode == "ar" else None
+
+    @tracer.traced("open_stage", cat="load")
+    async def _open_stage_async(self, usd_file: str):
+        usd_file = await self._resolve_usd_file(usd_file)
+        camera_path = self._payload_camera_path()
+        load_mode = self.load_mode
+        if load_mode == "auto":
+            load_mode = await self._run_preflight(usd_file)
+        if load_mode == "progressive":
+            return await self._progressive_loader.open_stage(usd_file, camera_path)
+        if load_mode == "streaming":
+            return await self._payload_streamer.open_stage(usd_file, camera_path)
+        if load_mode == "full" and self._flatten_cache:
+            usd_file = await self._resolve_flattened(usd_file)
+        if load_mode == "proxy":
+            # Only the parts outside of payloads, e.g. proxies, are loaded
+            return await self.usd_context.open_stage_async(usd_file, omni.usd.UsdContextInitialLoadSet.LOAD_NONE)
+        return await self.usd_context.open_stage_async(usd_file)
+
+    @tracer.traced("resolve_flattened", cat="load")
+    async def _resolve_flattened(self, usd_file: str) -> str:
+        """Returns the flattened copy of `usd_file` if the cache holds one for its current layers, the file itself otherwise."""
+        try:
+            flattened = await asyncio.get_event_loop().run_in_executor(None, self._flatten_cache.lookup, usd_file)
+        except Exception as e:
+            carb.log_warn(f"[innoactive.serverextension] Flatten cache lookup failed for {usd_file}: {str(e)}")
+            return usd_file
+        if not flattened:
+            return usd_file
+        carb.log_info(f"[innoactive.serverextension] Opening flattened copy of {usd_file}: {flattened}")
+        self._timing.annotate(flattened=True)
+        return flattened
+
+    @tracer.traced("preflight", cat="load")
+    async def _run_preflight(self, usd_file: str) -> str:
+        """Returns the load mode picked by the preflight analysis of `usd_file`, full if it fails."""
+        try:
+            load_mode = await asyncio.get_event_loop().run_in_executor(None, self._preflight.run, usd_file)
+        except Exception as e:
+            carb.log_warn(f"[innoactive.serverextension] Preflight of {usd_file} failed: {str(e)}. Loading it fully")
+            return "full"
+        self._timing.annotate(load_mode=load_mode)
+        self._timing.mark("preflight_done")
+        return load_mode
+
+    def _after_load(self, usd_file: str = None):
+        # Keep the stage resident for switching back to it later
+        if self._stage_cache and usd_file and usd_file != self.empty_stage:
+            self._stage_cache.put(usd_file, self.usd_context.get_stage())
+
+        # If AR, then ensure the XRCam camera exists
+        if self.interface_mode == "ar":
+            self._ensure_camera_temp("/SessionLayer/XRCam", position=(0, 0, 0))
+            self._apply_ar_settings_after_load()
+
+        # Applied right away if OPENED was already handled, on OPENED otherwise
+        self._flush_session_edits()
+
+    async def open_direct(self, usd_file: str) -> bool:
+        """
+        Opens the USD file as the first stage and falls back to the empty-stage flow on error.
+        Args:
+            usd_file (str): Path to the USD file to open.
+        """
+        self.startup_mode = "direct"
+        self.usd_to_load = usd_file
+
+        carb.log_info(f"[innoactive.serverextension] Opening USD file directly: {usd_file}")
+        self._timing.request(usd_file, load_mode=self.load_mode, startup_mode=self.startup_mode)
+        try:
+            result, error = await self._open_stage_async(usd_file)
+        except Exception as e:
+            result, error = False, str(e)
+
+        if result:
+            self._after_load(usd_file)
+            return True
 
-    async def _delayed_load_usd(self, delay = 10):
+        carb.log_warn(f"[innoactive.serverextension] Direct open of {usd_file} failed ({error}). Falling back to the empty stage")
+        self.startup_mode = "bootstrap"
+        await self.usd_context.new_stage_async()
+        return False
 
-        await asyncio.sleep(delay) 
+    def _on_handoff_ready(self):
+        if self.standby:
+            print("[innoactive.serverextension] Standby instance ready. Waiting for a USD file to be assigned")
+            self._parked = True
+            return
         self.load_usd(usd_file=self.usd_to_load)
 
-    def load_layout(self, log_errors=True):
+    def assign_usd(self, usd_file: str):
+        """
+        Assigns a USD file to a standby instance and loads it.
+        If the instance is still starting, the USD file is loaded once the empty stage is ready.
+        """
+        print(f"[innoactive.serverextension] assign_usd '{usd_file}'")
+        self.standby = False
+        self.usd_to_load = usd_file
+        if self._parked:
+            self._parked = False
+            self.load_usd(usd_file=usd_file)
+
+    def _on_control_status(self, message):
+        return {
+            "result": "success",
+            "ready": self._parked,
+            "standby": self.standby,
+            "usd": "" if self.standby else self.usd_to_load,
+        }
+
+    def _on_control_assign(self, message):
+        usd_file = message.get("usd")
+        if not isinstance(usd_file, str) or not usd_file:
+            raise ValueError(f"Invalid USD path: {usd_file}")
+        self.assign_usd(usd_file)
+
+    def _record_first_frame(self):
+        tracer.ensure_future(self._wait_first_frame(), "wait_first_frame")
+
+    async def _wait_first_frame(self):
+        viewport = get_active_viewport()
+        if viewport:
+            await viewport.wait_for_rendered_frames(1)
+
+        self._timing.mark("first_frame")
+        tracer.instant("first_frame", cat="load")
+
+        # The record is complete once both the first frame and the assets loaded, whichever comes later
+        record = self._timing.current
+        timeout = self.settings.get_as_float("/innoactive/serverextension/metrics/assetsLoadedTimeoutS")
+        try:
+            await asyncio.wait_for(self._assets_loaded.wait(), timeout if timeout > 0 else None)
+        except asyncio.TimeoutError:
+            self._timing.annotate(assets_loaded_timeout=True)
+        if self._timing.current is not record:
+            return
 
-        workspace_file = f"./InnoactiveLayout.{self.interface_mode}.json"
+        stage = self.usd_context.get_stage()
+        preflight = self._preflight.report_actual(estimate_stage_bytes(stage)) if stage else None
+        if preflight:
+            self._timing.annotate(preflight=preflight)
+        self._timing.finish()
 
-        if not os.path.exists(workspace_file):
-            if log_errors:
-                carb.log_error(f"[innoactive.serverextension] Layout file does not exist: {workspace_file}")
+        if self._first_frame_recorded:
             return
+        self._first_frame_recorded = True
+
+        ttff_ms = omni.kit.app.get_app().get_time_since_start_s() * 1000.0
+        self.settings.set("/innoactive/serverextension/metrics/timeToFirstFrameMs", ttff_ms)
+
+        # Keep the last value per startup mode so the direct mode can report what it saves
+        bootstrap_ms = self.settings.get_as_float(f"{PERSISTENT_TTFF}/bootstrap")
+        self.settings.set(f"{PERSISTENT_TTFF}/{self.startup_mode}", ttff_ms)
+
+        if self.startup_mode == "direct" and bootstrap_ms:
+            print(f"[innoactive.serverextension] Time to first frame: {ttff_ms:.1f} ms, "
+                  f"saved {bootstrap_ms - ttff_ms:.1f} ms compared to the last bootstrap startup ({bootstrap_ms:.1f} ms)")
+        else:
+            print(f"[innoactive.serverextension] Time to first frame: {ttff_ms:.1f} ms ({self.startup_mode} startup)")
+
+        # Write the startup trace once the steps scheduled after the first frame had time to run
+        write_delay_s = self.settings.get_as_float("/innoactive/serverextension/trace/writeDelayS")
+        if tracer.enabled and write_delay_s > 0:
+            await asyncio.sleep(write_delay_s)
+            self._write_trace()
 
+    def _write_trace(self) -> str:
         try:
-            result, _, content = omni.client.read_file(workspace_file)
-            if result != omni.client.Result.OK:
-                if log_errors:
-                    carb.log_error(f"[innoactive.serverextension] Can't read the workspace file {workspace_file}, error code: {result}")
-                return
+            return write_trace()
+        except Exception as e:
+            carb.log_error(f"[innoactive.serverextension] Failed to write the trace: {str(e)}")
+            return ""
 
-            try:
-                data = json.loads(memoryview(content).tobytes().decode("utf-8"))
-            except Exception as e:
-                if log_errors:
-                    carb.log_error(f"[innoactive.serverextension] Failed to parse JSON from {workspace_file}: {str(e)}")
-                return
+    @tracer.traced("load_layout")
+    def load_layout(self, log_errors=True) -> bool:
+
+        try:
+            data = self._layout_cache.get(self.interface_mode, log_errors)
+            if data is None:
+                return False
 
             ui.Workspace.restore_workspace(data, False)
-            carb.log_info(f"[innoactive.serverextension] The workspace is loaded from {workspace_file}")
+            self._timing.mark("layout_restored")
+            carb.log_info(f"[innoactive.serverextension] The workspace is loaded from {self._layout_cache.path_for(self.interface_mode)}")
+            return True
         except Exception as e:
             if log_errors:
                 carb.log_error(f"[innoactive.serverextension] Unexpected error while loading layout: {str(e)}")
+            return False
 
     def _apply_ar_settings_after_load(self):
         print("[innoactive.serverextension] applying AR settings after load")
-        # Innoactive AR Settings
-        self.settings.set("/xrstage/profile/ar/anchorMode", "scene origin")
-        self.settings.set("/xrstage/profile/ar/enableCameraOutput", True)
-        self.settings.set("/xrstage/profile/ar/cameraOutputPath", "/SessionLayer/XRCam")
+        # Innoactive AR Settings, applied with the session-layer edits
+        self._session_edits.add_settings({
+            "/xrstage/profile/ar/anchorMode": "scene origin",
+            "/xrstage/profile/ar/enableCameraOutput": True,
+            "/xrstage/profile/ar/cameraOutputPath": "/SessionLayer/XRCam",
+        })
         
 
+    @tracer.traced("apply_interface_profile")
+    def _apply_interface_profile(self, ext_id):
+        """
+        Applies the settings profile of the interface mode as one batched update.
+        The profile is read from `profilePath` ("{mode}" is replaced by the interface mode) or the extension's profiles folder.
+        """
+        profile_file = self.settings.get_as_string("/innoactive/serverextension/profilePath")
+        if profile_file:
+            profile_file = carb.tokens.get_tokens_interface().resolve(profile_file).replace("{mode}", self.interface_mode)
+        else:
+            ext_path = omni.kit.app.get_app().get_extension_manager().get_extension_path(ext_id)
+            profile_file = os.path.join(ext_path, "profiles", f"{self.interface_mode}.json")
+
+        try:
+            values = load_profile(profile_file, self.interface_mode)
+        except ValueError as e:
+            carb.log_error(f"[innoactive.serverextension] Invalid interface profile: {str(e)}")
+            return
+
+        apply_profile(values)
+        carb.log_info(f"[innoactive.serverextension] Applied {len(values)} settings from profile {profile_file}")
+
+    async def _command_load_stage(self, args):
+        usd_file = args.get("url")
+        if not isinstance(usd_file, str) or not usd_file:
+            raise ValueError(f"Invalid USD path: {usd_file}")
+        self.standby = False
+        self._parked = False
+        self.usd_to_load = usd_file
+        result, error = await self.load_usd_async(usd_file)
+        if not result:
+            raise RuntimeError(error or f"Failed to open USD file {usd_file}")
+
+    async def _command_restore_layout(self, args):
+        if not self.load_layout():
+            raise RuntimeError(f"Failed to restore layout {self._layout_cache.path_for(self.interface_mode)}")
+
+    async def _command_set_interface_mode(self, args):
+        mode = args.get("mode")
+        if mode not in INTERFACE_MODES:
+            raise ValueError(f"Unknown interface mode: {mode}")
+        self.interface_mode = mode
+        self.settings.set("/innoactive/serverextension/interfaceMode", mode)
+        self._apply_interface_profile(self._ext_id)
+
+    async def _command_ensure_camera(self, args):
+        camera_path = args.get("path", "/SessionLayer/XRCam")
+        self._ensure_camera_temp(camera_path, position=tuple(args.get("position", (0, 0, 0))))
+        self._flush_session_edits(force=True)
+        stage = self.usd_context.get_stage()
+        camera_prim = stage.GetPrimAtPath(camera_path) if stage else None
+        if not camera_prim or not camera_prim.IsValid():
+            raise RuntimeError(f"Camera '{camera_path}' could not be created")
+        if args.get("active"):
+            self._set_active_camera_in_viewport(camera_path)
+        return {"path": camera_path}
+
+    async def _command_write_trace(self, args):
+        if not tracer.enabled:
+            raise RuntimeError("Tracing is disabled, start with --/innoactive/serverextension/trace/enabled=true")
+        # The folder stays on this side, clients only get the file name back
+        return {"name": os.path.basename(write_trace(args.get("name")))}
+
+    def _start_governor(self):
+        """
+        Adjusts the XR resolution, and the foveation when warped foveation is active, from the main loop frame
+        times to hold the target frame rate.
+        """
+        resolution_path = f"/persistent/xr/profile/{self.interface_mode}/render/resolutionMultiplier"
+        foveation_path = f"/persistent/xr/profile/{self.interface_mode}/foveation/warped/resolutionMultiplier"
+        # The foveation multiplier only has an effect with warped foveation, the profile may turn it off
+        foveation_mode = self.settings.get_as_string(f"/persistent/xr/profile/{self.interface_mode}/foveation/mode")
+        foveation = (self.settings.get_as_float(foveation_path) or 1.0) if foveation_mode == "warped" else None
+
+        def apply(resolution, foveation):
+            self.settings.set(resolution_path, resolution)
+            if foveation is not None:
+                self.settings.set(foveation_path, foveation)
+
+        self._governor = FrameTimeGovernor(
+            GovernorConfig.from_settings(),
+            self.settings.get_as_float(resolution_path) or 1.0,
+            foveation,
+            apply,
+        )
+        self._governor_subscription = omni.kit.app.get_app().get_update_event_stream().create_subscription_to_pop(
+            lambda event: self._governor.add_sample(event.payload["dt"] * 1000.0),
+            name="Frame Governor Subscription"
+        )
+
+    @tracer.traced("innoactive.serverextension.on_startup")
     def on_startup(self, ext_id):
+        global _extension_instance
         print("[innoactive.serverextension] Extension startup")
+        _extension_instance = self
+        self._ext_id = ext_id
+        self._first_frame_recorded = False
 
         # Access parameters
         self.interface_mode = self.settings.get_as_string("/innoactive/serverextension/interfaceMode") or "screen"
         self.usd_to_load = self.settings.get_as_string("/innoactive/serverextension/usdPath") or self.default_usd
+        self.startup_mode = self.settings.get_as_string("/innoactive/serverextension/startupMode") or "direct"
+        self.load_mode = self.settings.get_as_string("/innoactive/serverextension/loadMode") or "full"
+
+        # Standby instances park on the empty stage, so they always use the bootstrap flow
+        self.standby = self.settings.get_as_bool("/innoactive/serverextension/standby")
+        self._parked = False
+        if self.standby:
+            self.startup_mode = "bootstrap"
+            self.settings.set("/innoactive/serverextension/startupMode", self.startup_mode)
+
+        timings_file = self.settings.get_as_string("/innoactive/serverextension/metrics/timingsFile")
+        timings_file_max_mb = self.settings.get_as_int("/innoactive/serverextension/metrics/timingsFileMaxMB")
+        self._timing = LoadTimingRecorder(
+            carb.tokens.get_tokens_interface().resolve(timings_file) if timings_file else None,
+            timings_file_max_mb * 1024 * 1024,
+        )
+        self._assets_loaded = asyncio.Event()
+        self._timing.begin(interface_mode=self.interface_mode, startup_mode=self.startup_mode)
+        self._timing.mark("extension_startup")
         #print("ANCHOR " + self.settings.get("/xrstage/profile/ar/anchorMode"))
 
-        if self.interface_mode == "vr":
-            # Set the resolution multiplier for VR rendering
-            self.settings.set("/persistent/xr/profile/vr/system/display", "SteamVR")
-            self.settings.set("/persistent/xr/profile/vr/render/resolutionMultiplier", 2.0)
-            self.settings.set("/persistent/xr/profile/vr/foveation/mode", "warped") #none / warped / inset
-            self.settings.set("/persistent/xr/profile/vr/foveation/warped/resolutionMultiplier", 0.5)
-            settings.set("/persistent/xr/profile/vr/foveation/warped/insetSize", 0.4)
-        elif self.interface_mode == "ar":
-            self.settings.set("/xr/cloudxr/version", 4.1)
-            self.settings.set("/xr/depth/aov", "GBufferDepth")
-            self.settings.set("/xr/simulatedxr/enabled", True)
-            self.settings.set("/persistent/renderer/raytracingOmm/enabled", True)
-            self.settings.set("/rtx-transient/resourcemanager/enableTextureStreaming", False)
-            self.settings.set("/xr/ui/enabled", False)
-            self.settings.set("/defaults/xr/profile/ar/renderQuality", "off")
-            self.settings.set("/defaults/xr/profile/ar/system/display", "CloudXR41")
-            self.settings.set("/persistent/xr/profile/ar/render/nearPlane", 0.15)
-            self.settings.set("/persistent/rtx/sceneDb/allowDuplicateAhsInvocation", False)
-            
+        self._apply_interface_profile(ext_id)
+
+        self._governor_subscription = None
+        if self.interface_mode in ("vr", "ar") and self.settings.get_as_bool("/innoactive/serverextension/governor/enabled"):
+            self._start_governor()
+
         # Get the USD context
         self.usd_context = omni.usd.get_context()
+        self._handoff = StageHandoff(self._on_handoff_ready)
+        self._progressive_loader = ProgressiveLoader(self.usd_context)
+        self._payload_streamer = PayloadStreamer(self.usd_context)
+        self._session_edits = SessionEditQueue()
+        self._preflight = Preflight()
+
+        self._content_cache = None
+        if self.settings.get_as_bool("/innoactive/serverextension/contentCache/enabled"):
+            cache_path = self.settings.get_as_string("/innoactive/serverextension/contentCache/path")
+            cache_size_mb = self.settings.get_as_int("/innoactive/serverextension/contentCache/maxSizeMB")
+            self._content_cache = ContentCache(carb.tokens.get_tokens_interface().resolve(cache_path), cache_size_mb * 1024 * 1024)
+
+        self._command_channel = CommandChannel({
+            "loadStage": self._command_load_stage,
+            "restoreLayout": self._command_restore_layout,
+            "setInterfaceMode": self._command_set_interface_mode,
+            "ensureCamera": self._command_ensure_camera,
+            "writeTrace": self._command_write_trace,
+        })
+
+        self._control_server = None
+        control_port = self.settings.get_as_int("/innoactive/serverextension/controlPort")
+        control_token = os.environ.pop(ENV_CONTROL_TOKEN, "")
+        if control_port and not control_token:
+            carb.log_warn(f"[innoactive.serverextension] No {ENV_CONTROL_TOKEN} in the environment, not opening the control port")
+        elif control_port:
+            self._control_server = ControlServer(control_port, {
+                "status": self._on_control_status,
+                "assign": self._on_control_assign,
+                "commandBatch": self._command_channel.run,
+            }, control_token)
+            tracer.ensure_future(self._control_server.start(), "control_server.start")
+
+        self._flatten_cache = None
+        if self.settings.get_as_bool("/innoactive/serverextension/flattenCache/enabled"):
+            flatten_cache_path = self.settings.get_as_string("/innoactive/serverextension/flattenCache/path")
+            flatten_cache_size_mb = self.settings.get_as_int("/innoactive/serverextension/flattenCache/maxSizeMB")
+            self._flatten_cache = FlattenCache(
+                carb.tokens.get_tokens_interface().resolve(flatten_cache_path), flatten_cache_size_mb * 1024 * 1024
+            )
+
+        self._stage_cache = None
+        if self.settings.get_as_bool("/innoactive/serverextension/stageCache/enabled"):
+            self._stage_cache = StageLRUCache(
+                self.settings.get_as_int("/innoactive/serverextension/stageCache/maxStages"),
+                self.settings.get_as_int("/innoactive/serverextension/stageCache/maxSizeMB") * 1024 * 1024,
+            )
+
+        # Parse the layouts of all interface modes up front, so restoring one on stage open is cheap
+        self._layout_cache = LayoutCache()
+        with tracer.span("layout_cache.preload"):
+            self._layout_cache.preload()
 
         # Subscribe to stage events
         self._subscription = self.usd_context.get_stage_event_stream().create_subscription_to_pop(
@@ -231,5 +646,22 @@ class MyExtension(omni.ext.IExt):
         
 
     def on_shutdown(self):
+        global _extension_instance
         print("[innoactive.serverextension] Extension shutdown")
+        _extension_instance = None
+        self._handoff.cancel()
+        self._progressive_loader.cancel()
+        self._payload_streamer.stop()
+        self._session_edits.clear()
+        if self._control_server:
+            self._control_server.stop()
+            self._control_server = None
+        self._command_channel.on_shutdown()
+        if self._stage_cache:
+            self._stage_cache.clear()
+            self._stage_cache = None
+        self._subscription = None
+        self._governor_subscription = None
+        if tracer.enabled and self.settings.get_as_string("/innoactive/serverextension/trace/path"):
+            self._write_trace()
 
@@ -0,0 +1,145 @@
+from collections import deque
+
+import carb
+import carb.settings
+
+
+class GovernorConfig:
+    """Bounds and tuning of the `FrameTimeGovernor`. Values are read from `/innoactive/serverextension/governor`."""
+
+    def __init__(
+        self,
+        target_hz: float = 90.0,
+        min_resolution: float = 1.0,
+        max_resolution: float = 2.0,
+        resolution_step: float = 0.1,
+        min_foveation: float = 0.3,
+        max_foveation: float = 1.0,
+        foveation_step: float = 0.05,
+        window_frames: int = 90,
+        upper_threshold: float = 1.05,
+        lower_threshold: float = 0.85,
+        cooldown_windows: int = 2,
+    ):
+        self.target_hz = target_hz
+        self.min_resolution = min_resolution
+        self.max_resolution = max_resolution
+        self.resolution_step = resolution_step
+        self.min_foveation = min_foveation
+        self.max_foveation = max_foveation
+        self.foveation_step = foveation_step
+        self.window_frames = window_frames
+        self.upper_threshold = upper_threshold
+        self.lower_threshold = lower_threshold
+        self.cooldown_windows = cooldown_windows
+
+    @staticmethod
+    def from_settings(path: str = "/innoactive/serverextension/governor"):
+        settings = carb.settings.get_settings()
+        config = GovernorConfig()
+        for name, key in (
+            ("target_hz", "targetHz"),
+            ("min_resolution", "minResolutionMultiplier"),
+            ("max_resolution", "maxResolutionMultiplier"),
+            ("resolution_step", "resolutionStep"),
+            ("min_foveation", "minFoveationMultiplier"),
+            ("max_foveation", "maxFoveationMultiplier"),
+            ("foveation_step", "foveationStep"),
+            ("upper_threshold", "upperThreshold"),
+            ("lower_threshold", "lowerThreshold"),
+        ):
+            if settings.get(f"{path}/{key}") is not None:
+                setattr(config, name, settings.get_as_float(f"{path}/{key}"))
+        for name, key in (("window_frames", "windowFrames"), ("cooldown_windows", "cooldownWindows")):
+            if settings.get(f"{path}/{key}") is not None:
+                setattr(config, name, settings.get_as_int(f"{path}/{key}"))
+        return config
+
+    @property
+    def budget_ms(self) -> float:
+        return 1000.0 / self.target_hz
+
+
+class FrameTimeGovernor:
+    """
+    Adjusts the XR resolution multiplier and foveation to hold the frame budget of `config.target_hz`.
+
+    Frame times are averaged over windows of `config.window_frames` samples. A window above
+    `upper_threshold` * budget lowers quality, foveation first and then resolution. A window below
+    `lower_threshold` * budget raises it again in reverse order. Windows in between change nothing, and
+    after each adjustment `cooldown_windows` windows are skipped to let the frame time settle.
+
+    Args:
+        config (GovernorConfig): Bounds and tuning.
+        resolution (float): Current resolution multiplier.
+        foveation (float): Current foveated-region resolution multiplier, lower is stronger foveation. None when
+            warped foveation is off, only the resolution is adjusted then.
+        apply_fn: Called with (resolution, foveation) after each adjustment.
+    """
+
+    def __init__(self, config: GovernorConfig, resolution: float, foveation: float, apply_fn=None):
+        self._config = config
+        self._apply_fn = apply_fn
+        self._samples = deque(maxlen=config.window_frames)
+        self._cooldown = 0
+        self.resolution = self._clamp(resolution, config.min_resolution, config.max_resolution)
+        self.foveation = None if foveation is None else self._clamp(foveation, config.min_foveation, config.max_foveation)
+        self.adjustments = 0
+
+    @staticmethod
+    def _clamp(value, low, high):
+        return round(min(max(value, low), high), 4)
+
+    def add_sample(self, frame_time_ms: float):
+        """Adds one frame time. Returns (resolution, foveation) if the quality was adjusted, None otherwise."""
+        self._samples.append(frame_time_ms)
+        if len(self._samples) < self._config.window_frames:
+            return None
+
+        average_ms = sum(self._samples) / len(self._samples)
+        self._samples.clear()
+
+        if self._cooldown > 0:
+            self._cooldown -= 1
+            return None
+
+        budget_ms = self._config.budget_ms
+        if average_ms > budget_ms * self._config.upper_threshold:
+            changed = self._decrease_quality()
+        elif average_ms < budget_ms * self._config.lower_threshold:
+            changed = self._increase_quality()
+        else:
+            changed = False
+
+        if not changed:
+            return None
+
+        self.adjustments += 1
+        self._cooldown = self._config.cooldown_windows
+        carb.log_info(
+            f"[innoactive.serverextension] Frame governor: average {average_ms:.2f} ms for a {budget_ms:.2f} ms budget, "
+            f"resolutionMultiplier={self.resolution} foveation resolutionMultiplier={self.foveation}"
+        )
+        if self._apply_fn:
+            self._apply_fn(self.resolution, self.foveation)
+        return self.resolution, self.foveation
+
+    def _decrease_quality(self) -> bool:
+        config = self._config
+        if self.foveation is not None and self.foveation > config.min_foveation:
+            self.foveation = self._clamp(self.foveation - config.foveation_step, config.min_foveation, config.max_foveation)
+            return True
+        if self.resolution > config.min_resolution:
+            self.resolution = self._clamp(self.resolution - config.resolution_step, config.min_resolution, config.max_resolution)
+            return True
+        return False
+
+    def _increase_quality(self) -> bool:
+        config = self._config
+        if self.resolution < config.max_resolution:
+            self.resolution = self._clamp(self.resolution + config.resolution_step, config.min_resolution, config.max_resolution)
+            return True
+        if self.foveation is not None and self.foveation < config.max_foveation:
+            self.foveation = self._clamp(self.foveation + config.foveation_step, config.min_foveation, config.max_foveation)
+            return True
+        return False
@@ -0,0 +1,204 @@
+"""
+Converts the text (usda) layers of USD files to binary crate (usdc) layers.
+
+    python convert.py PATH [PATH ...] [--force]
+
+Every text layer reachable from the given USD files (directories are searched recursively) is written as a
+crate layer: `name.usda` becomes `name.usdc`, text `.usd` files are converted in place. Asset paths of the
+converted layers that point at another converted `.usda` layer are rewritten to its `.usdc` file. Binary layers
+are left untouched, their asset paths keep pointing at the text sources, which are kept. Each conversion is
+verified to read back identical to its source and is recorded in `usd_manifest.json` next to the source, which
+the server extension reads to open the crate layer instead.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from pxr import Sdf, UsdUtils
+
+try:
+    from .flatten_cache import USD_EXTENSIONS, collect_layers
+except ImportError:
+    from flatten_cache import USD_EXTENSIONS, collect_layers
+
+
+MANIFEST_NAME = "usd_manifest.json"
+
+
+def is_text_layer(layer) -> bool:
+    format_id = layer.GetFileFormat().formatId
+    if format_id == "usd" and layer.realPath and os.path.isfile(layer.realPath):
+        # `.usd` files are either encoding, the one on disk is told by its header
+        with open(layer.realPath, "rb") as f:
+            return f.read(5) == b"#usda"
+    return format_id == "usda"
+
+
+def converted_path(path: str) -> str:
+    """Path of the crate layer written for the text layer at `path`."""
+    root, extension = os.path.splitext(path)
+    return f"{root}.usdc" if extension.lower() == ".usda" else path
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def read_manifest(folder: str) -> dict:
+    try:
+        with open(os.path.join(folder, MANIFEST_NAME), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def write_manifest(folder: str, manifest: dict):
+    path = os.path.join(folder, MANIFEST_NAME)
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=1, sort_keys=True)
+    os.replace(tmp_path, path)
+
+
+def lookup_converted(usd_file: str):
+    """Returns the crate layer recorded for the text layer `usd_file` if the source is unchanged, None otherwise."""
+    folder, name = os.path.split(os.path.abspath(usd_file))
+    entry = read_manifest(folder).get(name)
+    if not entry or not os.path.isfile(usd_file):
+        return None
+    stat = os.stat(usd_file)
+    if entry.get("source_size") != stat.st_size or entry.get("source_mtime_ns") != stat.st_mtime_ns:
+        return None
+    output = os.path.join(folder, entry["output"])
+    return output if os.path.isfile(output) else None
+
+
+def _rewrite_asset_paths(layer, converted: dict) -> int:
+    """Points asset paths of `layer` at the converted layers. Returns the number of rewritten paths."""
+    rewritten = 0
+
+    def modify(asset_path):
+        nonlocal rewritten
+        if not asset_path:
+            return asset_path
+        if os.path.normcase(layer.ComputeAbsolutePath(asset_path)) not in converted:
+            return asset_path
+        rewritten += 1
+        root, _ = os.path.splitext(asset_path)
+        return f"{root}.usdc"
+
+    UsdUtils.ModifyAssetPaths(layer, modify)
+    return rewritten
+
+
+def convert_layer(layer, output: str) -> str:
+    """
+    Writes `layer` as a crate file next to `output` and verifies it reads back identical to the layer.
+    Returns the path of the written file, raises ValueError on mismatch.
+    """
+    tmp_path = f"{output}.tmp.usdc"
+    if not layer.Export(tmp_path, args={"format": "usdc"}):
+        raise ValueError(f"Can't write {output}")
+
+    crate = Sdf.Layer.OpenAsAnonymous(tmp_path)
+    identical = crate is not None and crate.ExportToString() == layer.ExportToString()
+    crate = None  # Release the file before it is moved or removed
+    if not identical:
+        os.remove(tmp_path)
+        raise ValueError(f"Round trip of {layer.realPath} differs")
+    return tmp_path
+
+
+def convert(usd_file: str, force=False) -> list:
+    """
+    Converts the text layers reachable from `usd_file` and rewrites the asset paths between them.
+    Returns one result per text layer.
+    """
+    layers = [layer for layer in collect_layers(os.path.abspath(usd_file)) if layer.realPath]
+    text_layers = [layer for layer in layers if is_text_layer(layer)]
+    converted = {
+        os.path.normcase(layer.realPath): converted_path(layer.realPath)
+        for layer in text_layers
+        if converted_path(layer.realPath) != layer.realPath
+    }
+
+    results = []
+    for layer in text_layers:
+        source = layer.realPath
+        folder, name = os.path.split(source)
+        output = converted_path(source)
+        manifest = read_manifest(folder)
+        entry = manifest.get(name)
+        stat = os.stat(source)
+
+        if (
+            not force and entry
+            and entry.get("source_size") == stat.st_size and entry.get("source_mtime_ns") == stat.st_mtime_ns
+            and os.path.isfile(os.path.join(folder, entry["output"]))
+        ):
+            results.append({"source": source, "output": output, "result": "up to date"})
+            continue
+
+        # Hashed before converting, a text .usd is replaced by its crate layer
+        source_sha256 = _file_sha256(source)
+
+        # The crate gets the rewritten asset paths, the source layer is reverted afterwards
+        try:
+            rewritten = _rewrite_asset_paths(layer, converted) if converted else 0
+            tmp_path = convert_layer(layer, output)
+        finally:
+            layer.Reload(force=True)
+        os.replace(tmp_path, output)
+        if output == source:
+            # Converted in place, the text it was converted from is gone. The entry describes the file as it is
+            # now, so it stays valid until the file is replaced.
+            stat = os.stat(output)
+        manifest[name] = {
+            "output": os.path.basename(output),
+            "source_size": stat.st_size,
+            "source_mtime_ns": stat.st_mtime_ns,
+            "source_sha256": source_sha256,
+            "in_place": output == source,
+            "output_sha256": _file_sha256(output),
+            "rewritten_asset_paths": rewritten,
+            "verified": True,
+        }
+        write_manifest(folder, manifest)
+        results.append({"source": source, "output": output, "result": "converted", "rewritten_asset_paths": rewritten})
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Convert text USD layers to binary crate layers")
+    parser.add_argument("paths", nargs="+", help="USD files or folders of an asset library")
+    parser.add_argument("--force", action="store_true", help="Convert again even if the manifest is up to date")
+    options = parser.parse_args(argv)
+
+    failed = 0
+    for path in options.paths:
+        files = [path]
+        if os.path.isdir(path):
+            files = [
+                os.path.join(folder, name)
+                for folder, _, names in os.walk(path)
+                for name in sorted(names)
+                if name.lower().endswith(USD_EXTENSIONS)
+            ]
+        for usd_file in files:
+            try:
+                for result in convert(usd_file, options.force):
+                    print(f"{result['result']}: {result['source']} -> {result['output']}")
+            except Exception as e:
+                failed += 1
+                print(f"failed: {usd_file}: {str(e)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,171 @@
+"""
+Collapses identical meshes of a USD file into shared instanceable prototypes.
+
+    python dedup.py input.usd output.usd [--min-instances 2] [--precision 6]
+
+The input stage is flattened. Meshes with the same topology, points and primvars are replaced by
+instanceable Xforms that reference one prototype under `/Prototypes`. Each instance keeps its own
+transform, visibility, purpose and material binding. The memory and prim-count reduction is printed as JSON.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+
+from pxr import Sdf, Usd, UsdGeom
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+
+PROTOTYPES_PATH = Sdf.Path("/Prototypes")
+
+# Properties kept on the instance, everything else moves to the prototype
+INSTANCE_PROPERTY_PREFIXES = ("xformOp", "xformOpOrder", "visibility", "purpose", "material:binding")
+
+
+def _array_bytes(value, precision=None):
+    """Returns the raw bytes and the size of an array attribute value."""
+    if numpy is not None:
+        array = numpy.asarray(value)
+        if precision is not None and array.dtype.kind == "f":
+            array = numpy.round(array, precision)
+        array = numpy.ascontiguousarray(array)
+        return array.tobytes(), array.nbytes
+    data = repr(list(value)).encode()
+    return data, len(data)
+
+
+def _is_eligible(prim) -> bool:
+    if prim.IsInstance() or prim.IsInstanceProxy() or prim.IsInPrototype():
+        return False
+    # Children (e.g. GeomSubsets) may bind materials inside the mesh, skinned meshes bind to their skeleton
+    if prim.GetChildren() or any(name.startswith("skel:") for name in prim.GetPropertyNames()):
+        return False
+    return True
+
+
+def mesh_key(prim, precision=None):
+    """
+    Returns (hash, bytes) of the geometry of a mesh prim, or (None, 0) if it can't be shared.
+    The hash covers every attribute that ends up in the prototype, the bytes are the size of the array data.
+    """
+    digest = hashlib.sha1()
+    size = 0
+    for attribute in sorted(prim.GetAttributes(), key=lambda attribute: attribute.GetName()):
+        name = attribute.GetName()
+        if name.startswith(INSTANCE_PROPERTY_PREFIXES) or not attribute.HasAuthoredValue():
+            continue
+        if attribute.GetNumTimeSamples() > 0:
+            return None, 0
+
+        value = attribute.Get()
+        digest.update(name.encode())
+        if hasattr(value, "__len__") and not isinstance(value, str):
+            data, nbytes = _array_bytes(value, precision if name == "points" else None)
+            digest.update(data)
+            size += nbytes
+        else:
+            digest.update(repr(value).encode())
+        for key, metadata in sorted(attribute.GetAllAuthoredMetadata().items()):
+            if key not in ("default", "timeSamples", "typeName", "variability", "custom"):
+                digest.update(f"{key}={metadata!r}".encode())
+    return digest.hexdigest(), size
+
+
+def find_duplicates(stage, min_instances=2, precision=None):
+    """Returns {hash: ([mesh paths], bytes per mesh)} for meshes that occur at least `min_instances` times."""
+    groups = {}
+    for prim in stage.Traverse():
+        if not prim.IsA(UsdGeom.Mesh) or not _is_eligible(prim):
+            continue
+        key, size = mesh_key(prim, precision)
+        if key is None:
+            continue
+        paths, _ = groups.setdefault(key, ([], size))
+        paths.append(prim.GetPath())
+    return {key: group for key, group in groups.items() if len(group[0]) >= min_instances}
+
+
+def _remove_properties(spec, keep):
+    for prop in list(spec.properties):
+        if keep(prop.name):
+            continue
+        spec.RemoveProperty(prop)
+
+
+def instance_duplicates(layer, duplicates):
+    """Rewrites the flattened `layer` so each duplicate mesh references a shared instanceable prototype."""
+    prototypes = Sdf.CreatePrimInLayer(layer, PROTOTYPES_PATH)
+    prototypes.specifier = Sdf.SpecifierClass
+
+    with Sdf.ChangeBlock():
+        for key, (paths, _) in duplicates.items():
+            prototype = Sdf.PrimSpec(prototypes, f"Mesh_{key[:12]}", Sdf.SpecifierDef, "Xform")
+            geom_path = prototype.path.AppendChild("Geom")
+            Sdf.CopySpec(layer, paths[0], layer, geom_path)
+            _remove_properties(layer.GetPrimAtPath(geom_path), lambda name: not name.startswith(INSTANCE_PROPERTY_PREFIXES))
+
+            for path in paths:
+                spec = layer.GetPrimAtPath(path)
+                _remove_properties(spec, lambda name: name.startswith(INSTANCE_PROPERTY_PREFIXES))
+                spec.typeName = "Xform"
+                spec.instanceable = True
+                spec.referenceList.Prepend(Sdf.Reference("", prototype.path))
+
+
+def _count_prims(stage) -> int:
+    return sum(1 for _ in stage.Traverse())
+
+
+def optimize(input_file: str, output_file: str, min_instances=2, precision=None) -> dict:
+    """Writes the optimized copy of `input_file` to `output_file` and returns the reduction report."""
+    stage = Usd.Stage.Open(input_file)
+    if not stage:
+        raise ValueError(f"Can't open {input_file}")
+
+    duplicates = find_duplicates(stage, min_instances, precision)
+    prims_before = _count_prims(stage)
+    mesh_bytes_before = sum(size * len(paths) for paths, size in duplicates.values())
+
+    layer = stage.Flatten()
+    instance_duplicates(layer, duplicates)
+    if not layer.Export(output_file):
+        raise ValueError(f"Can't write {output_file}")
+
+    optimized = Usd.Stage.Open(output_file)
+    mesh_bytes_after = sum(size for _, size in duplicates.values())
+    return {
+        "input": input_file,
+        "output": output_file,
+        "prototypes": len(duplicates),
+        "instanced_meshes": sum(len(paths) for paths, _ in duplicates.values()),
+        "prims_before": prims_before,
+        "prims_after": _count_prims(optimized),
+        "prototype_prims": len(optimized.GetPrototypes()),
+        "mesh_bytes_before": mesh_bytes_before,
+        "mesh_bytes_after": mesh_bytes_after,
+        "mesh_bytes_saved": mesh_bytes_before - mesh_bytes_after,
+        "file_bytes_before": os.path.getsize(input_file) if os.path.isfile(input_file) else None,
+        "file_bytes_after": os.path.getsize(output_file),
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Collapse identical meshes into shared instanceable prototypes")
+    parser.add_argument("input", help="USD file to optimize")
+    parser.add_argument("output", help="Optimized USD file to write, e.g. model_instanced.usdc")
+    parser.add_argument("--min-instances", type=int, default=2, help="Occurrences needed to share a mesh")
+    parser.add_argument("--precision", type=int, default=None, help="Decimals the points are rounded to before comparing them")
+    options = parser.parse_args(argv)
+
+    report = optimize(options.input, options.output, options.min_instances, options.precision)
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,303 @@
+"""
+Cache of pre-flattened stages, stored as single .usdc crate files.
+
+    python flatten_cache.py CACHE_DIR PATH [PATH ...] [--force] [--max-size-mb MB]
+
+Flattens every USD file given (directories are searched recursively) into CACHE_DIR, so the server
+extension opens the flattened copy instead of composing the layer stack again. Entries are keyed by the
+content hash of every layer that can contribute to the stage. The extension validates an entry by the size and
+modification time of those layers, so any edit to a layer makes it miss until the stage is warmed again.
+"""
+import argparse
+import hashlib
+import json
+import os
+import sys
+import threading
+import time
+
+from pxr import Sdf, Usd
+
+
+USD_EXTENSIONS = (".usd", ".usda", ".usdc")
+DEFAULT_MAX_SIZE_MB = 20480
+
+
+def collect_layers(usd_file: str):
+    """Returns the layers `usd_file` may compose: its sublayers, references and payloads, recursively."""
+    layers = []
+    pending = [usd_file]
+    visited = set()
+
+    while pending:
+        identifier = pending.pop()
+        if identifier in visited:
+            continue
+        visited.add(identifier)
+
+        layer = Sdf.Layer.FindOrOpen(identifier)
+        if not layer:
+            raise ValueError(f"Can't open layer {identifier}")
+        layers.append(layer)
+
+        def follow(asset_path):
+            if asset_path:
+                pending.append(layer.ComputeAbsolutePath(asset_path))
+
+        for sublayer in layer.subLayerPaths:
+            follow(sublayer)
+
+        def visit(path):
+            if not (path.IsPrimPath() or path.IsPrimVariantSelectionPath()):
+                return
+            spec = layer.GetPrimAtPath(path)
+            if not spec:
+                return
+            for reference in spec.referenceList.GetAddedOrExplicitItems():
+                follow(reference.assetPath)
+            for payload in spec.payloadList.GetAddedOrExplicitItems():
+                follow(payload.assetPath)
+
+        layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+
+    return layers
+
+
+class FlattenCache:
+    """
+    Flattened .usdc copies of stages in `root`, keyed by the content hash of their layer stack.
+
+    Content hashes of layer files are remembered by size and modification time in `index.json`. Warming a stage
+    also records the layer files it composes with their sizes and modification times, so looking it up only
+    stats those files and doesn't open any layer. A hit touches the flattened copy instead of writing the index,
+    so its modification time is its last use. The least recently used copies are evicted once they take more
+    than `max_bytes`, when the cache is created and after warming, 0 keeps everything.
+    """
+
+    def __init__(self, root: str, max_bytes: int = 0):
+        self._root = root
+        self._max_bytes = max_bytes
+        self._index_path = os.path.join(root, "index.json")
+        self._lock = threading.Lock()
+        self._dirty = False
+        os.makedirs(root, exist_ok=True)
+        self._index_mtime = None
+        self._index = self._load_index()
+        if max_bytes:
+            with self._lock:
+                if self._evict(pinned=None):
+                    self._save_index()
+
+    def _load_index(self):
+        try:
+            self._index_mtime = os.stat(self._index_path).st_mtime_ns
+            with open(self._index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+        except (OSError, ValueError):
+            index = {}
+        index.setdefault("layers", {})
+        index.setdefault("entries", {})
+        index.setdefault("sources", {})
+        return index
+
+    def _refresh_index(self):
+        # The cache is warmed by a separate process, pick up what it wrote
+        try:
+            mtime = os.stat(self._index_path).st_mtime_ns
+        except OSError:
+            return
+        if mtime != self._index_mtime:
+            self._index = self._load_index()
+
+    def _save_index(self):
+        # Unique per process, the extension and the warming script may save at the same time
+        tmp_path = f"{self._index_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._index, f, indent=1)
+        os.replace(tmp_path, self._index_path)
+        self._index_mtime = os.stat(self._index_path).st_mtime_ns
+
+    def _layer_hash(self, layer) -> str:
+        real_path = layer.realPath
+        if not real_path or not os.path.isfile(real_path):
+            return hashlib.sha256(layer.ExportToString().encode()).hexdigest()
+
+        stat = os.stat(real_path)
+        known = self._index["layers"].get(real_path)
+        if known and known[0] == stat.st_size and known[1] == stat.st_mtime_ns:
+            return known[2]
+
+        digest = hashlib.sha256()
+        with open(real_path, "rb") as f:
+            for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                digest.update(chunk)
+        self._index["layers"][real_path] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        self._dirty = True
+        return digest.hexdigest()
+
+    def _key_and_dependencies(self, usd_file: str):
+        """
+        Content hash of all layers `usd_file` may compose, and [real path, size, mtime] of each of those layers.
+        The dependencies are None if a layer isn't a local file, such stages can't be validated by stat.
+        """
+        digest = hashlib.sha256()
+        dependencies = []
+        for layer in sorted(collect_layers(usd_file), key=lambda layer: layer.identifier):
+            digest.update(layer.identifier.encode())
+            digest.update(self._layer_hash(layer).encode())
+            real_path = layer.realPath
+            if dependencies is not None and real_path and os.path.isfile(real_path):
+                stat = os.stat(real_path)
+                dependencies.append([real_path, stat.st_size, stat.st_mtime_ns])
+            else:
+                dependencies = None
+        return digest.hexdigest(), dependencies
+
+    def key(self, usd_file: str) -> str:
+        """Content hash of all layers `usd_file` may compose."""
+        if os.path.exists(usd_file):
+            usd_file = os.path.abspath(usd_file)
+        with self._lock:
+            key, _ = self._key_and_dependencies(usd_file)
+            if self._dirty:
+                self._save_index()
+                self._dirty = False
+            return key
+
+    def path_for(self, key: str) -> str:
+        return os.path.join(self._root, f"{key}.usdc")
+
+    def lookup(self, usd_file: str):
+        """Returns the flattened copy of `usd_file` if it is up to date, None otherwise. Only stats files."""
+        if os.path.exists(usd_file):
+            usd_file = os.path.abspath(usd_file)
+        with self._lock:
+            self._refresh_index()
+            source = self._index["sources"].get(usd_file)
+            if not source or source["key"] not in self._index["entries"]:
+                return None
+            for real_path, size, mtime in source["layers"]:
+                try:
+                    stat = os.stat(real_path)
+                except OSError:
+                    return None
+                if stat.st_size != size or stat.st_mtime_ns != mtime:
+                    return None
+            path = self.path_for(source["key"])
+            if not os.path.isfile(path):
+                return None
+            try:
+                os.utime(path)
+            except OSError:
+                pass
+            return path
+
+    def warm(self, usd_file: str, force=False):
+        """Flattens `usd_file` into the cache unless it is up to date. Returns (flattened path, whether it was written)."""
+        with self._lock:
+            self._refresh_index()
+            key, dependencies = self._key_and_dependencies(usd_file)
+            if self._record_source(usd_file, key, dependencies) or self._dirty:
+                self._save_index()
+                self._dirty = False
+        path = self.path_for(key)
+        if os.path.isfile(path) and key in self._index["entries"] and not force:
+            return path, False
+
+        stage = Usd.Stage.Open(usd_file)
+        if not stage:
+            raise ValueError(f"Can't open {usd_file}")
+        tmp_path = f"{path}.tmp.usdc"
+        if not stage.Export(tmp_path):
+            raise ValueError(f"Can't flatten {usd_file}")
+        os.replace(tmp_path, path)
+
+        with self._lock:
+            self._index["entries"][key] = {
+                "source": usd_file,
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+                "bytes": os.path.getsize(path),
+            }
+            self._evict(pinned=key)
+            self._save_index()
+        return path, True
+
+    def _record_source(self, usd_file: str, key: str, dependencies) -> bool:
+        """Records the layers of `usd_file`, returns whether the index changed."""
+        sources = self._index["sources"]
+        if dependencies is None:
+            return sources.pop(usd_file, None) is not None
+        source = {"key": key, "layers": dependencies}
+        if sources.get(usd_file) == source:
+            return False
+        sources[usd_file] = source
+        return True
+
+    def _last_use(self, key: str) -> float:
+        try:
+            return os.stat(self.path_for(key)).st_mtime
+        except OSError:
+            return 0.0
+
+    def _evict(self, pinned) -> bool:
+        """Evicts the least recently used copies above `max_bytes`, returns whether the index changed."""
+        if not self._max_bytes:
+            return False
+        entries = self._index["entries"]
+        total = sum(entry["bytes"] for entry in entries.values())
+        evicted = False
+        for key in sorted(entries, key=self._last_use):
+            if total <= self._max_bytes:
+                break
+            if key == pinned:
+                continue
+            total -= entries.pop(key)["bytes"]
+            evicted = True
+            try:
+                os.remove(self.path_for(key))
+            except OSError:
+                pass
+        if evicted:
+            self._index["sources"] = {
+                source: entry for source, entry in self._index["sources"].items() if entry["key"] in entries
+            }
+        return evicted
+
+
+def _usd_files(paths):
+    for path in paths:
+        if os.path.isdir(path):
+            for folder, _, files in os.walk(path):
+                for name in sorted(files):
+                    if name.lower().endswith(USD_EXTENSIONS):
+                        yield os.path.join(folder, name)
+        else:
+            yield path
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Pre-warm the flattened stage cache of the server extension")
+    parser.add_argument("cache", help="Cache folder, the server extension's flattenCache.path")
+    parser.add_argument("paths", nargs="+", help="USD files or folders of an asset library")
+    parser.add_argument("--force", action="store_true", help="Flatten again even if the cached copy is up to date")
+    parser.add_argument(
+        "--max-size-mb", type=int, default=DEFAULT_MAX_SIZE_MB,
+        help=f"Evict the least recently used copies above this size, 0 keeps all (default {DEFAULT_MAX_SIZE_MB})",
+    )
+    options = parser.parse_args(argv)
+
+    cache = FlattenCache(options.cache, options.max_size_mb * 1024 * 1024)
+    failed = 0
+    for usd_file in _usd_files(options.paths):
+        usd_file = os.path.abspath(usd_file)
+        try:
+            path, written = cache.warm(usd_file, options.force)
+            print(f"{'flattened' if written else 'up to date'}: {usd_file} -> {path}")
+        except Exception as e:
+            failed += 1
+            print(f"failed: {usd_file}: {str(e)}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
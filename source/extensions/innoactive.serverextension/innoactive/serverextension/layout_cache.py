@@ -0,0 +1,68 @@
+import json
+import os
+
+import carb
+import omni.client
+
+
+class LayoutCache:
+    """
+    Keeps the parsed InnoactiveLayout.{mode}.json workspaces in memory.
+
+    Entries are keyed by path and modification time, so a layout file is only read and parsed again
+    when it changes on disk.
+    """
+
+    def __init__(self, path_format: str = "./InnoactiveLayout.{mode}.json"):
+        self._path_format = path_format
+        self._entries = {}  # path -> (mtime, data)
+
+    def path_for(self, mode: str) -> str:
+        return self._path_format.format(mode=mode)
+
+    def preload(self, modes=("screen", "vr", "ar")):
+        """Reads and parses the layouts of all interface modes that exist on disk."""
+        for mode in modes:
+            self.get(mode, log_errors=False)
+
+    def get(self, mode: str, log_errors=True):
+        """
+        Returns the parsed workspace of the given interface mode, or None if it can't be loaded.
+        Args:
+            mode (str): Interface mode (screen / vr / ar).
+            log_errors (bool): Whether to log errors if loading fails.
+        """
+        workspace_file = self.path_for(mode)
+
+        try:
+            mtime = os.path.getmtime(workspace_file)
+        except OSError:
+            if log_errors:
+                carb.log_error(f"[innoactive.serverextension] Layout file does not exist: {workspace_file}")
+            return None
+
+        entry = self._entries.get(workspace_file)
+        if entry and entry[0] == mtime:
+            return entry[1]
+
+        data = self._read(workspace_file, log_errors)
+        if data is not None:
+            self._entries[workspace_file] = (mtime, data)
+        return data
+
+    def clear(self):
+        self._entries.clear()
+
+    def _read(self, workspace_file: str, log_errors: bool):
+        result, _, content = omni.client.read_file(workspace_file)
+        if result != omni.client.Result.OK:
+            if log_errors:
+                carb.log_error(f"[innoactive.serverextension] Can't read the workspace file {workspace_file}, error code: {result}")
+            return None
+
+        try:
+            return json.loads(memoryview(content).tobytes().decode("utf-8"))
+        except Exception as e:
+            if log_errors:
+                carb.log_error(f"[innoactive.serverextension] Failed to parse JSON from {workspace_file}: {str(e)}")
+            return None
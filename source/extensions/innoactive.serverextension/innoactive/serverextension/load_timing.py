@@ -0,0 +1,95 @@
+import json
+import os
+import platform
+import time
+import uuid
+
+import carb
+import carb.settings
+
+
+SETTING_LAST_SESSION = "/innoactive/serverextension/metrics/lastSession"
+SETTING_SESSION_COUNT = "/innoactive/serverextension/metrics/sessionCount"
+
+
+class LoadTimingRecorder:
+    """
+    Records monotonic timestamps of the stage-load phases, one record per loaded model.
+
+    Phases: extension_startup, empty_stage_opened, target_requested, preflight_done, opened, assets_loaded,
+    layout_restored, first_frame. Finished records are published to `SETTING_LAST_SESSION` and appended as one JSON object
+    per line to `json_path`, so fleet dashboards can aggregate time-to-interactive per model and interface mode.
+    Once `json_path` exceeds `max_bytes` it is moved to `json_path.1`, replacing the previous one.
+    """
+
+    def __init__(self, json_path: str = None, max_bytes: int = 0):
+        self._json_path = json_path
+        self._max_bytes = max_bytes
+        self._settings = carb.settings.get_settings()
+        self._session_count = 0
+        self._current = None
+        self._origin = 0.0
+        self._interface_mode = None
+
+    @property
+    def current(self):
+        return self._current
+
+    def begin(self, **info):
+        """Starts a new record. `info` (usd, interface_mode, ...) is stored with it."""
+        self._origin = time.monotonic()
+        self._current = {
+            "session_id": uuid.uuid4().hex,
+            "node": platform.node(),
+            "started": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+            "phases": {},
+        }
+        self._current.update(info)
+        self._interface_mode = info.get("interface_mode", self._interface_mode)
+
+    def request(self, usd_file: str, **info):
+        """Marks the target USD request, starting a new record if the current one already requested a model."""
+        if self._current is None or "target_requested" in self._current["phases"]:
+            self.begin(interface_mode=self._interface_mode)
+        self._current["usd"] = usd_file
+        self._current.update(info)
+        self.mark("target_requested")
+
+    def annotate(self, **info):
+        """Stores `info` with the current record."""
+        if self._current is not None:
+            self._current.update(info)
+
+    def mark(self, phase: str):
+        """Records `phase` in the current record, keeping the first occurrence only."""
+        if self._current is None or phase in self._current["phases"]:
+            return
+        self._current["phases"][phase] = round((time.monotonic() - self._origin) * 1000.0, 3)
+
+    def finish(self):
+        """Publishes and closes the current record."""
+        record = self._current
+        if record is None:
+            return
+        self._current = None
+
+        phases = record["phases"]
+        if "first_frame" in phases:
+            record["time_to_interactive_ms"] = phases["first_frame"]
+            if "target_requested" in phases:
+                record["load_to_interactive_ms"] = round(phases["first_frame"] - phases["target_requested"], 3)
+
+        self._session_count += 1
+        self._settings.set(SETTING_LAST_SESSION, record)
+        self._settings.set(SETTING_SESSION_COUNT, self._session_count)
+        carb.log_info(f"[innoactive.serverextension] Stage load timings: {json.dumps(record)}")
+
+        if self._json_path:
+            try:
+                os.makedirs(os.path.dirname(self._json_path), exist_ok=True)
+                if self._max_bytes and os.path.isfile(self._json_path) and os.path.getsize(self._json_path) >= self._max_bytes:
+                    os.replace(self._json_path, f"{self._json_path}.1")
+                with open(self._json_path, "a", encoding="utf-8") as f:
+                    f.write(json.dumps(record) + "\n")
+            except OSError as e:
+                carb.log_warn(f"[innoactive.serverextension] Failed to write stage load timings to {self._json_path}: {str(e)}")
@@ -0,0 +1,252 @@
+import bisect
+import os
+
+import carb
+import carb.settings
+import omni.kit.app
+import omni.usd
+from omni.kit.viewport.utility import get_active_viewport_camera_string
+from pxr import Gf, Usd, UsdGeom
+
+
+SETTING_STREAMING = "/innoactive/serverextension/streaming"
+SETTING_STREAMING_METRICS = "/innoactive/serverextension/metrics/payloadStreaming"
+
+
+def plan_payload_changes(distances: dict, resident: set, load_radius: float, unload_radius: float, max_ops: int):
+    """
+    Returns the payload paths to (load, unload) for the given camera distances.
+
+    Payloads within `load_radius` are loaded nearest first, resident ones beyond `unload_radius` are unloaded
+    farthest first. The band in between keeps the current state, so a camera moving at a border doesn't make
+    payloads flip every frame. At most `max_ops` changes are returned, unloads first to free memory.
+    """
+    queue = PayloadQueue()
+    queue.plan(distances, resident, load_radius, unload_radius)
+    return queue.take(max_ops, distances, resident)
+
+
+class PayloadQueue:
+    """
+    The payload changes planned for a camera position, applied over as many frames as it takes.
+
+    Both queues are sorted once by `plan` with the next change at their end, payloads discovered later are
+    inserted in order by `add`, so `take` only looks at the entries it returns and ones gone stale since.
+    """
+
+    def __init__(self):
+        self._load = []  # (-distance, path), nearest last
+        self._unload = []  # (distance, path), farthest last
+
+    def __bool__(self):
+        return bool(self._load or self._unload)
+
+    def plan(self, distances: dict, resident: set, load_radius: float, unload_radius: float):
+        self._unload = sorted(
+            (distances.get(path, 0.0), path) for path in resident if distances.get(path, 0.0) > unload_radius
+        )
+        self._load = sorted(
+            (-distance, path) for path, distance in distances.items() if distance <= load_radius and path not in resident
+        )
+
+    def add(self, path, distance: float, load_radius: float):
+        """Queues a payload discovered after planning, if it is within `load_radius`."""
+        if distance <= load_radius:
+            bisect.insort(self._load, (-distance, path))
+
+    def take(self, max_ops: int, known, resident: set):
+        """Removes and returns the next (load, unload) paths, at most `max_ops` of them, unloads first."""
+        unload = []
+        while self._unload and len(unload) < max_ops:
+            _, path = self._unload.pop()
+            if path in resident:
+                unload.append(path)
+        load = []
+        while self._load and len(load) + len(unload) < max_ops:
+            _, path = self._load.pop()
+            if path in known and path not in resident:
+                load.append(path)
+        return load, unload
+
+
+def estimate_payload_bytes(prim) -> int:
+    """Estimates the memory of a payload from the size of the files its payload arcs point to."""
+    total = 0
+    for spec in prim.GetPrimStack():
+        if not spec.hasPayloads:
+            continue
+        for payload in spec.payloadList.GetAddedOrExplicitItems():
+            if not payload.assetPath:
+                continue
+            path = spec.layer.ComputeAbsolutePath(payload.assetPath)
+            if os.path.isfile(path):
+                total += os.path.getsize(path)
+    return total
+
+
+class PayloadStreamer:
+    """
+    Keeps the payloads around the camera loaded while walking through stages too large to load at once.
+
+    The stage is opened without payloads. Every frame the camera position is checked and, once it moved by
+    more than `moveThreshold`, the payloads are planned again into a `PayloadQueue`. The changes are applied
+    through the stage load rules, at most `maxOpsPerFrame` per frame, and the frames in between only take
+    from the queue. Nested payloads are found under their parent once it is loaded. The resident count and memory estimate are published under
+    `SETTING_STREAMING_METRICS`.
+    """
+
+    def __init__(self, usd_context):
+        settings = carb.settings.get_settings()
+        self._usd_context = usd_context
+        self._camera_path = None
+        self._load_radius = settings.get_as_float(f"{SETTING_STREAMING}/loadRadius") or 5000.0
+        self._unload_radius = max(settings.get_as_float(f"{SETTING_STREAMING}/unloadRadius"), self._load_radius)
+        self._max_ops = max(settings.get_as_int(f"{SETTING_STREAMING}/maxOpsPerFrame"), 1)
+        self._move_threshold = settings.get_as_float(f"{SETTING_STREAMING}/moveThreshold")
+
+        self._stage = None
+        self._subscription = None
+        self._positions = {}  # payload path -> world position
+        self._bytes = {}  # payload path -> estimated size
+        self._nested = {}  # payload path -> payload paths nested directly in it
+        self._resident = set()
+        self._camera_position = None
+        self._queue = PayloadQueue()  # planned changes left over from the last frames
+
+    @property
+    def resident_count(self) -> int:
+        return len(self._resident)
+
+    @property
+    def resident_bytes(self) -> int:
+        return sum(self._bytes.get(path, 0) for path in self._resident)
+
+    async def open_stage(self, usd_file: str, camera_path: str = None):
+        """
+        Opens `usd_file` with no payloads loaded and starts streaming them around the camera.
+        Args:
+            usd_file (str): Path to the USD file to open.
+            camera_path (str): Camera to stream payloads around. Defaults to the active viewport camera.
+        """
+        self.stop()
+        result, error = await self._usd_context.open_stage_async(usd_file, omni.usd.UsdContextInitialLoadSet.LOAD_NONE)
+        if result:
+            self.start(self._usd_context.get_stage(), camera_path)
+        return result, error
+
+    def start(self, stage, camera_path: str = None):
+        self.stop()
+        self._stage = stage
+        self._camera_path = camera_path
+        self._discover()
+        self._subscription = omni.kit.app.get_app().get_update_event_stream().create_subscription_to_pop(
+            self._on_update, name="innoactive.serverextension payload streaming"
+        )
+        self._publish()
+        carb.log_info(f"[innoactive.serverextension] Streaming {len(self._positions)} payloads within {self._load_radius} units")
+
+    def stop(self):
+        self._subscription = None
+        self._stage = None
+        self._positions.clear()
+        self._bytes.clear()
+        self._nested.clear()
+        self._resident.clear()
+        self._camera_position = None
+        self._queue = PayloadQueue()
+
+    def _discover(self):
+        """Tracks all loadable prims of the stage, once when streaming starts."""
+        loadable = set(self._stage.FindLoadable())
+        for path in loadable:
+            self._track(path)
+            parent = path.GetParentPath()
+            while not parent.isEmpty and parent not in loadable:
+                parent = parent.GetParentPath()
+            if not parent.isEmpty:
+                self._nested.setdefault(parent, []).append(path)
+        self._resident = set(self._stage.GetLoadSet()) & loadable
+
+    def _discover_under(self, path):
+        """Tracks the payloads nested in the just loaded payload at `path`."""
+        nested = [found for found in self._stage.FindLoadable(path) if found != path]
+        self._nested[path] = nested
+        for found in nested:
+            self._track(found)
+            if self._camera_position is not None:
+                distance = (self._positions[found] - self._camera_position).GetLength()
+                self._queue.add(found, distance, self._load_radius)
+
+    def _forget_under(self, path):
+        """Stops tracking the payloads nested in the just unloaded payload at `path`, they are gone from the stage."""
+        pending = list(self._nested.pop(path, []))
+        while pending:
+            nested = pending.pop()
+            self._positions.pop(nested, None)
+            self._bytes.pop(nested, None)
+            self._resident.discard(nested)
+            pending.extend(self._nested.pop(nested, []))
+
+    def _track(self, path):
+        prim = self._stage.GetPrimAtPath(path)
+        self._positions[path] = self._world_position(prim)
+        self._bytes[path] = estimate_payload_bytes(prim)
+
+    def _world_position(self, prim):
+        xformable = UsdGeom.Xformable(prim)
+        if not xformable:
+            return Gf.Vec3d(0, 0, 0)
+        return xformable.ComputeLocalToWorldTransform(Usd.TimeCode.Default()).ExtractTranslation()
+
+    def _current_camera_position(self):
+        camera_path = self._camera_path or get_active_viewport_camera_string()
+        camera = self._stage.GetPrimAtPath(camera_path) if camera_path else None
+        if not camera or not camera.IsValid():
+            return Gf.Vec3d(0, 0, 0)
+        return self._world_position(camera)
+
+    def _on_update(self, event):
+        if self._stage is None or self._stage != self._usd_context.get_stage():
+            self.stop()
+            return
+
+        camera_position = self._current_camera_position()
+        moved = (
+            self._camera_position is None
+            or (camera_position - self._camera_position).GetLength() > self._move_threshold
+        )
+        if moved:
+            self._camera_position = camera_position
+            distances = {path: (position - camera_position).GetLength() for path, position in self._positions.items()}
+            self._queue.plan(distances, self._resident, self._load_radius, self._unload_radius)
+        elif not self._queue:
+            return
+
+        load, unload = self._queue.take(self._max_ops, self._positions, self._resident)
+        if not load and not unload:
+            return
+        self._apply(load, unload)
+        self._publish()
+
+    def _apply(self, load, unload):
+        rules = self._stage.GetLoadRules()
+        for path in unload:
+            # Also drops the rules of the payloads nested in it, so they don't come back with it
+            rules.Unload(path)
+        for path in load:
+            rules.AddRule(path, Usd.StageLoadRules.OnlyRule)
+        rules.Minimize()
+        self._stage.SetLoadRules(rules)
+
+        for path in unload:
+            self._resident.discard(path)
+            self._forget_under(path)
+        for path in load:
+            self._resident.add(path)
+            self._discover_under(path)
+
+    def _publish(self):
+        settings = carb.settings.get_settings()
+        settings.set(f"{SETTING_STREAMING_METRICS}/resident", self.resident_count)
+        settings.set(f"{SETTING_STREAMING_METRICS}/known", len(self._positions))
+        settings.set(f"{SETTING_STREAMING_METRICS}/residentBytes", self.resident_bytes)
@@ -0,0 +1,190 @@
+import os
+
+import carb
+import carb.settings
+from pxr import Sdf
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+SETTING_PREFLIGHT = "/innoactive/serverextension/preflight"
+SETTING_PREFLIGHT_METRICS = "/innoactive/serverextension/metrics/preflight"
+TEXTURE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".exr", ".hdr", ".tga", ".tif", ".tiff", ".dds", ".ktx", ".bmp")
+
+MB = 1024 * 1024
+
+
+class PreflightReport:
+    """Counts gathered from the layers of a stage by `analyze_stage`."""
+
+    def __init__(self, usd_file: str):
+        self.usd_file = usd_file
+        self.layers = 0
+        self.layer_bytes = 0
+        self.prims = 0
+        self.payloads = 0
+        self.references = 0
+        self.instanceable = 0
+        self.textures = 0
+        self.texture_bytes = 0
+        self.unresolved = []
+
+    def predicted_bytes(self, layer_factor: float, texture_factor: float) -> int:
+        """Predicts the memory of the fully loaded stage from the size of its layers and textures on disk."""
+        return int(self.layer_bytes * layer_factor + self.texture_bytes * texture_factor)
+
+    def as_dict(self) -> dict:
+        return {
+            "usd": self.usd_file,
+            "layers": self.layers,
+            "layer_bytes": self.layer_bytes,
+            "prims": self.prims,
+            "payloads": self.payloads,
+            "references": self.references,
+            "instanceable": self.instanceable,
+            "textures": self.textures,
+            "texture_bytes": self.texture_bytes,
+            "unresolved": len(self.unresolved),
+        }
+
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.isfile(path) else 0
+
+
+def analyze_stage(usd_file: str) -> PreflightReport:
+    """
+    Walks the layers of `usd_file` without composing a stage: sublayers, references and payloads are followed
+    and every layer is read once. Prims are counted per prim spec, so overs and instanced prototypes count as
+    authored rather than as composed.
+    """
+    report = PreflightReport(usd_file)
+    textures = set()
+    pending = [usd_file]
+    visited = set()
+
+    def follow(layer, asset_path):
+        if asset_path:
+            pending.append(layer.ComputeAbsolutePath(asset_path))
+
+    while pending:
+        identifier = pending.pop()
+        if identifier in visited:
+            continue
+        visited.add(identifier)
+
+        layer = Sdf.Layer.FindOrOpen(identifier)
+        if not layer:
+            report.unresolved.append(identifier)
+            continue
+
+        report.layers += 1
+        report.layer_bytes += _file_size(layer.realPath)
+        for sublayer in layer.subLayerPaths:
+            follow(layer, sublayer)
+
+        def visit(path):
+            if path.IsPrimPath() or path.IsPrimVariantSelectionPath():
+                spec = layer.GetPrimAtPath(path)
+                if not spec:
+                    return
+                if path.IsPrimPath():
+                    report.prims += 1
+                if spec.instanceable:
+                    report.instanceable += 1
+                for reference in spec.referenceList.GetAddedOrExplicitItems():
+                    report.references += 1
+                    follow(layer, reference.assetPath)
+                for payload in spec.payloadList.GetAddedOrExplicitItems():
+                    report.payloads += 1
+                    follow(layer, payload.assetPath)
+            elif path.IsPropertyPath():
+                spec = layer.GetAttributeAtPath(path)
+                if spec and spec.typeName == Sdf.ValueTypeNames.Asset:
+                    value = spec.default
+                    asset_path = value.path if isinstance(value, Sdf.AssetPath) else ""
+                    if asset_path.lower().endswith(TEXTURE_EXTENSIONS):
+                        textures.add(layer.ComputeAbsolutePath(asset_path))
+
+        layer.Traverse(Sdf.Path.absoluteRootPath, visit)
+
+    report.textures = len(textures)
+    report.texture_bytes = sum(_file_size(texture) for texture in textures)
+    return report
+
+
+def choose_load_mode(report: PreflightReport, predicted_bytes: int, full_max_bytes: int, progressive_max_bytes: int) -> str:
+    """
+    Picks full below `full_max_bytes`, progressive below `progressive_max_bytes` and proxy above.
+    Stages without payloads can't defer anything and always load fully.
+    """
+    if report.payloads == 0 or predicted_bytes <= full_max_bytes:
+        return "full"
+    if predicted_bytes <= progressive_max_bytes:
+        return "progressive"
+    return "proxy"
+
+
+def process_memory_bytes():
+    """Resident memory of this process, None without psutil."""
+    if psutil is None:
+        return None
+    return psutil.Process().memory_info().rss
+
+
+class Preflight:
+    """
+    Analyzes a stage before it is opened to pick its load mode, and compares the prediction with the actual memory.
+
+    The thresholds and memory factors are read from `SETTING_PREFLIGHT`. The last result is published to
+    `SETTING_PREFLIGHT_METRICS`.
+    """
+
+    def __init__(self):
+        settings = carb.settings.get_settings()
+        self._layer_factor = settings.get_as_float(f"{SETTING_PREFLIGHT}/layerMemoryFactor") or 4.0
+        self._texture_factor = settings.get_as_float(f"{SETTING_PREFLIGHT}/textureMemoryFactor") or 3.0
+        self._full_max_bytes = (settings.get_as_int(f"{SETTING_PREFLIGHT}/fullMaxMB") or 8192) * MB
+        self._progressive_max_bytes = (settings.get_as_int(f"{SETTING_PREFLIGHT}/progressiveMaxMB") or 24576) * MB
+        self._result = None
+        self._memory_before = None
+
+    def run(self, usd_file: str) -> str:
+        """Analyzes `usd_file` and returns the load mode to use for it."""
+        report = analyze_stage(usd_file)
+        predicted = report.predicted_bytes(self._layer_factor, self._texture_factor)
+        load_mode = choose_load_mode(report, predicted, self._full_max_bytes, self._progressive_max_bytes)
+
+        self._result = report.as_dict()
+        self._result.update({"predicted_bytes": predicted, "load_mode": load_mode})
+        self._memory_before = process_memory_bytes()
+        carb.log_info(
+            f"[innoactive.serverextension] Preflight of {usd_file}: {report.prims} prims, {report.payloads} payloads, "
+            f"{report.references} references, {report.instanceable} instanceable, {report.texture_bytes // MB} MB of textures, "
+            f"predicted {predicted // MB} MB -> {load_mode} load"
+        )
+        return load_mode
+
+    def report_actual(self, actual_layer_bytes: int):
+        """
+        Completes the last result with the actual memory once the stage is displayed. Returns it, or None if
+        no preflight ran since the last report.
+        """
+        result, self._result = self._result, None
+        if result is None:
+            return None
+
+        result["actual_layer_bytes"] = actual_layer_bytes
+        memory_after = process_memory_bytes()
+        if memory_after is not None and self._memory_before is not None:
+            result["actual_bytes"] = memory_after - self._memory_before
+            carb.log_info(
+                f"[innoactive.serverextension] Preflight predicted {result['predicted_bytes'] // MB} MB, "
+                f"actual {result['actual_bytes'] // MB} MB for {result['usd']}"
+            )
+
+        carb.settings.get_settings().set(SETTING_PREFLIGHT_METRICS, result)
+        return result
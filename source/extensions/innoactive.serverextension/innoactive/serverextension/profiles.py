@@ -0,0 +1,135 @@
+import json
+import numbers
+
+import carb
+import carb.dictionary
+import carb.settings
+
+
+INTERFACE_MODES = ("screen", "vr", "ar")
+FOVEATION_MODES = ("none", "warped", "inset")
+
+
+def _number(low, high):
+    def validate(value):
+        if isinstance(value, bool) or not isinstance(value, numbers.Real) or not low < value <= high:
+            raise ValueError(f"expected a number in ({low}, {high}], got {value!r}")
+    return validate
+
+
+def _boolean(value):
+    if not isinstance(value, bool):
+        raise ValueError(f"expected true or false, got {value!r}")
+
+
+def _choice(*choices):
+    def validate(value):
+        if value not in choices:
+            raise ValueError(f"expected one of {', '.join(choices)}, got {value!r}")
+    return validate
+
+
+# Render-performance knobs of a profile: name -> (settings path, validator, XR modes only)
+RENDER_KNOBS = {
+    "resolutionMultiplier": ("/persistent/xr/profile/{mode}/render/resolutionMultiplier", _number(0, 4), True),
+    "foveation.mode": ("/persistent/xr/profile/{mode}/foveation/mode", _choice(*FOVEATION_MODES), True),
+    "foveation.resolutionMultiplier": ("/persistent/xr/profile/{mode}/foveation/warped/resolutionMultiplier", _number(0, 1), True),
+    "foveation.insetSize": ("/persistent/xr/profile/{mode}/foveation/warped/insetSize", _number(0, 1), True),
+    "textureStreaming": ("/rtx-transient/resourcemanager/enableTextureStreaming", _boolean, False),
+    "nearPlane": ("/persistent/xr/profile/{mode}/render/nearPlane", _number(0, 100), True),
+}
+
+
+def _flatten(section: dict, prefix=""):
+    for key, value in section.items():
+        if isinstance(value, dict):
+            yield from _flatten(value, f"{prefix}{key}.")
+        else:
+            yield f"{prefix}{key}", value
+
+
+def parse_profile(data: dict, mode: str) -> dict:
+    """
+    Validates an interface-mode profile and returns the settings it applies as {path: value}.
+    Raises ValueError if the profile is invalid.
+
+    A profile has a "render" section with the knobs of `RENDER_KNOBS` and a "settings" section with
+    any further settings paths.
+    """
+    if mode not in INTERFACE_MODES:
+        raise ValueError(f"Unknown interface mode {mode!r}")
+    if not isinstance(data, dict):
+        raise ValueError("Profile must be a JSON object")
+
+    unknown = set(data) - {"mode", "render", "settings"}
+    if unknown:
+        raise ValueError(f"Unknown profile sections: {', '.join(sorted(unknown))}")
+    if data.get("mode", mode) != mode:
+        raise ValueError(f"Profile is for interface mode {data['mode']!r}, not {mode!r}")
+
+    render = data.get("render", {})
+    if not isinstance(render, dict):
+        raise ValueError("Profile render section must be a JSON object")
+    values = {}
+    for knob, value in _flatten(render):
+        if knob not in RENDER_KNOBS:
+            raise ValueError(f"Unknown render knob {knob!r}")
+        path, validate, xr_only = RENDER_KNOBS[knob]
+        if xr_only and mode == "screen":
+            raise ValueError(f"Render knob {knob!r} is only available in vr and ar profiles")
+        try:
+            validate(value)
+        except ValueError as e:
+            raise ValueError(f"Invalid render knob {knob!r}: {str(e)}")
+        values[path.format(mode=mode)] = value
+
+    settings = data.get("settings", {})
+    if not isinstance(settings, dict):
+        raise ValueError("Profile settings must be a JSON object")
+    for path, value in settings.items():
+        if not path.startswith("/"):
+            raise ValueError(f"Settings path {path!r} must be absolute")
+        if not path.strip("/"):
+            raise ValueError(f"Settings path {path!r} is empty")
+        if isinstance(value, dict) or value is None:
+            raise ValueError(f"Invalid value for settings path {path!r}: {value!r}")
+        values[path] = value
+
+    # apply_profile sets each path as a leaf, so no path may lie under another one
+    leaves = {}
+    for path in values:
+        normalized = "/" + "/".join(part for part in path.split("/") if part)
+        if normalized in leaves:
+            raise ValueError(f"Settings path {path!r} repeats {leaves[normalized]!r}")
+        leaves[normalized] = path
+    for normalized, path in leaves.items():
+        parent = normalized.rsplit("/", 1)[0]
+        while parent:
+            if parent in leaves:
+                raise ValueError(f"Settings path {path!r} overlaps {leaves[parent]!r}")
+            parent = parent.rsplit("/", 1)[0]
+
+    return values
+
+
+def load_profile(profile_file: str, mode: str) -> dict:
+    """Reads and validates the profile file, see `parse_profile`."""
+    try:
+        with open(profile_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError) as e:
+        raise ValueError(f"Can't read profile {profile_file}: {str(e)}")
+    return parse_profile(data, mode)
+
+
+def apply_profile(values: dict):
+    """Applies the profile settings as one batched settings update."""
+    tree = {}
+    for path, value in values.items():
+        *parents, leaf = path.strip("/").split("/")
+        node = tree
+        for parent in parents:
+            node = node.setdefault(parent, {})
+        node[leaf] = value
+
+    carb.settings.get_settings().update("/", tree, "", carb.dictionary.UpdateAction.OVERWRITE)
@@ -0,0 +1,100 @@
+import carb
+import carb.events
+import carb.settings
+import omni.kit.app
+import omni.usd
+from omni.kit.viewport.utility import get_active_viewport_camera_string
+from pxr import Gf, Usd, UsdGeom
+
+from .tracing import get_tracer
+
+
+SETTING_BATCH_SIZE = "/innoactive/serverextension/progressive/batchSize"
+PROGRESS_EVENT = "omni.kit.window.status_bar@progress"
+ACTIVITY_EVENT = "omni.kit.window.status_bar@activity"
+
+
+class ProgressiveLoader:
+    """
+    Opens a stage without payloads and loads them in batches, nearest to the camera first.
+
+    Progress is reported through the status bar events, which the viewer messaging extension
+    forwards to the streaming client.
+    """
+
+    def __init__(self, usd_context, batch_size: int = 64):
+        self._usd_context = usd_context
+        self._batch_size = carb.settings.get_settings().get_as_int(SETTING_BATCH_SIZE) or batch_size
+        self._task = None
+
+    async def open_stage(self, usd_file: str, camera_path: str = None):
+        """
+        Opens `usd_file` with no payloads loaded and starts loading them in the background.
+        Args:
+            usd_file (str): Path to the USD file to open.
+            camera_path (str): Camera to prioritize payloads for. Defaults to the active viewport camera.
+        """
+        self.cancel()
+        result, error = await self._usd_context.open_stage_async(usd_file, omni.usd.UsdContextInitialLoadSet.LOAD_NONE)
+        if result:
+            self._task = get_tracer().ensure_future(self._load_payloads(camera_path), "progressive_load_payloads")
+        return result, error
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    def _camera_position(self, stage, camera_path):
+        camera_path = camera_path or get_active_viewport_camera_string()
+        camera = stage.GetPrimAtPath(camera_path) if camera_path else None
+        if not camera or not camera.IsValid():
+            return Gf.Vec3d(0, 0, 0)
+        return self._world_position(camera)
+
+    def _world_position(self, prim):
+        xformable = UsdGeom.Xformable(prim)
+        if not xformable:
+            return Gf.Vec3d(0, 0, 0)
+        return xformable.ComputeLocalToWorldTransform(Usd.TimeCode.Default()).ExtractTranslation()
+
+    def _pending_payloads(self, stage):
+        loaded = set(stage.GetLoadSet())
+        return [path for path in stage.FindLoadable() if path not in loaded]
+
+    async def _load_payloads(self, camera_path):
+        app = omni.kit.app.get_app()
+        message_bus = app.get_message_bus_event_stream()
+        progress_event = carb.events.type_from_string(PROGRESS_EVENT)
+        activity_event = carb.events.type_from_string(ACTIVITY_EVENT)
+
+        stage = self._usd_context.get_stage()
+        loaded_count = 0
+
+        # Nested payloads only become visible once their parent is loaded, so load in waves until none are left.
+        pending = self._pending_payloads(stage)
+        while pending:
+            camera_position = self._camera_position(stage, camera_path)
+            prims = [stage.GetPrimAtPath(path) for path in pending]
+            prims.sort(key=lambda prim: (self._world_position(prim) - camera_position).GetLength())
+
+            total = loaded_count + len(prims)
+            for start in range(0, len(prims), self._batch_size):
+                batch = [prim.GetPath() for prim in prims[start:start + self._batch_size]]
+                stage.LoadAndUnload(batch, [], Usd.LoadWithoutDescendants)
+                loaded_count += len(batch)
+
+                message_bus.dispatch(activity_event, payload={"text": f"Loading payloads ({loaded_count}/{total})"})
+                message_bus.dispatch(progress_event, payload={"progress": loaded_count / total})
+
+                # Give the renderer a frame before the next batch
+                await app.next_update_async()
+
+                if stage != self._usd_context.get_stage():
+                    return
+
+            pending = self._pending_payloads(stage)
+
+        carb.log_info(f"[innoactive.serverextension] Loaded {loaded_count} payloads progressively")
+        message_bus.dispatch(activity_event, payload={"text": ""})
+        message_bus.dispatch(progress_event, payload={"progress": 1.0})
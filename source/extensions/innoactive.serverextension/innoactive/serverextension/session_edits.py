@@ -0,0 +1,74 @@
+import carb
+from pxr import Gf, Sdf
+
+from .profiles import apply_profile
+
+
+def define_camera(layer, camera_path: str, position=(0, 0, 0)):
+    """Defines a Camera prim in `layer` with Sdf API only, so it can run inside an Sdf.ChangeBlock."""
+    path = Sdf.Path(camera_path)
+    prim_spec = layer.GetPrimAtPath(path)
+    if prim_spec and prim_spec.specifier == Sdf.SpecifierDef and prim_spec.typeName == "Camera":
+        return
+
+    prim_spec = Sdf.CreatePrimInLayer(layer, path)
+    prim_spec.specifier = Sdf.SpecifierDef
+    prim_spec.typeName = "Camera"
+
+    # Define the ancestors as typeless prims, the way Usd.Stage.DefinePrim does
+    parent = prim_spec.nameParent
+    while parent and parent.path != Sdf.Path.absoluteRootPath:
+        if parent.specifier == Sdf.SpecifierOver:
+            parent.specifier = Sdf.SpecifierDef
+        parent = parent.nameParent
+
+    if tuple(position) != (0, 0, 0):
+        translate = Sdf.AttributeSpec(prim_spec, "xformOp:translate", Sdf.ValueTypeNames.Double3)
+        translate.default = Gf.Vec3d(*position)
+        op_order = Sdf.AttributeSpec(prim_spec, "xformOpOrder", Sdf.ValueTypeNames.TokenArray, variability=Sdf.VariabilityUniform)
+        op_order.default = ["xformOp:translate"]
+
+
+class SessionEditQueue:
+    """
+    Collects session-layer edits and settings writes and applies them together.
+
+    Layer edits are functions taking the session layer. They must only use Sdf API, because they run inside
+    a single Sdf.ChangeBlock, so the stage recomposes and notifies once. Settings are applied as one batched update.
+    """
+
+    def __init__(self):
+        self._edits = []
+        self._settings = {}
+
+    def __len__(self):
+        return len(self._edits) + len(self._settings)
+
+    def add(self, edit):
+        self._edits.append(edit)
+
+    def add_settings(self, values: dict):
+        self._settings.update(values)
+
+    def clear(self):
+        self._edits.clear()
+        self._settings.clear()
+
+    def flush(self, stage):
+        """Applies the queued edits to the session layer of `stage`."""
+        edits, self._edits = self._edits, []
+        settings, self._settings = self._settings, {}
+
+        if edits:
+            layer = stage.GetSessionLayer()
+            with Sdf.ChangeBlock():
+                for edit in edits:
+                    try:
+                        edit(layer)
+                    except Exception as e:
+                        carb.log_error(f"[innoactive.serverextension] Failed to apply session layer edit: {str(e)}")
+
+        if settings:
+            apply_profile(settings)
+
+        carb.log_info(f"[innoactive.serverextension] Applied {len(edits)} session layer edits and {len(settings)} settings")
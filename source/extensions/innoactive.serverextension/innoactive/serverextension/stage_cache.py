@@ -0,0 +1,94 @@
+import os
+from collections import OrderedDict
+
+import carb
+import carb.settings
+
+
+SETTING_STAGE_CACHE_METRICS = "/innoactive/serverextension/metrics/stageCache"
+SETTING_LAYER_MEMORY_FACTOR = "/innoactive/serverextension/preflight/layerMemoryFactor"
+
+
+def estimate_stage_bytes(stage) -> int:
+    """Size on disk of the layers a stage uses: its layer stack, references and loaded payloads."""
+    total = 0
+    for layer in stage.GetUsedLayers():
+        real_path = layer.realPath
+        if real_path and os.path.isfile(real_path):
+            total += os.path.getsize(real_path)
+    return total
+
+
+def estimate_stage_memory(stage) -> int:
+    """
+    Estimates the memory a composed stage keeps resident: the size of its layers on disk times the preflight
+    layer memory factor, as the preflight predicts it. Textures are held by the renderer and aren't counted.
+    """
+    layer_factor = carb.settings.get_settings().get_as_float(SETTING_LAYER_MEMORY_FACTOR) or 4.0
+    return int(estimate_stage_bytes(stage) * layer_factor)
+
+
+class StageLRUCache:
+    """
+    Keeps recently opened stages resident, so switching back to a model only re-attaches it to the UsdContext.
+
+    Holds at most `max_stages` stages whose estimated size stays within `max_bytes`, evicting the least
+    recently used ones. Hits and misses are published under `SETTING_STAGE_CACHE_METRICS`.
+    """
+
+    def __init__(self, max_stages: int, max_bytes: int, estimate_fn=estimate_stage_memory):
+        self._max_stages = max_stages
+        self._max_bytes = max_bytes
+        self._estimate_fn = estimate_fn
+        self._entries = OrderedDict()  # key -> (stage, size)
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self) -> int:
+        return sum(size for _, size in self._entries.values())
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
+    def lookup(self, key: str):
+        """Returns the cached stage for `key` or None, counting the hit or miss."""
+        entry = self._entries.get(key)
+        if entry is None or not entry[0].GetPseudoRoot().IsValid():
+            self._entries.pop(key, None)
+            self.misses += 1
+            self._publish()
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        self._publish()
+        return entry[0]
+
+    def put(self, key: str, stage):
+        """Adds or refreshes `stage` as the most recently used one."""
+        self._entries[key] = (stage, self._estimate_fn(stage))
+        self._entries.move_to_end(key)
+        self._evict()
+        self._publish()
+
+    def clear(self):
+        self._entries.clear()
+        self._publish()
+
+    def _evict(self):
+        total = self.size
+        while self._entries and (len(self._entries) > self._max_stages or total > self._max_bytes):
+            key, (_, size) = self._entries.popitem(last=False)
+            total -= size
+            carb.log_info(f"[innoactive.serverextension] Stage cache evicted {key}")
+
+    def _publish(self):
+        settings = carb.settings.get_settings()
+        settings.set(f"{SETTING_STAGE_CACHE_METRICS}/hits", self.hits)
+        settings.set(f"{SETTING_STAGE_CACHE_METRICS}/misses", self.misses)
+        settings.set(f"{SETTING_STAGE_CACHE_METRICS}/stages", len(self._entries))
+        settings.set(f"{SETTING_STAGE_CACHE_METRICS}/sizeBytes", self.size)
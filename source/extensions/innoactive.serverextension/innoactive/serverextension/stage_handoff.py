@@ -0,0 +1,77 @@
+import asyncio
+import platform
+import time
+
+import carb
+import carb.events
+import carb.settings
+import omni.kit.app
+import omni.usd
+from omni.kit.viewport.utility import get_active_viewport
+
+from .tracing import get_tracer
+
+
+HANDOFF_EVENT = "innoactive.serverextension@handoff"
+SETTING_HANDOFF_TIMEOUT = "/innoactive/serverextension/handoffTimeout"
+SETTING_HANDOFF_LATENCY = "/innoactive/serverextension/metrics/handoffLatencyMs"
+
+
+class StageHandoff:
+    """
+    Waits until the empty bootstrap stage is ready and then hands over to the target USD load.
+
+    The handoff fires once the empty stage has been OPENED, its assets are loaded and the active viewport
+    has rendered a frame, instead of sleeping for a fixed amount of time.
+    """
+
+    def __init__(self, on_ready, timeout: float = 10.0):
+        self._on_ready = on_ready
+        self._timeout = carb.settings.get_settings().get_as_float(SETTING_HANDOFF_TIMEOUT) or timeout
+        self._assets_loaded = asyncio.Event()
+        self._task = None
+        self._start = 0.0
+
+    def on_stage_event(self, event):
+        if event.type == int(omni.usd.StageEventType.OPENING):
+            self._assets_loaded.clear()
+        elif event.type == int(omni.usd.StageEventType.ASSETS_LOADED):
+            self._assets_loaded.set()
+
+    def start(self):
+        """Start waiting for readiness. Called when the empty stage has been OPENED."""
+        self.cancel()
+        self._start = time.monotonic()
+        self._task = get_tracer().ensure_future(self._run(), "stage_handoff")
+
+    def cancel(self):
+        if self._task and not self._task.done():
+            self._task.cancel()
+        self._task = None
+
+    async def _wait_renderer_ready(self):
+        viewport = get_active_viewport()
+        if viewport is None:
+            await omni.kit.app.get_app().next_update_async()
+            return
+        await viewport.wait_for_rendered_frames(1)
+
+    async def _run(self):
+        try:
+            await asyncio.wait_for(self._assets_loaded.wait(), self._timeout)
+            await asyncio.wait_for(self._wait_renderer_ready(), self._timeout)
+        except asyncio.TimeoutError:
+            carb.log_warn(f"[innoactive.serverextension] Empty stage not ready after {self._timeout}s, loading anyway")
+
+        latency_ms = (time.monotonic() - self._start) * 1000.0
+        self._emit_latency(latency_ms)
+        self._on_ready()
+
+    def _emit_latency(self, latency_ms: float):
+        node = platform.node()
+        print(f"[innoactive.serverextension] Stage handoff ready after {latency_ms:.1f} ms on {node}")
+        carb.settings.get_settings().set(SETTING_HANDOFF_LATENCY, latency_ms)
+
+        message_bus = omni.kit.app.get_app().get_message_bus_event_stream()
+        event_type = carb.events.type_from_string(HANDOFF_EVENT)
+        message_bus.dispatch(event_type, payload={"latency_ms": latency_ms, "node": node})
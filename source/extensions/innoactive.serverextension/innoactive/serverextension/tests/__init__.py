@@ -9,3 +9,14 @@
 # its affiliates is strictly prohibited.
 
 from .test_hello_world import *
+from .test_content_cache import *
+from .test_frame_governor import *
+from .test_payload_streaming import *
+from .test_preflight import *
+from .test_dedup import *
+from .test_flatten_cache import *
+from .test_convert import *
+from .test_tracing import *
+from .test_profiles import *
+from .test_control_server import *
+from .test_stage_cache import *
@@ -0,0 +1,117 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import functools
+import http.server
+import os
+import tempfile
+import threading
+
+import omni.kit.test
+
+from innoactive.serverextension.content_cache import ContentCache
+
+
+class _Handler(http.server.SimpleHTTPRequestHandler):
+    def log_message(self, format, *args):
+        self.server.requests.append((self.path, args[1]))
+
+
+# Serves a temporary directory over HTTP as a stand-in for the remote content server
+class TestContentCache(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._content_dir = os.path.join(self._tmp.name, "content")
+        os.makedirs(os.path.join(self._content_dir, "sub"))
+
+        self._server = http.server.ThreadingHTTPServer(
+            ("127.0.0.1", 0), functools.partial(_Handler, directory=self._content_dir)
+        )
+        self._server.requests = []
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        self._base_url = f"http://127.0.0.1:{self._server.server_port}"
+
+    async def tearDown(self):
+        self._server.shutdown()
+        self._server.server_close()
+        self._tmp.cleanup()
+
+    def _write(self, name, content):
+        path = os.path.join(self._content_dir, name)
+        with open(path, "w") as f:
+            f.write(content)
+        return f"{self._base_url}/{name}"
+
+    def _cache(self, max_bytes=1 << 20):
+        return ContentCache(os.path.join(self._tmp.name, "cache"), max_bytes)
+
+    async def test_repeat_fetch_is_revalidated(self):
+        url = self._write("a.txt", "a" * 100)
+        cache = self._cache()
+
+        local_path = cache.fetch(url)
+        with open(local_path) as f:
+            self.assertEqual(f.read(), "a" * 100)
+
+        self.assertEqual(cache.fetch(url), local_path)
+        self.assertEqual([code for _, code in self._server.requests], ["200", "304"])
+
+    async def test_changed_file_is_downloaded_again(self):
+        url = self._write("a.txt", "old")
+        cache = self._cache()
+        local_path = cache.fetch(url)
+
+        self._write("a.txt", "new")
+        os.utime(os.path.join(self._content_dir, "a.txt"), (0, os.path.getmtime(local_path) + 10))
+
+        with open(cache.fetch(url)) as f:
+            self.assertEqual(f.read(), "new")
+
+    async def test_least_recently_used_is_evicted(self):
+        first = self._write("a.txt", "a" * 100)
+        second = self._write("b.txt", "b" * 100)
+        cache = self._cache(max_bytes=150)
+
+        first_path = cache.fetch(first)
+        second_path = cache.fetch(second)
+
+        self.assertFalse(os.path.exists(first_path))
+        self.assertTrue(os.path.exists(second_path))
+        self.assertEqual(cache.size, 100)
+
+    async def test_index_survives_restart(self):
+        url = self._write("a.txt", "a")
+        self._cache().fetch(url)
+
+        self._cache().fetch(url)
+        self.assertEqual([code for _, code in self._server.requests], ["200", "304"])
+
+    async def test_fetch_tree_mirrors_relative_dependencies(self):
+        self._write("sub/part.usda", "#usda 1.0\n")
+        url = self._write("root.usda", '#usda 1.0\n\ndef "Part" (\n    references = @./sub/part.usda@\n)\n{\n}\n')
+        cache = self._cache()
+
+        local_path = cache.fetch_tree(url)
+
+        self.assertEqual(local_path, cache.local_path(url))
+        self.assertTrue(os.path.exists(os.path.join(os.path.dirname(local_path), "sub", "part.usda")))
+
+    async def test_urls_differing_in_query_are_cached_apart(self):
+        cache = self._cache()
+        url = f"{self._base_url}/scene.usd"
+
+        versioned = [cache.local_path(f"{url}?version=1"), cache.local_path(f"{url}?version=2")]
+
+        self.assertNotEqual(versioned[0], versioned[1])
+        self.assertNotIn(cache.local_path(url), versioned)
+        for path in versioned:
+            self.assertEqual(os.path.dirname(path), os.path.dirname(cache.local_path(url)))
+            self.assertTrue(path.endswith(".usd"))
+
@@ -0,0 +1,45 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+
+import json
+
+import omni.kit.test
+
+from innoactive.serverextension.control_server import ControlServer
+
+
+class TestControlServer(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        async def batch(message):
+            return {"result": "success", "commands": message["commands"]}
+
+        self._server = ControlServer(0, {"status": lambda message: {"result": "success"}, "commandBatch": batch}, "secret")
+
+    async def _send(self, message) -> dict:
+        return await self._server._handle_message(json.dumps(message).encode("utf-8"))
+
+    async def test_handler_replies_are_returned(self):
+        self.assertEqual(await self._send({"type": "status", "token": "secret"}), {"result": "success"})
+        self.assertEqual(
+            await self._send({"type": "commandBatch", "token": "secret", "commands": []}),
+            {"result": "success", "commands": []},
+        )
+
+    async def test_messages_without_the_token_are_rejected(self):
+        for message in ({"type": "status"}, {"type": "status", "token": "guess"}, {"type": "status", "token": 1}):
+            with self.subTest(message=message):
+                self.assertEqual((await self._send(message))["result"], "error")
+
+    async def test_non_object_messages_are_rejected(self):
+        for message in ([], "status", 1, None):
+            with self.subTest(message=message):
+                self.assertEqual((await self._send(message))["result"], "error")
+        self.assertEqual((await self._server._handle_message(b"{not json"))["result"], "error")
@@ -0,0 +1,110 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import os
+import tempfile
+
+import omni.kit.test
+from pxr import Sdf
+
+from innoactive.serverextension.ingest.convert import convert, lookup_converted, read_manifest
+
+
+ROOT = """#usda 1.0
+def Xform "World" (
+    prepend references = @./part.usda@
+)
+{
+}
+"""
+
+PART = """#usda 1.0
+(
+    defaultPrim = "Part"
+)
+
+def Xform "Part"
+{
+    double3 xformOp:translate = (1.5, 0, 0)
+    uniform token[] xformOpOrder = ["xformOp:translate"]
+}
+"""
+
+
+class TestConvert(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._root = os.path.join(self._tmp.name, "root.usda")
+        for name, content in (("root.usda", ROOT), ("part.usda", PART)):
+            with open(os.path.join(self._tmp.name, name), "w") as f:
+                f.write(content)
+
+    async def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_converts_text_layers_and_rewrites_references(self):
+        results = convert(self._root)
+
+        self.assertEqual(sorted(result["result"] for result in results), ["converted", "converted"])
+        root = Sdf.Layer.OpenAsAnonymous(os.path.join(self._tmp.name, "root.usdc"))
+        self.assertEqual(root.GetFileFormat().formatId, "usdc")
+        references = root.GetPrimAtPath("/World").referenceList.GetAddedOrExplicitItems()
+        self.assertEqual(references[0].assetPath, "./part.usdc")
+
+        manifest = read_manifest(self._tmp.name)
+        self.assertTrue(manifest["part.usda"]["verified"])
+        self.assertEqual(lookup_converted(self._root), os.path.join(self._tmp.name, "root.usdc"))
+
+    async def test_second_run_is_up_to_date(self):
+        convert(self._root)
+
+        results = convert(self._root)
+
+        self.assertEqual([result["result"] for result in results], ["up to date", "up to date"])
+
+    async def test_changed_source_is_not_looked_up(self):
+        convert(self._root)
+
+        with open(self._root, "a") as f:
+            f.write('def Xform "Added"\n{\n}\n')
+
+        self.assertIsNone(lookup_converted(self._root))
+
+    async def test_binary_layers_are_left_untouched(self):
+        binary_path = os.path.join(self._tmp.name, "binary.usdc")
+        binary = Sdf.Layer.CreateNew(binary_path)
+        Sdf.CreatePrimInLayer(binary, "/Binary").referencePrepends.Append(Sdf.Reference("./part.usda"))
+        binary.Save()
+        with open(binary_path, "rb") as f:
+            before = f.read()
+
+        results = convert(binary_path)
+
+        self.assertEqual([result["source"] for result in results], [os.path.join(self._tmp.name, "part.usda")])
+        with open(binary_path, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertNotIn("binary.usdc", read_manifest(self._tmp.name))
+
+    async def test_text_usd_is_converted_in_place_and_recorded_as_it_is_now(self):
+        scene = os.path.join(self._tmp.name, "scene.usd")
+        with open(scene, "w") as f:
+            f.write(PART)
+
+        results = convert(scene)
+
+        self.assertEqual([result["result"] for result in results], ["converted"])
+        with open(scene, "rb") as f:
+            self.assertEqual(f.read(8), b"PXR-USDC")
+        entry = read_manifest(self._tmp.name)["scene.usd"]
+        self.assertTrue(entry["in_place"])
+        self.assertEqual((entry["source_size"], entry["source_mtime_ns"]), (os.stat(scene).st_size, os.stat(scene).st_mtime_ns))
+        self.assertEqual(lookup_converted(scene), scene)
+        self.assertEqual(convert(scene), [])
+
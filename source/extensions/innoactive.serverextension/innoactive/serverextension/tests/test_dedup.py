@@ -0,0 +1,56 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import os
+import tempfile
+
+import omni.kit.test
+from pxr import Gf, Usd, UsdGeom
+
+from innoactive.serverextension.ingest.dedup import optimize
+
+
+def add_bolt(stage, path, offset, size=1.0):
+    mesh = UsdGeom.Mesh.Define(stage, path)
+    mesh.CreatePointsAttr([(0, 0, 0), (size, 0, 0), (0, size, 0)])
+    mesh.CreateFaceVertexCountsAttr([3])
+    mesh.CreateFaceVertexIndicesAttr([0, 1, 2])
+    mesh.AddTranslateOp().Set(Gf.Vec3d(offset, 0, 0))
+
+
+class TestDedup(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._input = os.path.join(self._tmp.name, "input.usda")
+        self._output = os.path.join(self._tmp.name, "output.usda")
+
+        stage = Usd.Stage.CreateNew(self._input)
+        UsdGeom.Xform.Define(stage, "/World")
+        for index in range(3):
+            add_bolt(stage, f"/World/Bolt_{index}", offset=index * 10)
+        add_bolt(stage, "/World/Bracket", offset=50, size=2.0)
+        stage.Save()
+
+    async def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_identical_meshes_share_a_prototype(self):
+        report = optimize(self._input, self._output)
+
+        self.assertEqual(report["prototypes"], 1)
+        self.assertEqual(report["instanced_meshes"], 3)
+        self.assertEqual(report["prototype_prims"], 1)
+        self.assertLess(report["mesh_bytes_after"], report["mesh_bytes_before"])
+
+        stage = Usd.Stage.Open(self._output)
+        bolt = stage.GetPrimAtPath("/World/Bolt_2")
+        self.assertTrue(bolt.IsInstance())
+        self.assertEqual(UsdGeom.Xformable(bolt).ComputeLocalToWorldTransform(0).ExtractTranslation(), Gf.Vec3d(20, 0, 0))
+        self.assertFalse(stage.GetPrimAtPath("/World/Bracket").IsInstance())
@@ -0,0 +1,95 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import os
+import tempfile
+
+import omni.kit.test
+from pxr import Sdf, Usd
+
+from innoactive.serverextension.ingest.flatten_cache import FlattenCache
+
+
+ROOT = """#usda 1.0
+(
+    subLayers = [@./sub.usda@]
+)
+"""
+
+SUB = """#usda 1.0
+def Xform "World"
+{
+}
+"""
+
+
+class TestFlattenCache(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._root = os.path.join(self._tmp.name, "root.usda")
+        self._sub = os.path.join(self._tmp.name, "sub.usda")
+        for path, content in ((self._root, ROOT), (self._sub, SUB)):
+            with open(path, "w") as f:
+                f.write(content)
+        self._cache = FlattenCache(os.path.join(self._tmp.name, "cache"))
+
+    async def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_warm_then_lookup_hits(self):
+        self.assertIsNone(self._cache.lookup(self._root))
+
+        path, written = self._cache.warm(self._root)
+
+        self.assertTrue(written)
+        self.assertEqual(self._cache.lookup(self._root), path)
+        self.assertTrue(Usd.Stage.Open(path).GetPrimAtPath("/World"))
+        self.assertEqual(self._cache.warm(self._root), (path, False))
+
+    async def test_sublayer_change_misses(self):
+        self._cache.warm(self._root)
+
+        with open(self._sub, "w") as f:
+            f.write(SUB.replace("World", "Factory"))
+        layer = Sdf.Layer.Find(self._sub)
+        if layer:
+            layer.Reload()
+
+        self.assertIsNone(self._cache.lookup(self._root))
+
+    async def test_least_recently_used_is_evicted(self):
+        other = os.path.join(self._tmp.name, "other.usda")
+        with open(other, "w") as f:
+            f.write(SUB.replace("World", "Factory"))
+        first, _ = self._cache.warm(self._root)
+        cache = FlattenCache(os.path.join(self._tmp.name, "cache"), max_bytes=os.path.getsize(first))
+
+        second, written = cache.warm(other)
+
+        self.assertTrue(written)
+        self.assertFalse(os.path.exists(first))
+        self.assertIsNone(cache.lookup(self._root))
+        self.assertEqual(cache.lookup(other), second)
+
+    async def test_bound_is_enforced_when_the_cache_is_created(self):
+        path, _ = self._cache.warm(self._root)
+
+        cache = FlattenCache(os.path.join(self._tmp.name, "cache"), max_bytes=1)
+
+        self.assertFalse(os.path.exists(path))
+        self.assertIsNone(cache.lookup(self._root))
+
+    async def test_lookup_doesnt_write_the_index(self):
+        self._cache.warm(self._root)
+        index_path = os.path.join(self._tmp.name, "cache", "index.json")
+        mtime = os.stat(index_path).st_mtime_ns
+
+        self.assertIsNotNone(self._cache.lookup(self._root))
+        self.assertEqual(os.stat(index_path).st_mtime_ns, mtime)
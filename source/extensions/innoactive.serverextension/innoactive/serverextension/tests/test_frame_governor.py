@@ -0,0 +1,86 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import omni.kit.test
+
+from innoactive.serverextension.frame_governor import FrameTimeGovernor, GovernorConfig
+
+
+def synthetic_frames(frame_time_ms, windows, config):
+    return [frame_time_ms] * (windows * config.window_frames)
+
+
+class TestFrameTimeGovernor(omni.kit.test.AsyncTestCase):
+    def _governor(self, **kwargs):
+        self.config = GovernorConfig(target_hz=90.0, window_frames=10, cooldown_windows=0, **kwargs)
+        self.applied = []
+        return FrameTimeGovernor(self.config, resolution=2.0, foveation=0.5, apply_fn=lambda *args: self.applied.append(args))
+
+    def _run(self, governor, frame_time_ms, windows):
+        for sample in synthetic_frames(frame_time_ms, windows, self.config):
+            governor.add_sample(sample)
+
+    async def test_slow_frames_increase_foveation_first(self):
+        governor = self._governor()
+
+        self._run(governor, 20.0, 1)
+
+        self.assertEqual(self.applied, [(2.0, 0.45)])
+
+    async def test_slow_frames_lower_resolution_once_foveation_is_at_bound(self):
+        governor = self._governor(min_foveation=0.5)
+
+        self._run(governor, 20.0, 3)
+
+        self.assertEqual(self.applied, [(1.9, 0.5), (1.8, 0.5), (1.7, 0.5)])
+
+    async def test_fast_frames_raise_resolution_then_foveation(self):
+        governor = self._governor()
+
+        self._run(governor, 5.0, 3)
+
+        self.assertEqual(self.applied, [(2.0, 0.55), (2.0, 0.6), (2.0, 0.65)])
+        self.assertEqual(governor.resolution, self.config.max_resolution)
+
+    async def test_only_resolution_changes_without_warped_foveation(self):
+        self.config = GovernorConfig(target_hz=90.0, window_frames=10, cooldown_windows=0)
+        self.applied = []
+        governor = FrameTimeGovernor(self.config, resolution=2.0, foveation=None, apply_fn=lambda *args: self.applied.append(args))
+
+        self._run(governor, 20.0, 2)
+        self._run(governor, 5.0, 1)
+
+        self.assertEqual(self.applied, [(1.9, None), (1.8, None), (1.9, None)])
+
+    async def test_quality_stays_within_bounds(self):
+        governor = self._governor(min_resolution=1.5, min_foveation=0.3)
+
+        self._run(governor, 50.0, 20)
+
+        self.assertEqual(governor.resolution, 1.5)
+        self.assertEqual(governor.foveation, 0.3)
+
+    async def test_frames_within_hysteresis_band_change_nothing(self):
+        governor = self._governor()
+        budget_ms = self.config.budget_ms
+
+        self._run(governor, budget_ms * 1.0, 5)
+        self._run(governor, budget_ms * 0.9, 5)
+
+        self.assertEqual(self.applied, [])
+
+    async def test_cooldown_skips_windows_after_adjustment(self):
+        self.config = GovernorConfig(target_hz=90.0, window_frames=10, cooldown_windows=2)
+        self.applied = []
+        governor = FrameTimeGovernor(self.config, 2.0, 0.5, lambda *args: self.applied.append(args))
+
+        self._run(governor, 20.0, 4)
+
+        self.assertEqual(len(self.applied), 2)
@@ -0,0 +1,125 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import omni.kit.test
+from pxr import Sdf, Usd
+
+from innoactive.serverextension.payload_streaming import PayloadQueue, PayloadStreamer, plan_payload_changes
+
+
+class TestPayloadStreaming(omni.kit.test.AsyncTestCase):
+    async def test_loads_payloads_within_radius_nearest_first(self):
+        distances = {"/far": 90.0, "/near": 10.0, "/mid": 40.0}
+
+        load, unload = plan_payload_changes(distances, set(), 50.0, 80.0, 8)
+
+        self.assertEqual(load, ["/near", "/mid"])
+        self.assertEqual(unload, [])
+
+    async def test_unloads_payloads_beyond_unload_radius_farthest_first(self):
+        distances = {"/a": 100.0, "/b": 200.0, "/c": 60.0}
+
+        load, unload = plan_payload_changes(distances, {"/a", "/b", "/c"}, 50.0, 80.0, 8)
+
+        self.assertEqual(load, [])
+        self.assertEqual(unload, ["/b", "/a"])
+
+    async def test_keeps_state_between_radii(self):
+        distances = {"/resident": 60.0, "/unloaded": 70.0}
+
+        load, unload = plan_payload_changes(distances, {"/resident"}, 50.0, 80.0, 8)
+
+        self.assertEqual((load, unload), ([], []))
+
+    async def test_bounds_work_with_unloads_first(self):
+        distances = {"/gone": 100.0, "/a": 1.0, "/b": 2.0, "/c": 3.0}
+
+        load, unload = plan_payload_changes(distances, {"/gone"}, 50.0, 80.0, 2)
+
+        self.assertEqual(unload, ["/gone"])
+        self.assertEqual(load, ["/a"])
+
+    async def test_queue_takes_at_most_max_ops_per_frame(self):
+        distances = {f"/p{i}": float(i) for i in range(10)}
+        queue = PayloadQueue()
+        queue.plan(distances, set(), 50.0, 80.0)
+
+        resident = set()
+        frames = []
+        while queue:
+            load, unload = queue.take(3, distances, resident)
+            resident.update(load)
+            frames.append(load)
+
+        self.assertEqual([len(load) for load in frames], [3, 3, 3, 1])
+        self.assertEqual(sum(frames, []), [f"/p{i}" for i in range(10)])
+
+    async def test_queue_inserts_discovered_payloads_in_order(self):
+        distances = {"/a": 1.0, "/c": 3.0}
+        queue = PayloadQueue()
+        queue.plan(distances, set(), 50.0, 80.0)
+
+        queue.add("/b", 2.0, 50.0)
+        queue.add("/far", 60.0, 50.0)
+        distances.update({"/b": 2.0, "/far": 60.0})
+
+        self.assertEqual(queue.take(8, distances, set()), (["/a", "/b", "/c"], []))
+        self.assertFalse(queue)
+
+    async def test_nested_payloads_are_discovered_under_the_loaded_one(self):
+        inner = Sdf.Layer.CreateAnonymous(".usda")
+        inner.ImportFromString('#usda 1.0\n(defaultPrim = "Inner")\ndef Xform "Inner" {}\n')
+        outer = Sdf.Layer.CreateAnonymous(".usda")
+        outer.ImportFromString(
+            '#usda 1.0\n(defaultPrim = "Outer")\n'
+            f'def Xform "Outer" {{ def Xform "Nested" (payload = @{inner.identifier}@) {{}} }}\n'
+        )
+        stage = Usd.Stage.CreateInMemory(load=Usd.Stage.LoadNone)
+        stage.DefinePrim("/A").GetPayloads().AddPayload(outer.identifier)
+        stage.DefinePrim("/B").GetPayloads().AddPayload(outer.identifier)
+
+        streamer = PayloadStreamer(None)
+        streamer._stage = stage
+        streamer._discover()
+        self.assertEqual(set(streamer._positions), {Sdf.Path("/A"), Sdf.Path("/B")})
+
+        stage.Load("/A", Usd.LoadWithoutDescendants)
+        streamer._discover_under(Sdf.Path("/A"))
+        self.assertEqual(set(streamer._positions), {Sdf.Path("/A"), Sdf.Path("/A/Nested"), Sdf.Path("/B")})
+
+        stage.Unload("/A")
+        streamer._forget_under(Sdf.Path("/A"))
+        self.assertEqual(set(streamer._positions), {Sdf.Path("/A"), Sdf.Path("/B")})
+
+    async def test_unloading_a_payload_drops_the_rules_nested_in_it(self):
+        inner = Sdf.Layer.CreateAnonymous(".usda")
+        inner.ImportFromString('#usda 1.0\n(defaultPrim = "Inner")\ndef Xform "Inner" {}\n')
+        outer = Sdf.Layer.CreateAnonymous(".usda")
+        outer.ImportFromString(
+            '#usda 1.0\n(defaultPrim = "Outer")\n'
+            f'def Xform "Outer" {{ def Xform "Nested" (payload = @{inner.identifier}@) {{}} }}\n'
+        )
+        stage = Usd.Stage.CreateInMemory(load=Usd.Stage.LoadNone)
+        stage.DefinePrim("/A").GetPayloads().AddPayload(outer.identifier)
+        parent, child = Sdf.Path("/A"), Sdf.Path("/A/Nested")
+
+        streamer = PayloadStreamer(None)
+        streamer._stage = stage
+        streamer._discover()
+        streamer._apply([parent], [])
+        streamer._apply([child], [])
+        self.assertTrue(stage.GetPrimAtPath(child).IsLoaded())
+
+        streamer._apply([], [parent])
+        streamer._apply([parent], [])
+
+        self.assertTrue(stage.GetPrimAtPath(parent).IsLoaded())
+        self.assertFalse(stage.GetPrimAtPath(child).IsLoaded())
+        self.assertEqual(streamer._resident, {parent})
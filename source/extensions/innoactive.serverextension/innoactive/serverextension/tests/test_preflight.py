@@ -0,0 +1,85 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import os
+import tempfile
+
+import omni.kit.test
+
+from innoactive.serverextension.preflight import MB, PreflightReport, analyze_stage, choose_load_mode
+
+
+PART = """#usda 1.0
+def Xform "Part" (
+    instanceable = true
+)
+{
+    def Sphere "Geom"
+    {
+    }
+}
+"""
+
+ROOT = """#usda 1.0
+def Xform "World"
+{
+    def Xform "A" (
+        prepend payload = @./part.usda@</Part>
+    )
+    {
+    }
+
+    def Xform "B" (
+        prepend references = @./part.usda@</Part>
+    )
+    {
+    }
+
+    def Shader "Texture"
+    {
+        asset inputs:file = @./albedo.png@
+    }
+}
+"""
+
+
+class TestPreflight(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        for name, content in (("root.usda", ROOT), ("part.usda", PART), ("albedo.png", "x" * 100)):
+            with open(os.path.join(self._tmp.name, name), "w") as f:
+                f.write(content)
+
+    async def tearDown(self):
+        self._tmp.cleanup()
+
+    async def test_analyze_counts_layers_once(self):
+        report = analyze_stage(os.path.join(self._tmp.name, "root.usda"))
+
+        self.assertEqual(report.layers, 2)
+        self.assertEqual(report.prims, 6)
+        self.assertEqual(report.payloads, 1)
+        self.assertEqual(report.references, 1)
+        self.assertEqual(report.instanceable, 1)
+        self.assertEqual(report.textures, 1)
+        self.assertEqual(report.texture_bytes, 100)
+
+    async def test_choose_load_mode_by_prediction(self):
+        report = PreflightReport("stage.usd")
+        report.payloads = 10
+
+        self.assertEqual(choose_load_mode(report, 1 * MB, 2 * MB, 4 * MB), "full")
+        self.assertEqual(choose_load_mode(report, 3 * MB, 2 * MB, 4 * MB), "progressive")
+        self.assertEqual(choose_load_mode(report, 5 * MB, 2 * MB, 4 * MB), "proxy")
+
+    async def test_choose_full_without_payloads(self):
+        report = PreflightReport("stage.usd")
+
+        self.assertEqual(choose_load_mode(report, 5 * MB, 2 * MB, 4 * MB), "full")
@@ -0,0 +1,78 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+
+import omni.kit.test
+
+from innoactive.serverextension.profiles import parse_profile
+
+
+class TestProfiles(omni.kit.test.AsyncTestCase):
+    async def test_render_knobs_and_settings_map_to_paths(self):
+        values = parse_profile({
+            "mode": "vr",
+            "render": {"resolutionMultiplier": 2.0, "foveation": {"mode": "warped"}},
+            "settings": {"/xr/ui/enabled": False},
+        }, "vr")
+
+        self.assertEqual(values, {
+            "/persistent/xr/profile/vr/render/resolutionMultiplier": 2.0,
+            "/persistent/xr/profile/vr/foveation/mode": "warped",
+            "/xr/ui/enabled": False,
+        })
+
+    async def test_empty_profile_applies_nothing(self):
+        self.assertEqual(parse_profile({"mode": "screen", "render": {}, "settings": {}}, "screen"), {})
+
+    async def test_invalid_profiles_raise_value_error(self):
+        invalid = [
+            [],
+            {"unknown": {}},
+            {"mode": "ar"},
+            {"render": "fast"},
+            {"render": {"unknownKnob": 1}},
+            {"render": {"resolutionMultiplier": 8.0}},
+            {"render": {"resolutionMultiplier": True}},
+            {"render": {"foveation": {"mode": "fisheye"}}},
+            {"settings": []},
+            {"settings": {"relative/path": 1}},
+            {"settings": {"/xr/ui": {"enabled": False}}},
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    parse_profile(data, "vr")
+
+    async def test_overlapping_and_empty_settings_paths_raise_value_error(self):
+        invalid = [
+            {"settings": {"/a": 1, "/a/b": 2}},
+            {"settings": {"/a/b": 2, "/a": 1}},
+            {"settings": {"/a//b/": 1, "/a/b/c": 2}},
+            {"settings": {"/persistent/xr/profile/vr/render": 1}, "render": {"nearPlane": 0.1}},
+            {"settings": {"/": 1}},
+            {"settings": {"//": 1}},
+        ]
+        for data in invalid:
+            with self.subTest(data=data):
+                with self.assertRaises(ValueError):
+                    parse_profile(data, "vr")
+        self.assertEqual(parse_profile({"settings": {"/a/b": 1, "/a/c": 2}}, "vr"), {"/a/b": 1, "/a/c": 2})
+
+    async def test_xr_knobs_are_rejected_in_screen_profiles(self):
+        with self.assertRaises(ValueError):
+            parse_profile({"render": {"nearPlane": 0.1}}, "screen")
+        self.assertEqual(
+            parse_profile({"render": {"textureStreaming": False}}, "screen"),
+            {"/rtx-transient/resourcemanager/enableTextureStreaming": False},
+        )
+
+    async def test_unknown_mode_raises_value_error(self):
+        with self.assertRaises(ValueError):
+            parse_profile({}, "tablet")
@@ -0,0 +1,65 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+
+import omni.kit.test
+from pxr import Usd
+
+from innoactive.serverextension.stage_cache import StageLRUCache
+
+
+class TestStageLRUCache(omni.kit.test.AsyncTestCase):
+    def _cache(self, max_stages=3, max_bytes=1000, **sizes):
+        self._stages = {key: Usd.Stage.CreateInMemory(f"{key}.usda") for key in sizes}
+        self._sizes = {stage.GetRootLayer().identifier: sizes[key] for key, stage in self._stages.items()}
+        return StageLRUCache(max_stages, max_bytes, lambda stage: self._sizes[stage.GetRootLayer().identifier])
+
+    async def test_least_recently_used_stage_is_evicted(self):
+        cache = self._cache(max_stages=2, a=10, b=10, c=10)
+        cache.put("a", self._stages["a"])
+        cache.put("b", self._stages["b"])
+        self.assertEqual(cache.lookup("a"), self._stages["a"])
+
+        cache.put("c", self._stages["c"])
+
+        self.assertNotIn("b", cache)
+        self.assertIn("a", cache)
+        self.assertIn("c", cache)
+
+    async def test_byte_budget_evicts_until_the_stages_fit(self):
+        cache = self._cache(max_bytes=100, a=40, b=40, c=50)
+        cache.put("a", self._stages["a"])
+        cache.put("b", self._stages["b"])
+
+        cache.put("c", self._stages["c"])
+
+        self.assertEqual((len(cache), cache.size), (2, 90))
+        self.assertNotIn("a", cache)
+
+    async def test_reinserting_a_key_refreshes_it_without_duplicating(self):
+        cache = self._cache(max_stages=2, a=10, b=10, c=10)
+        cache.put("a", self._stages["a"])
+        cache.put("b", self._stages["b"])
+        self._sizes[self._stages["a"].GetRootLayer().identifier] = 30
+
+        cache.put("a", self._stages["a"])
+        cache.put("c", self._stages["c"])
+
+        self.assertEqual((len(cache), cache.size), (2, 40))
+        self.assertNotIn("b", cache)
+
+    async def test_hits_and_misses_are_counted(self):
+        cache = self._cache(a=10)
+        cache.put("a", self._stages["a"])
+
+        cache.lookup("a")
+        cache.lookup("missing")
+
+        self.assertEqual((cache.hits, cache.misses), (1, 1))
@@ -0,0 +1,89 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import asyncio
+import json
+import os
+import tempfile
+
+import omni.kit.test
+
+from innoactive.serverextension.tracing import Tracer
+
+
+class TestTracer(omni.kit.test.AsyncTestCase):
+    async def test_disabled_tracer_records_nothing(self):
+        tracer = Tracer(enabled=False)
+
+        with tracer.span("section"):
+            pass
+        tracer.instant("event")
+        await tracer.ensure_future(asyncio.sleep(0))
+
+        self.assertEqual(tracer.to_dict()["traceEvents"][1:], [])
+
+    async def test_span_and_instant_events(self):
+        tracer = Tracer(enabled=True, time_since_start_s=2.0)
+
+        with tracer.span("section", answer=42):
+            pass
+        tracer.instant("stage.OPENED", cat="stage")
+
+        span, instant = tracer.to_dict()["traceEvents"][1:]
+        self.assertEqual((span["name"], span["ph"], span["args"]), ("section", "X", {"answer": 42}))
+        self.assertGreaterEqual(span["ts"], 2e6)
+        self.assertGreaterEqual(span["dur"], 0)
+        self.assertEqual((instant["name"], instant["ph"], instant["cat"]), ("stage.OPENED", "i", "stage"))
+
+    async def test_tasks_are_async_events(self):
+        tracer = Tracer(enabled=True)
+
+        async def fail():
+            raise RuntimeError("failed")
+
+        await tracer.ensure_future(asyncio.sleep(0), "sleep")
+        with self.assertRaises(RuntimeError):
+            await tracer.ensure_future(fail(), "fail")
+
+        events = tracer.to_dict()["traceEvents"][1:]
+        self.assertEqual([(e["name"], e["ph"]) for e in events], [("sleep", "b"), ("sleep", "e"), ("fail", "b"), ("fail", "e")])
+        self.assertEqual(events[0]["id"], events[1]["id"])
+        self.assertNotEqual(events[0]["id"], events[2]["id"])
+        self.assertEqual([events[1]["args"]["result"], events[3]["args"]["result"]], ["done", "failed"])
+
+    async def test_traced_decorator(self):
+        tracer = Tracer(enabled=True)
+
+        @tracer.traced("sync_step")
+        def sync_step():
+            return 1
+
+        @tracer.traced("async_step")
+        async def async_step():
+            return 2
+
+        self.assertEqual(sync_step(), 1)
+        self.assertEqual(await async_step(), 2)
+        self.assertEqual([e["name"] for e in tracer.to_dict()["traceEvents"][1:]], ["sync_step", "async_step", "async_step"])
+
+    async def test_max_events_and_write(self):
+        tracer = Tracer(enabled=True, max_events=2)
+        for i in range(5):
+            tracer.instant(f"event{i}")
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = tracer.write(os.path.join(folder, "traces", "startup.json"), {"app": "Composer"})
+            with open(path, "r", encoding="utf-8") as f:
+                trace = json.load(f)
+
+        self.assertEqual(trace["traceEvents"][0]["args"], {"name": "Composer"})
+        self.assertEqual(len(trace["traceEvents"]), 3)
+        self.assertEqual(trace["otherData"]["dropped_events"], 3)
+        self.assertEqual(trace["otherData"]["app"], "Composer")
@@ -0,0 +1,206 @@
+import asyncio
+import contextlib
+import functools
+import inspect
+import itertools
+import json
+import os
+import threading
+import time
+
+import carb
+import carb.settings
+import carb.tokens
+
+SETTINGS_PREFIX = "/innoactive/serverextension/trace"
+
+
+class Tracer:
+    """
+    Records spans, async tasks and instant events as Chrome trace events (chrome://tracing, Perfetto).
+
+    Timestamps are microseconds since the Kit app started, so traces of different kit files line up. While
+    disabled every call is a no-op. Events beyond `max_events` are dropped and counted in the written trace.
+    """
+
+    def __init__(self, enabled=False, max_events=100000, time_since_start_s=None):
+        self.enabled = enabled
+        self._max_events = max_events
+        self._events = []
+        self._dropped = 0
+        self._lock = threading.Lock()
+        self._task_ids = itertools.count(1)
+        self._pid = os.getpid()
+        # Offset from perf_counter to the app start, measured once
+        self._origin = time.perf_counter() - (time_since_start_s or 0.0)
+
+    def _now_us(self) -> float:
+        return round((time.perf_counter() - self._origin) * 1e6, 1)
+
+    def _add(self, event: dict):
+        event["pid"] = self._pid
+        event.setdefault("tid", threading.get_ident())
+        with self._lock:
+            if len(self._events) >= self._max_events:
+                self._dropped += 1
+                return
+            self._events.append(event)
+
+    @contextlib.contextmanager
+    def _span(self, name: str, cat: str, args: dict):
+        begin = self._now_us()
+        try:
+            yield
+        finally:
+            event = {"name": name, "cat": cat, "ph": "X", "ts": begin, "dur": round(self._now_us() - begin, 1)}
+            if args:
+                event["args"] = args
+            self._add(event)
+
+    def span(self, name: str, cat="startup", **args):
+        """Context manager recording the time spent in its block."""
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._span(name, cat, args)
+
+    def traced(self, name: str = None, cat="startup"):
+        """Decorator recording a span for each call of a function, or for each run of a coroutine function."""
+
+        def decorator(fn):
+            span_name = name or fn.__qualname__
+            if inspect.iscoroutinefunction(fn):
+
+                @functools.wraps(fn)
+                async def async_wrapper(*args, **kwargs):
+                    return await self.trace_async(fn(*args, **kwargs), span_name, cat)
+
+                return async_wrapper
+
+            @functools.wraps(fn)
+            def wrapper(*args, **kwargs):
+                with self.span(span_name, cat):
+                    return fn(*args, **kwargs)
+
+            return wrapper
+
+        return decorator
+
+    def instant(self, name: str, cat="event", **args):
+        if not self.enabled:
+            return
+        event = {"name": name, "cat": cat, "ph": "i", "s": "p", "ts": self._now_us()}
+        if args:
+            event["args"] = args
+        self._add(event)
+
+    async def trace_async(self, coro, name: str, cat="task"):
+        """Awaits `coro` and records it from now until it finishes."""
+        if not self.enabled:
+            return await coro
+        # Coroutines interleave on the main thread, so they are async events matched by id rather than nested spans
+        task_id = next(self._task_ids)
+        tid = threading.get_ident()
+        self._add({"name": name, "cat": cat, "ph": "b", "id": task_id, "ts": self._now_us(), "tid": tid})
+        result = "cancelled"
+        try:
+            value = await coro
+            result = "done"
+            return value
+        except Exception:
+            result = "failed"
+            raise
+        finally:
+            self._add({"name": name, "cat": cat, "ph": "e", "id": task_id, "ts": self._now_us(), "tid": tid, "args": {"result": result}})
+
+    def ensure_future(self, coro, name: str = None, cat="task"):
+        """`asyncio.ensure_future` that records the task while it runs."""
+        if not self.enabled:
+            return asyncio.ensure_future(coro)
+        return asyncio.ensure_future(self.trace_async(coro, name or coro.__qualname__, cat))
+
+    def to_dict(self, metadata: dict = None) -> dict:
+        with self._lock:
+            events = list(self._events)
+            dropped = self._dropped
+        process_name = (metadata or {}).get("app") or "kit"
+        events.insert(0, {"name": "process_name", "ph": "M", "pid": self._pid, "tid": 0, "args": {"name": process_name}})
+        other_data = dict(metadata or {})
+        other_data["dropped_events"] = dropped
+        return {"traceEvents": events, "displayTimeUnit": "ms", "otherData": other_data}
+
+    def write(self, path: str, metadata: dict = None) -> str:
+        """Writes the recorded events as Chrome trace JSON to `path`. Recording continues."""
+        folder = os.path.dirname(path)
+        if folder:
+            os.makedirs(folder, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(metadata), f)
+        os.replace(tmp_path, path)
+        return path
+
+    def clear(self):
+        with self._lock:
+            self._events = []
+            self._dropped = 0
+
+
+def _create_tracer() -> Tracer:
+    settings = carb.settings.get_settings()
+    try:
+        import omni.kit.app
+
+        time_since_start_s = omni.kit.app.get_app().get_time_since_start_s()
+    except Exception:
+        time_since_start_s = 0.0
+    return Tracer(
+        enabled=settings.get_as_bool(f"{SETTINGS_PREFIX}/enabled"),
+        max_events=settings.get_as_int(f"{SETTINGS_PREFIX}/maxEvents") or 100000,
+        time_since_start_s=time_since_start_s,
+    )
+
+
+_tracer = None
+
+
+def get_tracer() -> Tracer:
+    """
+    The process-wide tracer, shared by the innoactive extensions.
+    It is enabled by `/innoactive/serverextension/trace/enabled` when first requested, so set it on the command line.
+    """
+    global _tracer
+    if _tracer is None:
+        _tracer = _create_tracer()
+    return _tracer
+
+
+def trace_metadata() -> dict:
+    """Identifies the app variant in written traces, e.g. composer vs. streamer, streaming or not."""
+    settings = carb.settings.get_settings()
+    return {
+        "app": settings.get_as_string("/app/name"),
+        "version": settings.get_as_string("/app/version"),
+        "interface_mode": settings.get_as_string("/innoactive/serverextension/interfaceMode"),
+        "startup_mode": settings.get_as_string("/innoactive/serverextension/startupMode"),
+        "load_mode": settings.get_as_string("/innoactive/serverextension/loadMode"),
+        "written": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+    }
+
+
+def write_trace(file_name: str = None) -> str:
+    """
+    Writes the trace to `/innoactive/serverextension/trace/path`, or to `file_name` in the folder of that path.
+    Returns the written path. Raises ValueError if `file_name` isn't a plain .json file name.
+    """
+    path = carb.settings.get_settings().get_as_string(f"{SETTINGS_PREFIX}/path")
+    if not path:
+        raise ValueError("No trace path configured")
+    path = carb.tokens.get_tokens_interface().resolve(path).replace("{pid}", str(os.getpid()))
+    if file_name:
+        # Only a name, the folder is never taken from the caller
+        if any(separator in file_name for separator in ("/", "\\", ":")) or not file_name.endswith(".json"):
+            raise ValueError(f"Invalid trace file name: {file_name}")
+        path = os.path.join(os.path.dirname(path), file_name)
+    path = get_tracer().write(path, trace_metadata())
+    carb.log_info(f"[innoactive.serverextension] Wrote trace to {path}")
+    return path
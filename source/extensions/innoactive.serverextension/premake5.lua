@@ -7,5 +7,6 @@ project_ext (ext)
 repo_build.prebuild_link {
     { "data", ext.target_dir.."/data" },
     { "docs", ext.target_dir.."/docs" },
+    { "profiles", ext.target_dir.."/profiles" },
     { "innoactive", ext.target_dir.."/innoactive" },
 }
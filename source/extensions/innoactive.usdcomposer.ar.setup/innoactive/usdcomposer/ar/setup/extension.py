@@ -8,9 +8,11 @@
 #
 
 import asyncio
+import contextlib
 import logging
 import os
 import sys
+import time
 from pathlib import Path
 
 import carb.imgui as _imgui
@@ -27,37 +29,71 @@ import omni.ui as ui
 import omni.usd
 from omni.kit.window.title import get_main_window_title
 
-DATA_PATH = Path(carb.tokens.get_tokens_interface().resolve("${innoactive.usdcomposer.ar.setup}"))
+from .startup_scheduler import MAIN_WINDOW_READY, RENDERER_READY, StartupScheduler
+from .warm_launcher import WarmLauncher
 
+try:
+    # Startup traces are recorded by the server extension when it is enabled
+    from innoactive.serverextension.tracing import get_tracer
+except ImportError:
+    get_tracer = None
 
-async def _load_layout(layout_file: str, keep_windows_open=False):
-    try:
-        from omni.kit.quicklayout import QuickLayout
+EXT_NAME = "innoactive.usdcomposer.ar.setup"
+# Apps opened from this one: (app id, console, custom args)
+SECONDARY_APPS = [
+    ("omni.app.uidoc.kit", True, None),
+    ("omni.create.launcher.kit", False, {"--/app/auto_launch=false"}),
+]
+STREAMING_EXTENSIONS = ("omni.kit.livestream.webrtc", "omni.kit.livestream.native", "omni.services.streamclient.webrtc")
+DATA_PATH = Path(carb.tokens.get_tokens_interface().resolve(f"${{{EXT_NAME}}}"))
 
-        # few frames delay to avoid the conflict with the layout of omni.kit.mainwindow
-        for i in range(3):
-            await omni.kit.app.get_app().next_update_async()
-        QuickLayout.load_file(layout_file, keep_windows_open)
 
-    except Exception as exc:
-        pass
+def _tracer():
+    return get_tracer() if get_tracer else None
+
+
+def _span(name: str):
+    tracer = _tracer()
+    return tracer.span(f"{EXT_NAME}.{name}") if tracer else contextlib.nullcontext()
+
 
+def _apply_layout(layout_file: str, keep_windows_open=False):
+    from omni.kit.quicklayout import QuickLayout
+
+    try:
+        QuickLayout.load_file(layout_file, keep_windows_open)
+    except Exception as exc:
         QuickLayout.load_file(layout_file)
 
 
+async def _load_layout(layout_file: str, keep_windows_open=False):
+    # few frames delay to avoid the conflict with the layout of omni.kit.mainwindow
+    for i in range(3):
+        await omni.kit.app.get_app().next_update_async()
+    _apply_layout(layout_file, keep_windows_open)
+
+
 class CreateSetupExtension(omni.ext.IExt):
     """Create Final Configuration"""
 
     def on_startup(self, ext_id):
         """setup the window layout, menu, final configuration of the extensions etc"""
+        with _span("on_startup"):
+            self._on_startup(ext_id)
+
+    def _on_startup(self, ext_id):
+        on_startup_begin = time.monotonic()
         self._settings = carb.settings.get_settings()
         self._menu_layout = []
+        self._layout_menu_items = []
+        self._help_menu_items = []
 
         telemetry_logger = logging.getLogger("idl.telemetry.opentelemetry")
         telemetry_logger.setLevel(logging.ERROR)
 
         # this is a work around as some Extensions don't properly setup their default setting in time
-        self._set_defaults()
+        with _span("set_defaults"):
+            self._set_defaults()
 
         # adjust couple of viewport settings
         self._settings.set("/app/viewport/boundingBoxes/enabled", True)
@@ -84,23 +120,21 @@ class CreateSetupExtension(omni.ext.IExt):
             self._settings.set("/persistent/app/viewport/Viewport/Viewport0/hud/visible", True)
             self._settings.set("/persistent/app/viewport/Viewport 2/Viewport0/hud/visible", True)
 
+        # Startup steps run as soon as what they depend on is ready, see StartupScheduler
+        self._startup = StartupScheduler(EXT_NAME, tracer=_tracer())
+
         # These two settings do not co-operate well on ADA cards, so for
         # now simulate a toggle of the present thread on startup to work around
         if self._settings.get("/exts/omni.kit.renderer.core/present/enabled") and self._settings.get(
             "/exts/omni.kit.widget.viewport/autoAttach/mode"
         ):
 
-            async def _toggle_present(settings, n_waits: int = 1):
-                async def _toggle_setting(app, enabled: bool, n_waits: int):
-                    for _ in range(n_waits):
-                        await app.next_update_async()
-                    settings.set("/exts/omni.kit.renderer.core/present/enabled", enabled)
-
-                app = omni.kit.app.get_app()
-                await _toggle_setting(app, False, n_waits)
-                await _toggle_setting(app, True, n_waits)
+            async def _toggle_present():
+                self._settings.set("/exts/omni.kit.renderer.core/present/enabled", False)
+                await omni.kit.app.get_app().next_update_async()
+                self._settings.set("/exts/omni.kit.renderer.core/present/enabled", True)
 
-            asyncio.ensure_future(_toggle_present(self._settings))
+            self._startup.add_step("toggle_present", _toggle_present, depends_on=[RENDERER_READY])
 
         # Setting and Saving FSD as a global change in preferences
         # Requires to listen for changes at the local path to update Composer's persistent path.
@@ -116,7 +150,8 @@ class CreateSetupExtension(omni.ext.IExt):
         )
 
         # Adjust the Window Title to show the Create Version
-        window_title = get_main_window_title()
+        with _span("window_title"):
+            window_title = get_main_window_title()
 
         app_version = self._settings.get("/app/version")
         if not app_version:
@@ -149,18 +184,43 @@ class CreateSetupExtension(omni.ext.IExt):
         test_mode = self._settings.get("/app/testMode")
 
         if not test_mode:
-            self.__setup_window_task = asyncio.ensure_future(_load_layout(layout_file, True))
+            self._startup.add_step("layout", lambda: _apply_layout(layout_file, True), depends_on=[MAIN_WINDOW_READY])
 
-        self.__setup_property_window = asyncio.ensure_future(self.__property_window())
+        # Menus, layout hotkeys and auxiliary windows aren't needed for the first frame. They are built once the
+        # renderer is ready (see the startup timings for the time they take), and not at all without a visible UI.
+        if self._ui_enabled():
+            self._startup.add_step("property_window", self.__property_window, depends_on=[MAIN_WINDOW_READY, RENDERER_READY])
+            self._startup.add_step("menus", self.__build_menus, depends_on=[MAIN_WINDOW_READY, RENDERER_READY])
+        else:
+            carb.log_info(f"[{EXT_NAME}] No visible UI (headless or streaming), skipping menus and auxiliary windows")
 
-        self.__menu_update()
+        # With warm launching enabled, a secondary app keeps an idle pre-started process for its next launch once it
+        # was launched. Nothing is pre-started up front, as no menu entry launches them yet (see `_launch_app`).
+        self._warm_launcher = WarmLauncher(EXT_NAME)
+        self._keep_apps_warm = bool(self._settings.get(f"/exts/{EXT_NAME}/warmLauncher/enabled")) and self._ui_enabled()
 
         if not test_mode and not self._settings.get("/app/content/emptyStageOnStart"):
-            self.__await_new_scene = asyncio.ensure_future(self.__new_stage())
+            # The new stage waits for the layout
+            self._startup.add_step("new_stage", self.__new_stage, depends_on=["layout"])
+
+        with _span("schedule_steps"):
+            self._startup.start()
+        # The menus step duration is what building the menus here used to add to this
+        self._startup.timings["on_startup_ms"] = round((time.monotonic() - on_startup_begin) * 1000.0, 3)
 
         startup_time = omni.kit.app.get_app_interface().get_time_since_start_s()
         self._settings.set("/crashreporter/data/startup_time", f"{startup_time}")
 
+    def _ui_enabled(self) -> bool:
+        """False when running without a window or streamed, where the Kit menus and windows are never used."""
+        if self._settings.get("/app/window/hideUi") or self._settings.get("/app/window/enabled") is False:
+            return False
+        ext_manager = omni.kit.app.get_app().get_extension_manager()
+        return not any(ext_manager.is_extension_enabled(ext) for ext in STREAMING_EXTENSIONS)
+
+    def __build_menus(self):
+        self.__menu_update()
+
         def show_documentation(*x):
             import webbrowser
             webbrowser.open("https://docs.omniverse.nvidia.com/composer/latest/index.html")
@@ -197,19 +257,12 @@ class CreateSetupExtension(omni.ext.IExt):
             enabled: bool = self._settings.get_as_bool("/app/useFabricSceneDelegate")
             self._settings.set("/persistent/app/useFabricSceneDelegate", enabled)
 
-    async def __new_stage(self):
-
-        # 10 frame delay to allow Layout
-        for i in range(5):
-            await omni.kit.app.get_app().next_update_async()
-
+    def __new_stage(self):
         if omni.usd.get_context().can_open_stage():
             stage_templates.new_stage(template=None)
 
-    def _launch_app(self, app_id, console=True, custom_args=None):
-        """launch another Kit app with the same settings"""
-        import platform
-        import subprocess
+    def _launch_args(self, app_id, custom_args=None):
+        """arguments to launch another Kit app with the same settings"""
         import sys
 
         app_path = carb.tokens.get_tokens_interface().resolve("${app}")
@@ -220,7 +273,7 @@ class CreateSetupExtension(omni.ext.IExt):
         kit_exe = sys.argv[0]
         if not os.path.exists(kit_exe):
             print(f"cannot find executable{kit_exe}")
-            return
+            return None
 
         launch_args = [kit_exe]
         launch_args += [kit_file_path]
@@ -232,26 +285,33 @@ class CreateSetupExtension(omni.ext.IExt):
         if exts_folders:
             for folder in exts_folders:
                 launch_args.extend(["--ext-folder", folder])
+        return launch_args
 
-        kwargs = {"close_fds": False}
-        if platform.system().lower() == "windows":
-            if console:
-                kwargs["creationflags"] = subprocess.CREATE_NEW_CONSOLE | subprocess.CREATE_NEW_PROCESS_GROUP
+    def _launch_app(self, app_id, console=True, custom_args=None):
+        """
+        launch another Kit app with the same settings, from a pre-started process when there is one
+
+        Nothing calls this at the moment: the Help menu entry of `_show_ui_docs` is disabled in `__build_menus`.
+        """
+        launch_args = self._launch_args(app_id, custom_args)
+        if launch_args:
+            coro = self._warm_launcher.launch(launch_args, console, keep_warm=self._keep_apps_warm)
+            tracer = _tracer()
+            if tracer:
+                tracer.ensure_future(coro, f"{EXT_NAME}.launch {app_id}")
             else:
-                kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
-
-        subprocess.Popen(launch_args, **kwargs)
+                asyncio.ensure_future(coro)
 
     def _show_ui_docs(self):
         """show the omniverse ui documentation as an external Application"""
-        self._launch_app("omni.app.uidoc.kit")
+        self._launch_app(*SECONDARY_APPS[0])
 
     def _show_launcher(self):
         """show the omniverse ui documentation as an external Application"""
-        self._launch_app("omni.create.launcher.kit", console=False, custom_args={"--/app/auto_launch=false"})
+        app_id, console, custom_args = SECONDARY_APPS[1]
+        self._launch_app(app_id, console=console, custom_args=custom_args)
 
-    async def __property_window(self):
-        await omni.kit.app.get_app().next_update_async()
+    def __property_window(self):
         import omni.kit.window.property as property_window_ext
         from omni.kit.property.usd import PrimPathWidget
 
@@ -412,6 +472,8 @@ class CreateSetupExtension(omni.ext.IExt):
         ui.Workspace.show_window("Asset Stores")
 
     def on_shutdown(self):
+        self._startup.cancel()
+        self._warm_launcher.shutdown()
         self._sub_fabric_delegate_changed = None
 
         omni.kit.menu.utils.remove_layout(self._menu_layout)
@@ -0,0 +1,98 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+# Run with `--exec` in the idle Kit processes of WarmLauncher. Hides the main window and waits on the
+# handover port for the launch arguments, then applies the settings among them and shows the window. Only
+# requests carrying the token WarmLauncher put in the environment are accepted.
+
+import asyncio
+import hmac
+import json
+import os
+
+import carb
+import carb.settings
+
+SETTING_HANDOVER_PORT = "/innoactive/warmHandover/port"
+ENV_HANDOVER_TOKEN = "INNOACTIVE_WARM_HANDOVER_TOKEN"
+
+
+def _set_window_visible(visible: bool):
+    try:
+        # Not `import carb.windowing`, that would make `carb` local to this function
+        from carb.windowing import acquire_windowing_interface
+        import omni.appwindow
+
+        windowing = acquire_windowing_interface()
+        window = omni.appwindow.get_default_app_window().get_window()
+        if visible:
+            windowing.show_window(window)
+        else:
+            windowing.hide_window(window)
+    except Exception as exc:
+        carb.log_warn(f"Warm handover: can't change the main window visibility: {exc}")
+
+
+def _parse_value(value: str):
+    if value.lower() in ("true", "false"):
+        return value.lower() == "true"
+    for parse in (int, float):
+        try:
+            return parse(value)
+        except ValueError:
+            pass
+    return value
+
+
+def _apply_args(args) -> list:
+    """Applies `--/path=value` settings arguments, returns the ignored ones."""
+    settings = carb.settings.get_settings()
+    ignored = []
+    for arg in args:
+        if arg.startswith("--/") and "=" in arg:
+            path, value = arg[2:].split("=", 1)
+            settings.set(path, _parse_value(value))
+        else:
+            ignored.append(arg)
+    return ignored
+
+
+async def _serve(port: int, token: str):
+    handed_over = asyncio.Event()
+
+    async def handle(reader, writer):
+        try:
+            request = json.loads(await reader.readline())
+            if not hmac.compare_digest(str(request.get("token", "")), token):
+                raise ValueError("invalid handover token")
+            ignored = _apply_args(request.get("args", []))
+            _set_window_visible(True)
+            reply = {"result": "success", "ignored": ignored}
+            handed_over.set()
+        except Exception as exc:
+            reply = {"result": "error", "error": str(exc)}
+        writer.write((json.dumps(reply) + "\n").encode())
+        await writer.drain()
+        writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", port)
+    try:
+        await handed_over.wait()
+    finally:
+        server.close()
+
+
+_port = carb.settings.get_settings().get_as_int(SETTING_HANDOVER_PORT)
+_token = os.environ.pop(ENV_HANDOVER_TOKEN, "")
+if _port and _token:
+    _set_window_visible(False)
+    asyncio.ensure_future(_serve(_port, _token))
+elif _port:
+    carb.log_warn("Warm handover: no handover token in the environment, not waiting for a handover")
@@ -0,0 +1,151 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import asyncio
+import inspect
+import time
+
+import carb
+import carb.settings
+import omni.kit.app
+import omni.usd
+
+MAIN_WINDOW_READY = "main_window_ready"
+RENDERER_READY = "renderer_ready"
+STAGE_ATTACHED = "stage_attached"
+
+
+async def _wait_main_window():
+    try:
+        from omni.kit.mainwindow import get_main_window
+    except ImportError:
+        # No main window (headless), nothing to wait for
+        return
+
+    app = omni.kit.app.get_app()
+    while get_main_window() is None:
+        await app.next_update_async()
+    # The main window sets up its dock space in its first update
+    await app.next_update_async()
+
+
+async def _wait_renderer():
+    from omni.kit.viewport.utility import get_active_viewport
+
+    app = omni.kit.app.get_app()
+    viewport = get_active_viewport()
+    while viewport is None:
+        await app.next_update_async()
+        viewport = get_active_viewport()
+    await viewport.wait_for_rendered_frames(1)
+
+
+async def _wait_stage_attached():
+    app = omni.kit.app.get_app()
+    usd_context = omni.usd.get_context()
+    while usd_context.get_stage_state() != omni.usd.StageState.OPENED:
+        await app.next_update_async()
+
+
+async def _call(fn):
+    result = fn()
+    if inspect.isawaitable(result):
+        await result
+
+
+class StartupScheduler:
+    """
+    Runs startup steps as soon as their dependencies are met instead of after fixed frame counts.
+
+    A dependency is one of the conditions (`MAIN_WINDOW_READY`, `RENDERER_READY`, `STAGE_ATTACHED`) or the
+    name of another step. A condition that isn't met within `timeout` seconds is logged and treated as met
+    (its timing is -1), so a missing renderer in headless runs doesn't block the remaining steps. The time each
+    condition was met and each step ran, in milliseconds since `start()`, is published to
+    `/exts/<ext_name>/startupTimings`. With a `tracer` (innoactive.serverextension.tracing), the condition waits and
+    the steps are recorded in the startup trace too.
+    """
+
+    CONDITIONS = {
+        MAIN_WINDOW_READY: _wait_main_window,
+        RENDERER_READY: _wait_renderer,
+        STAGE_ATTACHED: _wait_stage_attached,
+    }
+
+    def __init__(self, ext_name: str, timeout: float = 30.0, tracer=None):
+        self._ext_name = ext_name
+        self._timeout = timeout
+        self._tracer = tracer
+        self._steps = []
+        self._tasks = []
+        self._done = {}
+        self._origin = 0.0
+        self.timings = {"conditions": {}, "steps": {}}
+
+    def add_step(self, name: str, fn, depends_on=()):
+        """Adds a step. `fn` is a function or coroutine function that runs once all of `depends_on` are met."""
+        self._steps.append((name, fn, tuple(depends_on)))
+
+    def start(self):
+        self._origin = time.monotonic()
+        step_names = {name for name, _, _ in self._steps}
+        used = {dependency for _, _, depends_on in self._steps for dependency in depends_on}
+
+        for dependency in used:
+            if dependency not in step_names and dependency not in self.CONDITIONS:
+                raise ValueError(f"Unknown startup dependency {dependency!r}")
+            self._done[dependency] = asyncio.Event()
+        for name in step_names:
+            self._done.setdefault(name, asyncio.Event())
+
+        for condition in used & set(self.CONDITIONS):
+            self._tasks.append(asyncio.ensure_future(self._wait_condition(condition)))
+        for name, fn, depends_on in self._steps:
+            self._tasks.append(asyncio.ensure_future(self._run_step(name, fn, depends_on)))
+        self._tasks.append(asyncio.ensure_future(self._publish_when_done()))
+
+    def cancel(self):
+        for task in self._tasks:
+            task.cancel()
+        self._tasks = []
+
+    def _elapsed_ms(self) -> float:
+        return round((time.monotonic() - self._origin) * 1000.0, 3)
+
+    async def _traced(self, coro, name: str, cat: str):
+        if self._tracer is None:
+            return await coro
+        return await self._tracer.trace_async(coro, f"{self._ext_name}.{name}", cat)
+
+    async def _wait_condition(self, condition: str):
+        try:
+            await self._traced(asyncio.wait_for(self.CONDITIONS[condition](), self._timeout), condition, "startup_condition")
+            self.timings["conditions"][condition] = self._elapsed_ms()
+        except asyncio.TimeoutError:
+            carb.log_warn(f"[{self._ext_name}] Startup condition {condition} not met after {self._timeout} s, continuing")
+            self.timings["conditions"][condition] = -1.0
+        self._done[condition].set()
+
+    async def _run_step(self, name: str, fn, depends_on):
+        for dependency in depends_on:
+            await self._done[dependency].wait()
+
+        ready_ms = self._elapsed_ms()
+        try:
+            await self._traced(_call(fn), name, "startup_step")
+        except Exception as exc:
+            carb.log_error(f"[{self._ext_name}] Startup step {name} failed: {exc}")
+        self.timings["steps"][name] = {"ready_ms": ready_ms, "duration_ms": round(self._elapsed_ms() - ready_ms, 3)}
+        self._done[name].set()
+
+    async def _publish_when_done(self):
+        for name, _, _ in self._steps:
+            await self._done[name].wait()
+        carb.settings.get_settings().set(f"/exts/{self._ext_name}/startupTimings", self.timings)
+        carb.log_info(f"[{self._ext_name}] Startup timings: {self.timings}")
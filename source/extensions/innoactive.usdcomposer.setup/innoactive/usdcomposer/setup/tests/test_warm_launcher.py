@@ -0,0 +1,108 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import asyncio
+import os
+import secrets
+import subprocess
+import sys
+import tempfile
+
+import carb.settings
+import omni.kit.test
+
+from innoactive.usdcomposer.setup.warm_handover import _serve
+from innoactive.usdcomposer.setup.warm_launcher import WarmLauncher, _IdleInstance, _free_port
+
+SETTING = "/innoactive/tests/warmHandover/value"
+
+
+class TestWarmLauncher(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._tmp = tempfile.TemporaryDirectory()
+        self._marker = os.path.join(self._tmp.name, "spawned")
+        # Stands in for the Kit app: touches the marker file when spawned cold
+        self._launch_args = [sys.executable, "-c", "import sys; open(sys.argv[1], 'w').close()", self._marker, f"--{SETTING}=7"]
+        self._launcher = WarmLauncher("innoactive.usdcomposer.setup.tests")
+        self._idle_process = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+        self._server = None
+
+    async def tearDown(self):
+        if self._server:
+            self._server.cancel()
+        self._idle_process.terminate()
+        self._idle_process.wait()
+        self._launcher.shutdown()
+        carb.settings.get_settings().destroy_item(SETTING)
+        self._tmp.cleanup()
+
+    async def _start_idle_server(self, token: str) -> int:
+        port = _free_port()
+        self._server = asyncio.ensure_future(_serve(port, token))
+        for _ in range(100):
+            try:
+                _, writer = await asyncio.open_connection("127.0.0.1", port)
+                writer.close()
+                return port
+            except ConnectionRefusedError:
+                await asyncio.sleep(0.01)
+        self.fail("The handover server didn't start")
+
+    async def _wait_for_marker(self):
+        for _ in range(500):
+            if os.path.exists(self._marker):
+                return True
+            await asyncio.sleep(0.01)
+        return False
+
+    async def test_launch_hands_over_to_the_idle_process(self):
+        token = secrets.token_hex(16)
+        port = await self._start_idle_server(token)
+        self._launcher._idle[tuple(self._launch_args)] = _IdleInstance(self._idle_process, port, token)
+
+        await self._launcher.launch(self._launch_args, console=False, keep_warm=True)
+
+        await asyncio.wait_for(self._server, 5.0)
+        self.assertEqual(carb.settings.get_settings().get_as_int(SETTING), 7)
+        # A new idle process is pre-started for the next launch
+        self.assertIsNot(self._launcher._idle[tuple(self._launch_args)].process, self._idle_process)
+
+    async def test_handover_without_keep_warm_prestarts_nothing(self):
+        token = secrets.token_hex(16)
+        port = await self._start_idle_server(token)
+        self._launcher._idle[tuple(self._launch_args)] = _IdleInstance(self._idle_process, port, token)
+
+        await self._launcher.launch(self._launch_args, console=False)
+
+        await asyncio.wait_for(self._server, 5.0)
+        self.assertEqual(self._launcher._idle, {})
+
+    async def test_handover_with_a_wrong_token_is_refused(self):
+        port = await self._start_idle_server(secrets.token_hex(16))
+        instance = _IdleInstance(self._idle_process, port, "wrong")
+
+        with self.assertRaises(RuntimeError):
+            await self._launcher._handover(instance, self._launch_args)
+
+        self.assertFalse(self._server.done())
+        self.assertFalse(carb.settings.get_settings().get_as_int(SETTING))
+
+    async def test_refused_handover_spawns_cold(self):
+        port = await self._start_idle_server(secrets.token_hex(16))
+        self._launcher._idle[tuple(self._launch_args)] = _IdleInstance(self._idle_process, port, "wrong")
+
+        await self._launcher.launch(self._launch_args, console=False)
+
+        self.assertTrue(await self._wait_for_marker())
+
+    async def test_launch_without_idle_process_spawns_cold(self):
+        await self._launcher.launch(self._launch_args, console=False)
+
+        self.assertTrue(await self._wait_for_marker())
@@ -0,0 +1,127 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import asyncio
+import json
+import os
+import platform
+import secrets
+import socket
+import subprocess
+import time
+
+import carb
+
+HANDOVER_SCRIPT = os.path.join(os.path.dirname(__file__), "warm_handover.py")
+SETTING_HANDOVER_PORT = "/innoactive/warmHandover/port"
+# Passed in the environment rather than on the command line, which other local users can read
+ENV_HANDOVER_TOKEN = "INNOACTIVE_WARM_HANDOVER_TOKEN"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _popen_kwargs(console: bool) -> dict:
+    kwargs = {"close_fds": False}
+    if platform.system().lower() == "windows":
+        if console:
+            kwargs["creationflags"] = subprocess.CREATE_NEW_CONSOLE | subprocess.CREATE_NEW_PROCESS_GROUP
+        else:
+            kwargs["creationflags"] = subprocess.CREATE_NEW_PROCESS_GROUP
+    return kwargs
+
+
+def cold_spawn(launch_args: list, console: bool, env: dict = None):
+    return subprocess.Popen(launch_args, env=env, **_popen_kwargs(console))
+
+
+class _IdleInstance:
+    def __init__(self, process, port: int, token: str):
+        self.process = process
+        self.port = port
+        self.token = token
+
+
+class WarmLauncher:
+    """
+    Keeps one pre-started, hidden Kit process per set of launch arguments, so a secondary app opens without a cold start.
+
+    The idle process runs `warm_handover.py`, which listens on a local port. `launch()` hands the arguments over
+    together with the random token the process was started with, and the process shows its window. With
+    `keep_warm`, a new idle process is then pre-started for the next launch. Idle processes never get a console
+    window. Without an idle process that answers within `handover_timeout` seconds, the app is spawned cold.
+    """
+
+    def __init__(self, ext_name: str, handover_timeout: float = 2.0):
+        self._ext_name = ext_name
+        self._handover_timeout = handover_timeout
+        self._idle = {}  # launch args -> _IdleInstance
+
+    def prestart(self, launch_args: list):
+        key = tuple(launch_args)
+        instance = self._idle.get(key)
+        if instance and instance.process.poll() is None:
+            return
+
+        port = _free_port()
+        token = secrets.token_hex(16)
+        args = list(launch_args) + [f"--{SETTING_HANDOVER_PORT}={port}", "--exec", HANDOVER_SCRIPT]
+        env = dict(os.environ, **{ENV_HANDOVER_TOKEN: token})
+        try:
+            self._idle[key] = _IdleInstance(cold_spawn(args, False, env), port, token)
+            carb.log_info(f"[{self._ext_name}] Pre-started {launch_args[1]} on handover port {port}")
+        except OSError as exc:
+            carb.log_warn(f"[{self._ext_name}] Failed to pre-start {launch_args[1]}: {exc}")
+
+    async def launch(self, launch_args: list, console: bool, keep_warm=False):
+        """Opens the app from an idle process if there is one ready, spawns it otherwise."""
+        key = tuple(launch_args)
+        instance = self._idle.pop(key, None)
+        begin = time.monotonic()
+
+        if instance and instance.process.poll() is None:
+            try:
+                await asyncio.wait_for(self._handover(instance, launch_args), self._handover_timeout)
+                carb.log_info(f"[{self._ext_name}] Opened {launch_args[1]} from a warm process in {(time.monotonic() - begin) * 1000.0:.1f} ms")
+                if keep_warm:
+                    self.prestart(launch_args)
+                return
+            except ConnectionRefusedError:
+                # Still starting, keep it for the next launch
+                self._idle[key] = instance
+            except Exception as exc:
+                carb.log_warn(f"[{self._ext_name}] Handover to the warm process failed ({exc}), spawning {launch_args[1]}")
+                instance.process.terminate()
+
+        cold_spawn(launch_args, console)
+        if keep_warm:
+            self.prestart(launch_args)
+
+    async def _handover(self, instance: _IdleInstance, launch_args: list):
+        reader, writer = await asyncio.open_connection("127.0.0.1", instance.port)
+        try:
+            request = {"type": "handover", "token": instance.token, "args": launch_args[2:]}
+            writer.write((json.dumps(request) + "\n").encode())
+            await writer.drain()
+            reply = json.loads(await reader.readline())
+        finally:
+            writer.close()
+        if reply.get("result") != "success":
+            raise RuntimeError(reply.get("error", "handover refused"))
+
+    def shutdown(self):
+        """Terminates the idle processes, the apps already handed over keep running."""
+        for instance in self._idle.values():
+            if instance.process.poll() is None:
+                instance.process.terminate()
+        self._idle.clear()
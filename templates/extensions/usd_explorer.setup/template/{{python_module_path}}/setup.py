@@ -46,6 +46,7 @@ from .navigation import Navigation
 from .menu_helper import MenuHelper
 from .menubar_helper import MenubarHelper
 from .stage_template import SunnySkyStage
+from .startup_scheduler import RENDERER_READY, STAGE_ATTACHED, StartupScheduler
 from .ui_state_manager import UIStateManager
 
 SETTINGS_PATH_FOCUSED = "/app/workspace/currentFocused"
@@ -83,10 +84,8 @@ async def _load_layout(layout_file: str, keep_windows_open:bool=False) -> None:
     except Exception as exc: # pragma: no cover (Can't be tested because a non-existing layout file prints an log_error in QuickLayout and does not throw an exception)
         carb.log_warn(f"Failed to load layout {layout_file}: {exc}")
 
-async def _clear_startup_scene_edits() -> None:
+def _clear_startup_scene_edits() -> None:
     try:
-        for i in range(50):  # This could possibly be a smaller value. I want to ensure this happens after RTX startup
-            await omni.kit.app.get_app().next_update_async()  # type: ignore
         omni.usd.get_context().set_pending_edit(False)
     except Exception as exc: # pragma: no cover
         carb.log_warn(f"Failed to clear stage edits on startup: {exc}")
@@ -158,7 +157,10 @@ class SetupExtension(omni.ext.IExt):
         )
 
         self._set_viewport_menubar_visibility(False)
-        self._test = asyncio.ensure_future(_clear_startup_scene_edits())
+        # Clear the edits made while RTX starts up and the startup stage is attached
+        self._startup = StartupScheduler(omni.ext.get_extension_name(ext_id))
+        self._startup.add_step("clear_startup_scene_edits", _clear_startup_scene_edits, depends_on=[RENDERER_READY, STAGE_ATTACHED])
+        self._startup.start()
 
         self._usd_context = omni.usd.get_context()
         self._stage_event_sub = self._usd_context.get_stage_event_stream().create_subscription_to_pop(
@@ -495,6 +497,7 @@ class SetupExtension(omni.ext.IExt):
         self._custom_quicklayout_menu()
 
     def on_shutdown(self):
+        self._startup.cancel()
         if self._menu_layout:
             omni.kit.menu.utils.remove_layout(self._menu_layout)  # type: ignore
             self._menu_layout.clear()
@@ -0,0 +1,133 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+from pxr import Sdf, Tf, Usd, UsdGeom
+
+# Type bits of the prims, one per type `getChildrenRequest` can filter by
+TYPE_BITS = {
+    "USDGeom": 1 << 0,
+    "mesh": 1 << 0,
+    "xform": 1 << 1,
+    "scope": 1 << 2,
+}
+_SCHEMAS = ((UsdGeom.Mesh, 1 << 0), (UsdGeom.Xform, 1 << 1), (UsdGeom.Scope, 1 << 2))
+
+
+def type_bits(prim) -> int:
+    bits = 0
+    for schema, bit in _SCHEMAS:
+        if prim.IsA(schema):
+            bits |= bit
+    return bits
+
+
+class _Node:
+    __slots__ = ("children", "bits")
+
+    def __init__(self, bits: int):
+        self.children = []  # child names, in namespace order
+        self.bits = bits
+
+
+class HierarchyIndex:
+    """
+    Child lists and type bits of every prim of a stage, as `prim.GetChildren()` would return them.
+
+    The index is built once for a stage and kept up to date from its `Usd.Notice.ObjectsChanged` notices: only the
+    subtrees under resynced paths are indexed again. Listing children then needs no USD traversal.
+    """
+
+    def __init__(self):
+        self._stage = None
+        self._nodes = {}  # prim path string -> _Node
+        self._listener = None
+
+    def is_built_for(self, stage) -> bool:
+        return stage is not None and self._stage == stage
+
+    def build(self, stage):
+        self.clear()
+        self._stage = stage
+        self._index_subtree(stage.GetPseudoRoot())
+        self._listener = Tf.Notice.Register(Usd.Notice.ObjectsChanged, self._on_objects_changed, stage)
+
+    def clear(self):
+        if self._listener:
+            self._listener.Revoke()
+            self._listener = None
+        self._stage = None
+        self._nodes = {}
+
+    def __len__(self):
+        return len(self._nodes)
+
+    def children(self, prim_path: str, filters=None):
+        """
+        Yields (name, path, has_children) for the children of `prim_path` in namespace order.
+        With `filters`, only the children of one of the filtered types are yielded.
+        """
+        node = self._nodes.get(prim_path)
+        if node is None:
+            return
+        mask = None
+        if filters is not None:
+            mask = 0
+            for filt in filters:
+                mask |= TYPE_BITS.get(filt, 0)
+
+        parent = "" if prim_path == "/" else prim_path
+        for name in node.children:
+            path = f"{parent}/{name}"
+            child = self._nodes.get(path)
+            if child is None:
+                continue
+            if mask is not None and not child.bits & mask:
+                continue
+            yield name, path, bool(child.children)
+
+    def _index_subtree(self, prim):
+        # Same predicate as prim.GetChildren(), pre-order so every parent is indexed before its children
+        for descendant in Usd.PrimRange(prim):
+            path = str(descendant.GetPath())
+            self._nodes[path] = _Node(type_bits(descendant) if not descendant.IsPseudoRoot() else 0)
+            if descendant != prim:
+                self._nodes[str(descendant.GetPath().GetParentPath())].children.append(descendant.GetName())
+
+    def _remove_subtree(self, path: str):
+        pending = [path]
+        while pending:
+            path = pending.pop()
+            node = self._nodes.pop(path, None)
+            if node is not None:
+                pending.extend(f"{path}/{name}" for name in node.children)
+
+    def _on_objects_changed(self, notice, stage):
+        if stage != self._stage:
+            return
+
+        # Outermost resynced prims only, their subtrees are indexed again as a whole. Resynced properties don't
+        # change the hierarchy.
+        resynced = {path for path in notice.GetResyncedPaths() if path.IsAbsoluteRootOrPrimPath()}
+        if Sdf.Path.absoluteRootPath in resynced:
+            self._nodes = {}
+            self._index_subtree(stage.GetPseudoRoot())
+            return
+
+        roots = [path for path in resynced if not any(prefix in resynced for prefix in path.GetPrefixes()[:-1])]
+        for path in roots:
+            self._remove_subtree(str(path))
+            parent = self._nodes.get(str(path.GetParentPath()))
+            parent_prim = stage.GetPrimAtPath(path.GetParentPath())
+            if parent is None or not parent_prim:
+                continue
+            # The prim may have been added, removed, (de)activated or reordered among its siblings
+            parent.children = [child.GetName() for child in parent_prim.GetChildren()]
+            if path.name in parent.children:
+                self._index_subtree(stage.GetPrimAtPath(path))
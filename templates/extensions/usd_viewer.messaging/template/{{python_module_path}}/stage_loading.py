@@ -14,9 +14,15 @@ import omni.kit.app
 import omni.usd
 import asyncio
 import carb
+import carb.settings
 import omni.log
 import omni.kit.livestream.messaging as messaging
 
+# Max seconds to wait for the RTX streaming manager after ASSETS_LOADED before reporting the stage as opened
+SETTING_LOAD_TIMEOUT = f"/exts/{__package__}/loadTimeoutS"
+# Frames presented after streaming went idle, in case streaming resumes right away
+SETTLE_FRAMES = 2
+
 
 class LoadingManager:
 
@@ -32,6 +38,13 @@ class LoadingManager:
         self._persisted_stage: bool = False  # States if opened stage is opened from storage as in not a new unsaved stage
         self._is_evaluating_loading_status: bool = False
 
+        # -- load completion: resolved once ASSETS_LOADED was received and the streaming manager is idle
+        self._load_complete: asyncio.Future = None
+        self._evaluation_task: asyncio.Task = None
+        self._timings = {}  # monotonic time of the load milestones, see `_load_timings`
+        self._streaming_busy_since: float = 0.0
+        self._streaming_busy_s: float = 0.0
+
         # -- register outgoing events/messages
         outgoing = [
             "openedStageResult",  # notify when USD Stage has loaded.
@@ -83,6 +96,7 @@ class LoadingManager:
                 return
 
             self._requested_stage_url = event.payload["url"]
+            self._timings = {"requested": time.monotonic()}
             carb.log_info(f"Received message to load '{self._requested_stage_url}'")
 
             def process_url(url):
@@ -132,7 +146,14 @@ class LoadingManager:
             event (carb.events.IEvent): Event type
         """
         if event.type == int(omni.usd.StageEventType.OPENING):
+            # A stage opened while the previous one is still streaming replaces it, it is never reported as opened
+            self._cancel_evaluation()
             self._stage_is_opening = True
+            self._stage_has_opened = False
+            self._timings["opening"] = time.monotonic()
+            self._streaming_busy_s = 0.0
+            self._streaming_busy_since = self._timings["opening"] if self._streaming_manager_is_busy else 0.0
+            self._load_complete = asyncio.get_event_loop().create_future()
             payload: dict = event.payload.get_dict()
             if 'val' in payload.keys():
                 self._opened_stage_url = payload['val']
@@ -147,19 +168,87 @@ class LoadingManager:
                 return
             self._stage_is_opening = False
             self._stage_has_opened = True
+            self._timings["assets_loaded"] = time.monotonic()
+            self._check_load_complete()
 
             # Async call to evaluate opened state
-            asyncio.ensure_future(self._evaluate_load_status())
+            self._evaluation_task = asyncio.ensure_future(self._evaluate_load_status())
             return
 
     def _on_rxt_streaming_event(self, event: carb.events.IEvent) -> None:
         """
-        Notes streaming manager's busy state
+        Notes streaming manager's busy state, and how long it was busy during the current load.
 
         Args:
             event (carb.events.IEvent): Contains payload sender and type - https://docs.omniverse.nvidia.com/kit/docs/kit-manual/105.0/carb.events/carb.events.IEvent.html
         """
-        self._streaming_manager_is_busy = event.payload['isBusy']
+        is_busy = bool(event.payload['isBusy'])
+        now = time.monotonic()
+        if is_busy and not self._streaming_manager_is_busy:
+            self._streaming_busy_since = now
+        elif not is_busy and self._streaming_manager_is_busy and self._streaming_busy_since:
+            self._streaming_busy_s += now - self._streaming_busy_since
+            self._streaming_busy_since = 0.0
+        self._streaming_manager_is_busy = is_busy
+
+        if is_busy and self._load_complete is not None and self._load_complete.done() and self._stage_has_opened:
+            # Streaming resumed before the stage was reported as opened, wait for it again
+            self._load_complete = asyncio.get_event_loop().create_future()
+        self._check_load_complete()
+
+    def _cancel_evaluation(self) -> None:
+        if self._evaluation_task is not None and not self._evaluation_task.done():
+            self._evaluation_task.cancel()
+        self._evaluation_task = None
+        self._is_evaluating_loading_status = False
+        if self._load_complete is not None and not self._load_complete.done():
+            self._load_complete.cancel()
+        self._load_complete = None
+
+    def _check_load_complete(self) -> None:
+        if (
+            self._load_complete is not None
+            and not self._load_complete.done()
+            and self._stage_has_opened
+            and not self._streaming_manager_is_busy
+        ):
+            self._load_complete.set_result(None)
+
+    async def _wait_load_complete(self) -> None:
+        """
+        Returns once ASSETS_LOADED was received and the streaming manager stayed idle for `SETTLE_FRAMES` frames.
+        No Python runs per frame while waiting, the streaming status and stage events resolve `_load_complete`.
+        """
+        while True:
+            # Re-read on every pass, the future is replaced when streaming resumes. Shielded so that a timeout
+            # doesn't cancel it for the streaming status handler.
+            load_complete = self._load_complete
+            await asyncio.shield(load_complete)
+            for _ in range(SETTLE_FRAMES):
+                await omni.kit.app.get_app().next_update_async()
+            if self._load_complete is load_complete and not self._streaming_manager_is_busy:
+                return
+
+    def _load_timings(self) -> dict:
+        """
+        Milliseconds from the open request to the stage being reported as opened, split into the load phases.
+        `texture_streaming_ms` is the time spent waiting on the streaming manager after ASSETS_LOADED.
+        """
+        now = time.monotonic()
+        busy_s = self._streaming_busy_s + (now - self._streaming_busy_since if self._streaming_busy_since else 0.0)
+
+        def elapsed_ms(begin, end):
+            if begin not in self._timings or end not in self._timings:
+                return -1.0
+            return round((self._timings[end] - self._timings[begin]) * 1000.0, 1)
+
+        self._timings["completed"] = now
+        return {
+            "total_ms": elapsed_ms("requested", "completed"),
+            "open_ms": elapsed_ms("opening", "assets_loaded"),
+            "texture_streaming_ms": elapsed_ms("assets_loaded", "completed"),
+            "streaming_busy_ms": round(busy_s * 1000.0, 1),
+        }
 
     async def _evaluate_load_status(self):
         """
@@ -174,22 +263,27 @@ class LoadingManager:
         self._is_evaluating_loading_status = True
 
         # Wait until all dependencies have loaded by streaming manager
-        while self._streaming_manager_is_busy or not self._stage_has_opened:
-            await omni.kit.app.get_app().next_update_async()
-
-        for _ in range(2):
-            await omni.kit.app.get_app().next_update_async()
+        timeout = carb.settings.get_settings().get_as_float(SETTING_LOAD_TIMEOUT) or None
+        timed_out = False
+        try:
+            await asyncio.wait_for(self._wait_load_complete(), timeout)
+        except asyncio.TimeoutError:
+            timed_out = True
+            carb.log_warn(f"Streaming manager still busy {timeout} s after the stage assets loaded, reporting the stage as opened")
 
         # Stage has loaded with all dependencies. Send message to client.
         message_bus = omni.kit.app.get_app().get_message_bus_event_stream()
         event_type = carb.events.type_from_string("openedStageResult")
         url = self._requested_stage_url if self._requested_stage_url else '[obfuscated]'
-        carb.log_info(f'Sending message to client that stage has loaded: {url}')
-        payload = {"url": url, "result": "success", "error": ''}
+        timings = self._load_timings()
+        timings["texture_streaming_timed_out"] = timed_out
+        carb.log_info(f'Sending message to client that stage has loaded: {url} (timings: {timings})')
+        payload = {"url": url, "result": "success", "error": '', "timings": timings}
         message_bus.dispatch(event_type, payload=payload)
 
         # reset
         self._is_evaluating_loading_status = False
+        self._evaluation_task = None
         self._reset_state()
 
     def _on_progress(self, event: carb.events.IEvent):
@@ -230,13 +324,20 @@ class LoadingManager:
         """
         if self._subscriptions:
             self._subscriptions.clear()
+        self._cancel_evaluation()
 
     def _reset_state(self):
         """
         Reset the internal state - ready for new stage to be loaded
         """
+        # A running evaluation would otherwise wait on a future nobody resolves anymore. The evaluation resets
+        # the state itself once it is done, after clearing `_evaluation_task`.
+        self._cancel_evaluation()
         self._requested_stage_url = ""
         self._opened_stage_url = ""
         self._stage_has_opened = False
         self._streaming_manager_is_busy = False
         self._persisted_stage = False
+        self._timings = {}
+        self._streaming_busy_since = 0.0
+        self._streaming_busy_s = 0.0
@@ -22,7 +22,9 @@ import omni.client.utils
 import omni.kit.livestream.messaging as messaging
 from omni.kit.viewport.utility import get_active_viewport_camera_string
 
-from pxr import UsdGeom, Usd
+from pxr import Usd
+
+from .hierarchy_index import HierarchyIndex
 
 
 class StageManager:
@@ -33,11 +35,13 @@ class StageManager:
         self._is_external_update: bool = False
         self._camera_attrs = {}
         self._subscriptions = []
+        self._hierarchy = HierarchyIndex()
 
         # -- register outgoing events/messages
         outgoing = [
             "stageSelectionChanged",     # notify when user selects something in the viewport.
             "getChildrenResponse",       # response to request for children of a prim
+            "getChildrenBatchResponse",  # response to request for children of several prims
             "makePrimsPickableResponse", # response to request for primitive being pickable.
             "resetStageResponse",        # response to the request to reset camera attributes
         ]
@@ -48,6 +52,7 @@ class StageManager:
         # -- register incoming events/messages
         incoming = {
             'getChildrenRequest': self._on_get_children,              # request to get children of a prim
+            'getChildrenBatchRequest': self._on_get_children_batch,   # request to get children of several prims
             'selectPrimsRequest' : self._on_select_prims,             # request to select a prim
             'makePrimsPickable' : self._on_make_pickable,             # request to make primitives pickable
             'resetStage' : self._on_reset_camera,                     # request to make primitives pickable
@@ -67,63 +72,138 @@ class StageManager:
         )
 
 
-    def get_children(self, prim_path, filters=None):
+    def _iter_children(self, prim_path, filters=None):
         """
-        Collect any children of the given `prim_path`, potentially filtered by `filters`
+        Yields (name, path, has_children) for the children of the given `prim_path` that pass `filters`, in the
+        stage's namespace order. They are read from the hierarchy index, built for the stage if it isn't yet.
         """
         stage = omni.usd.get_context().get_stage()
-        prim = stage.GetPrimAtPath(prim_path)
-
-        filter_types = {
-            "USDGeom": UsdGeom.Mesh,
-            "mesh": UsdGeom.Mesh,
-            "xform": UsdGeom.Xform,
-            "scope": UsdGeom.Scope,
-        }
+        if not stage:
+            return
+        if not self._hierarchy.is_built_for(stage):
+            self._hierarchy.build(stage)
 
-        children = []
-        for child in prim.GetChildren():
-            # If a child doesn't pass any filter, we skip it.
-            if filters is not None:
-                if not any(child.IsA(filter_types[filt]) for filt in filters if filt in filter_types):
-                    continue
-
-            child_name = child.GetName()
-            child_path = str(prim.GetPath())
+        for child_name, child_path, has_children in self._hierarchy.children(prim_path, filters):
             # Skipping over cameras
             if child_name.startswith('OmniverseKit_'):
                 continue
             # Also skipping rendering primitives.
             if prim_path == '/' and child_name == 'Render':
                 continue
-            child_path = child_path if not child_path == '/' else ''
-            carb.log_info(f'child_path: {child_path}')
-            info = {"name": child_name, "path": f'{child_path}/{child_name}'}
+            yield child_name, child_path, has_children
 
-            # We return an empty list here to indicate that children are available, but
-            # the current app does not support pagination, so we use this to lazy load the stage tree.
-            if child.GetChildren():
-                info["children"] = []
+    def _child_info(self, child_name, child_path, has_children):
+        info = {"name": child_name, "path": child_path}
 
-            children.append(info)
+        # We return an empty list here to indicate that children are available,
+        # the client requests them when the node is expanded to lazy load the stage tree.
+        if has_children:
+            info["children"] = []
+        return info
 
-        return children
+    def get_children(self, prim_path, filters=None):
+        """
+        Collect any children of the given `prim_path`, potentially filtered by `filters`
+        """
+        return [self._child_info(*child) for child in self._iter_children(prim_path, filters)]
+
+    def get_children_page(self, prim_path, filters=None, offset=0, limit=0, cursor=None):
+        """
+        Collect one page of the children of the given `prim_path`, potentially filtered by `filters`.
+
+        The page holds up to `limit` children (all if 0) starting at `offset`, or right after the child the
+        `cursor` of a previous page points at. Children keep the stage's namespace order, so the pages of an
+        unchanged stage don't overlap, and a cursor stays valid when siblings are added before it.
+
+        Returns a dict with the `children` of the page, the `total` number of filtered children, the `offset` of
+        the page and the `next_cursor` to request the next page with ("" on the last page).
+        Raises ValueError if the child the cursor points at doesn't exist anymore.
+        """
+        if offset < 0 or limit < 0:
+            raise ValueError(f"Invalid page: offset {offset}, limit {limit}")
+
+        children = []
+        total = 0
+        after = cursor or None
+        for child in self._iter_children(prim_path, filters):
+            if after is not None:
+                offset = total + 1
+                if child[0] == after:
+                    after = None
+            elif total >= offset and (not limit or len(children) < limit):
+                children.append(self._child_info(*child))
+            total += 1
+
+        if after is not None:
+            raise ValueError(f"Invalid cursor: {cursor}")
+        offset = min(offset, total)
+
+        has_more = offset + len(children) < total
+        return {
+            "children": children,
+            "total": total,
+            "offset": offset,
+            "next_cursor": children[-1]["name"] if children and has_more else "",
+        }
+
+    def _children_result(self, request: dict) -> dict:
+        """
+        Answers one `getChildrenRequest` payload: the `prim_path` with one page of its children, or an error.
+        """
+        result = {"prim_path": request.get("prim_path", "")}
+        try:
+            page = self.get_children_page(
+                prim_path=result["prim_path"],
+                filters=request.get("filters"),
+                offset=int(request.get("offset") or 0),
+                limit=int(request.get("limit") or 0),
+                cursor=request.get("cursor"),
+            )
+        except ValueError as e:
+            result.update({"children": [], "result": "error", "error": str(e)})
+        else:
+            result.update(page)
+        return result
 
     def _on_get_children(self, event: carb.events.IEvent) -> None:
         """
         Handler for the `getChildrenRequest` event
         Collects a filtered collection of a given primitives children.
+
+        The request may page through the children with `offset` / `cursor` and `limit`, see `get_children_page`.
+        The response then also carries `total`, `offset` and `next_cursor`.
         """
         if event.type == carb.events.type_from_string("getChildrenRequest"):
             carb.log_info(f"Received message to return list of a prim\'s children")
             message_bus = omni.kit.app.get_app().get_message_bus_event_stream()
             event_type = carb.events.type_from_string("getChildrenResponse")
-            children = self.get_children(prim_path=event.payload["prim_path"], filters=event.payload["filters"])
+            payload = self._children_result(event.payload.get_dict())
+            message_bus.dispatch(event_type, payload=payload)
+            message_bus.pump()
+
+    def _on_get_children_batch(self, event: carb.events.IEvent) -> None:
+        """
+        Handler for the `getChildrenBatchRequest` event
+
+        Collects the children of several prims, e.g. the nodes a tree view expands at once, and sends them in one
+        `getChildrenBatchResponse`. The request holds either `requests`, a list of `getChildrenRequest` payloads,
+        or `prim_paths` sharing the `filters`, `offset`, `limit` of the request. The response lists one `results`
+        entry per prim path, in request order, and echoes the request's `request_id`.
+        """
+        if event.type == carb.events.type_from_string("getChildrenBatchRequest"):
+            batch = event.payload.get_dict()
+            requests = batch.get("requests")
+            if requests is None:
+                shared = {key: batch[key] for key in ("filters", "offset", "limit") if key in batch}
+                requests = [dict(shared, prim_path=prim_path) for prim_path in batch.get("prim_paths") or []]
+            carb.log_info(f"Received message to return the children of {len(requests)} prims")
+
             payload = {
-                "prim_path" : event.payload["prim_path"],
-                "children": children
+                "request_id": batch.get("request_id", ""),
+                "results": [self._children_result(request) for request in requests],
             }
-            message_bus.dispatch(event_type, payload=payload)
+            message_bus = omni.kit.app.get_app().get_message_bus_event_stream()
+            message_bus.dispatch(carb.events.type_from_string("getChildrenBatchResponse"), payload=payload)
             message_bus.pump()
 
     def _on_select_prims(self, event: carb.events.IEvent) -> None:
@@ -149,7 +229,9 @@ class StageManager:
 
         `omni.usd.StageEventType.SELECTION_CHANGED`: Informs the StreamerApp that the selection has changed.
         `omni.usd.StageEventType.ASSETS_LOADED`: Informs the StreamerApp that a stage has finished loading its assets.
-        `omni.usd.StageEventType.OPENED`: On stage opened, we collect some of the camera properties to allow for them to be reset.
+        `omni.usd.StageEventType.OPENED`: On stage opened, we collect some of the camera properties to allow for them to be reset,
+            and index the prim hierarchy.
+        `omni.usd.StageEventType.CLOSED`: Drops the prim hierarchy index.
 
         """
         if event.type == int(omni.usd.StageEventType.SELECTION_CHANGED):
@@ -180,6 +262,11 @@ class StageManager:
                 if (prim := ctx.get_stage().GetPrimAtPath(get_active_viewport_camera_string())):
                     for attr in prim.GetAttributes():
                         self._camera_attrs[attr.GetName()] = attr.Get()
+                # Index the prim hierarchy once, getChildrenRequest then needs no traversal.
+                self._hierarchy.build(stage)
+
+        elif event.type == int(omni.usd.StageEventType.CLOSED):
+            self._hierarchy.clear()
 
     def _on_reset_camera(self, event: carb.events.IEvent):
         """
@@ -235,5 +322,6 @@ class StageManager:
     def on_shutdown(self):
         # Reseting the state.
         self._subscriptions.clear()
+        self._hierarchy.clear()
         self._is_external_update: bool = False
         self._camera_attrs.clear()
@@ -0,0 +1,68 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import omni.kit.test
+from pxr import Sdf, Usd
+
+from {{ python_module }}.hierarchy_index import HierarchyIndex
+
+
+class TestHierarchyIndex(omni.kit.test.AsyncTestCase):
+    async def setUp(self):
+        self._stage = Usd.Stage.CreateInMemory()
+        for path in ("/World", "/World/A", "/World/A/Mesh", "/World/B"):
+            self._stage.DefinePrim(path, "Xform")
+        self._index = HierarchyIndex()
+        self._index.build(self._stage)
+
+    async def tearDown(self):
+        self._index.clear()
+
+    def _names(self, path):
+        return [name for name, _, _ in self._index.children(path)]
+
+    async def test_matches_get_children(self):
+        self.assertEqual(self._names("/"), ["World"])
+        self.assertEqual(list(self._index.children("/World")), [("A", "/World/A", True), ("B", "/World/B", False)])
+
+    async def test_added_prim_is_indexed(self):
+        self._stage.DefinePrim("/World/C/Mesh", "Mesh")
+
+        self.assertEqual(self._names("/World"), ["A", "B", "C"])
+        self.assertEqual(list(self._index.children("/World/C", ["mesh"])), [("Mesh", "/World/C/Mesh", False)])
+
+    async def test_removed_prim_is_dropped_with_its_subtree(self):
+        self._stage.RemovePrim("/World/A")
+
+        self.assertEqual(self._names("/World"), ["B"])
+        self.assertEqual(self._names("/World/A"), [])
+
+    async def test_deactivated_prim_is_dropped(self):
+        self._stage.GetPrimAtPath("/World/A").SetActive(False)
+
+        self.assertEqual(self._names("/World"), ["B"])
+
+        self._stage.GetPrimAtPath("/World/A").SetActive(True)
+
+        self.assertEqual(self._names("/World"), ["A", "B"])
+        self.assertEqual(self._names("/World/A"), ["Mesh"])
+
+    async def test_reordered_children_follow_the_new_order(self):
+        self._stage.GetPrimAtPath("/World").SetChildrenReorder(["B", "A"])
+
+        self.assertEqual(self._names("/World"), ["B", "A"])
+
+    async def test_property_change_keeps_the_subtree(self):
+        node = self._index._nodes["/World/A/Mesh"]
+
+        self._stage.GetPrimAtPath("/World/A").CreateAttribute("size", Sdf.ValueTypeNames.Double).Set(2.0)
+
+        self.assertIs(self._index._nodes["/World/A/Mesh"], node)
+        self.assertEqual(self._names("/World"), ["A", "B"])
@@ -0,0 +1,158 @@
+# SPDX-FileCopyrightText: Copyright (c) 2024 NVIDIA CORPORATION & AFFILIATES. All rights reserved.
+# SPDX-License-Identifier: LicenseRef-NvidiaProprietary
+#
+# NVIDIA CORPORATION, its affiliates and licensors retain all intellectual
+# property and proprietary rights in and to this material, related
+# documentation and any modifications thereto. Any use, reproduction,
+# disclosure or distribution of this material and related documentation
+# without an express license agreement from NVIDIA CORPORATION or
+# its affiliates is strictly prohibited.
+
+import json
+import socket
+import threading
+import unittest
+
+from warm_pool import ControlDispatcher, StandbyInstance, WarmPool
+
+
+class StandInLauncher:
+    def __init__(self):
+        self.launched = []
+        self.terminated = []
+
+    def launch(self):
+        instance = StandbyInstance(port=len(self.launched))
+        self.launched.append(instance)
+        return instance
+
+    def is_alive(self, instance):
+        return instance not in self.terminated
+
+    def terminate(self, instance):
+        self.terminated.append(instance)
+
+
+# Answers control messages the way a standby innoactive.serverextension does
+class StandInDispatcher:
+    def __init__(self, polls_until_ready=1):
+        self.polls_until_ready = polls_until_ready
+        self.polls = {}
+        self.assigned = {}
+        self.reject = set()
+
+    def send(self, instance, message):
+        if message["type"] == "status":
+            self.polls[instance.id] = self.polls.get(instance.id, 0) + 1
+            return {"result": "success", "ready": self.polls[instance.id] >= self.polls_until_ready}
+        if message["type"] == "assign":
+            if instance.id in self.reject:
+                return {"result": "error", "error": "rejected"}
+            self.assigned[instance.id] = message["usd"]
+            return {"result": "success"}
+        return {"result": "error", "error": "unknown"}
+
+
+class TestWarmPool(unittest.TestCase):
+    def test_pool_is_filled_and_becomes_ready(self):
+        launcher = StandInLauncher()
+        pool = WarmPool(3, launcher, StandInDispatcher(polls_until_ready=2))
+
+        pool.replenish()
+        self.assertEqual(len(launcher.launched), 3)
+        self.assertEqual(pool.ready_count, 0)
+
+        pool.replenish()
+        pool.replenish()
+        self.assertEqual(pool.ready_count, 3)
+        self.assertEqual(len(launcher.launched), 3)
+
+    def test_acquire_assigns_usd_and_pool_is_replenished(self):
+        launcher = StandInLauncher()
+        dispatcher = StandInDispatcher()
+        pool = WarmPool(2, launcher, dispatcher)
+        pool.replenish()
+        pool.replenish()
+
+        instance = pool.acquire("https://example.com/JetEngine.usd")
+
+        self.assertEqual(instance.state, StandbyInstance.ASSIGNED)
+        self.assertEqual(dispatcher.assigned[instance.id], "https://example.com/JetEngine.usd")
+        self.assertNotIn(instance, pool.instances)
+
+        pool.replenish()
+        self.assertEqual(len(pool.instances), 2)
+        self.assertEqual(len(launcher.launched), 3)
+
+    def test_acquire_without_ready_instance_times_out(self):
+        pool = WarmPool(1, StandInLauncher(), StandInDispatcher(polls_until_ready=10))
+        pool.replenish()
+
+        with self.assertRaises(TimeoutError):
+            pool.acquire("a.usd")
+
+    def test_rejected_assignment_uses_next_instance(self):
+        launcher = StandInLauncher()
+        dispatcher = StandInDispatcher()
+        pool = WarmPool(2, launcher, dispatcher)
+        pool.replenish()
+        pool.replenish()
+        dispatcher.reject.add(launcher.launched[0].id)
+
+        instance = pool.acquire("a.usd")
+
+        self.assertIs(instance, launcher.launched[1])
+        self.assertIn(launcher.launched[0], launcher.terminated)
+
+    def test_instance_not_ready_in_time_is_replaced(self):
+        launcher = StandInLauncher()
+        pool = WarmPool(1, launcher, StandInDispatcher(polls_until_ready=10), ready_timeout=0.0)
+        pool.replenish()
+
+        pool.replenish()
+
+        self.assertIn(launcher.launched[0], launcher.terminated)
+        self.assertEqual(len(launcher.launched), 2)
+
+    def test_ready_instance_that_exits_is_replaced(self):
+        launcher = StandInLauncher()
+        pool = WarmPool(2, launcher, StandInDispatcher())
+        pool.replenish()
+        pool.replenish()
+        self.assertEqual(pool.ready_count, 2)
+
+        launcher.terminated.extend(launcher.launched)
+        pool.replenish()
+        pool.replenish()
+
+        self.assertEqual(len(launcher.launched), 4)
+        self.assertEqual(pool.ready_count, 2)
+        self.assertIs(pool.acquire("a.usd"), launcher.launched[2])
+
+
+if __name__ == "__main__":
+    unittest.main()
+
+
+class TestControlDispatcher(unittest.TestCase):
+    def test_messages_carry_the_instance_token(self):
+        received = []
+        with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as server:
+            server.bind(("127.0.0.1", 0))
+            server.listen(1)
+
+            def answer():
+                connection, _ = server.accept()
+                with connection, connection.makefile("rwb") as f:
+                    received.append(json.loads(f.readline()))
+                    f.write(b'{"result": "success"}\n')
+
+            thread = threading.Thread(target=answer)
+            thread.start()
+            instance = StandbyInstance(server.getsockname()[1], token="secret")
+            reply = ControlDispatcher().send(instance, {"type": "status"})
+            thread.join()
+
+        self.assertEqual(reply, {"result": "success"})
+        self.assertEqual(received, [{"type": "status", "token": "secret"}])
+
@@ -0,0 +1,213 @@
+"""
+Warm standby pool of innoactive.usdstreamer instances.
+
+Runs on the orchestrator side, outside of Kit, and only needs the Python standard library. Each instance is started
+in standby mode: it opens the empty stage, initializes the renderer and then waits on its control port until a USD
+file is assigned to it.
+"""
+
+import json
+import logging
+import os
+import secrets
+import socket
+import subprocess
+import threading
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+# Read by the control server of innoactive.serverextension, see its control_server.py
+ENV_CONTROL_TOKEN = "INNOACTIVE_CONTROL_TOKEN"
+
+
+def _free_port() -> int:
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class StandbyInstance:
+    STARTING = "starting"
+    READY = "ready"
+    ASSIGNED = "assigned"
+
+    def __init__(self, port: int, process=None, token: str = None):
+        self.id = uuid.uuid4().hex
+        self.port = port
+        self.token = token
+        self.process = process
+        self.state = StandbyInstance.STARTING
+        self.started = time.monotonic()
+        self.usd = None
+
+
+class KitLauncher:
+    """Starts Kit processes in standby mode."""
+
+    def __init__(self, kit_exe: str, kit_file: str = "innoactive.usdstreamer_streaming.kit", extra_args=None):
+        self._kit_exe = kit_exe
+        self._kit_file = kit_file
+        self._extra_args = list(extra_args or [])
+
+    def launch(self) -> StandbyInstance:
+        port = _free_port()
+        token = secrets.token_hex(16)
+        args = [
+            self._kit_exe,
+            self._kit_file,
+            "--/innoactive/serverextension/standby=true",
+            f"--/innoactive/serverextension/controlPort={port}",
+        ] + self._extra_args
+        env = dict(os.environ, **{ENV_CONTROL_TOKEN: token})
+        return StandbyInstance(port, subprocess.Popen(args, close_fds=False, env=env), token)
+
+    def is_alive(self, instance: StandbyInstance) -> bool:
+        return instance.process is not None and instance.process.poll() is None
+
+    def terminate(self, instance: StandbyInstance):
+        if self.is_alive(instance):
+            instance.process.terminate()
+
+
+class ControlDispatcher:
+    """Sends control messages to the control server of innoactive.serverextension, with the instance's token."""
+
+    def __init__(self, timeout: float = 5.0):
+        self._timeout = timeout
+
+    def send(self, instance: StandbyInstance, message: dict) -> dict:
+        with socket.create_connection(("127.0.0.1", instance.port), timeout=self._timeout) as s:
+            s.sendall((json.dumps(dict(message, token=instance.token)) + "\n").encode("utf-8"))
+            with s.makefile("rb") as f:
+                return json.loads(f.readline())
+
+
+class WarmPool:
+    """
+    Keeps `size` instances parked and ready, and assigns USD files to them.
+
+    Args:
+        size (int): Number of ready or starting instances to keep.
+        launcher: Starts instances, see `KitLauncher`.
+        dispatcher: Sends control messages to instances, see `ControlDispatcher`.
+        ready_timeout (float): Seconds after which an instance that did not become ready is replaced.
+    """
+
+    def __init__(self, size: int, launcher, dispatcher, ready_timeout: float = 180.0):
+        self._size = size
+        self._launcher = launcher
+        self._dispatcher = dispatcher
+        self._ready_timeout = ready_timeout
+        self._instances = []
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+        self._thread = None
+
+    @property
+    def instances(self):
+        with self._lock:
+            return list(self._instances)
+
+    @property
+    def ready_count(self) -> int:
+        return sum(1 for instance in self.instances if instance.state == StandbyInstance.READY)
+
+    def start(self, interval: float = 0.5):
+        """Replenishes the pool in a background thread."""
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="WarmPool", daemon=True)
+        self._thread.start()
+
+    def stop(self, terminate=True):
+        self._stop.set()
+        self._wake.set()
+        if self._thread:
+            self._thread.join()
+            self._thread = None
+        if terminate:
+            for instance in self.instances:
+                self._launcher.terminate(instance)
+            with self._lock:
+                self._instances.clear()
+
+    def replenish(self):
+        """Checks starting instances for readiness, replaces dead ones and launches new ones up to `size`."""
+        for instance in self.instances:
+            if not self._launcher.is_alive(instance):
+                self._discard(instance, f"exited while {instance.state}")
+            elif instance.state == StandbyInstance.STARTING:
+                self._poll(instance)
+
+        with self._lock:
+            missing = self._size - len(self._instances)
+        for _ in range(missing):
+            instance = self._launcher.launch()
+            logger.info("Launched standby instance %s on port %s", instance.id, instance.port)
+            with self._lock:
+                self._instances.append(instance)
+
+    def acquire(self, usd: str, timeout: float = 0.0) -> StandbyInstance:
+        """
+        Assigns `usd` to a ready instance and removes it from the pool.
+        Raises TimeoutError if no instance becomes ready within `timeout` seconds.
+        """
+        deadline = time.monotonic() + timeout
+        while True:
+            instance = self._take_ready()
+            if instance is not None:
+                try:
+                    reply = self._dispatcher.send(instance, {"type": "assign", "usd": usd})
+                except OSError as e:
+                    reply = {"result": "error", "error": str(e)}
+                if reply.get("result") == "success":
+                    instance.state = StandbyInstance.ASSIGNED
+                    instance.usd = usd
+                    logger.info("Assigned %s to standby instance %s", usd, instance.id)
+                    self._wake.set()
+                    return instance
+                logger.warning("Standby instance %s rejected %s: %s", instance.id, usd, reply.get("error"))
+                self._launcher.terminate(instance)
+                self._wake.set()
+                continue
+
+            if time.monotonic() >= deadline:
+                raise TimeoutError("No warm standby instance available")
+            time.sleep(0.05)
+
+    def _take_ready(self):
+        with self._lock:
+            for instance in self._instances:
+                if instance.state == StandbyInstance.READY and self._launcher.is_alive(instance):
+                    self._instances.remove(instance)
+                    return instance
+        return None
+
+    def _poll(self, instance: StandbyInstance):
+        try:
+            reply = self._dispatcher.send(instance, {"type": "status"})
+        except OSError:
+            reply = {}
+        if reply.get("ready"):
+            instance.state = StandbyInstance.READY
+            logger.info("Standby instance %s is ready after %.1fs", instance.id, time.monotonic() - instance.started)
+        elif time.monotonic() - instance.started > self._ready_timeout:
+            self._launcher.terminate(instance)
+            self._discard(instance, f"not ready after {self._ready_timeout}s")
+
+    def _discard(self, instance: StandbyInstance, reason: str):
+        logger.warning("Replacing standby instance %s: %s", instance.id, reason)
+        with self._lock:
+            if instance in self._instances:
+                self._instances.remove(instance)
+
+    def _run(self, interval: float):
+        while not self._stop.is_set():
+            try:
+                self.replenish()
+            except Exception:
+                logger.exception("Failed to replenish the warm pool")
+            self._wake.wait(interval)
+            self._wake.clear()